@@ -0,0 +1,23 @@
+"""
+Offline micro-benchmarks of the reconciliation hot paths.
+
+Benchmarks live in the bench_*.py modules of this package and are run
+with `python -m benchmarks.runner`.
+"""
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    """
+    Registers a benchmark.
+
+    The decorated function receives the scale of the fixtures, does its setup
+    and returns the callable to be timed. The callable is invoked several
+    times, so it must not depend on the state left by a previous invocation.
+    The benchmark is named <module>.<function>, without the bench_ prefixes.
+    """
+    module = func.__module__.rsplit('.', 1)[-1]
+    name = f'{module[len("bench_"):]}.{func.__name__[len("bench_"):]}'
+    BENCHMARKS[name] = func
+    return func
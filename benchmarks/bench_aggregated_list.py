@@ -0,0 +1,32 @@
+from reconcile.utils.aggregated_list import AggregatedList
+
+from benchmarks import benchmark
+from benchmarks import fixtures
+
+
+def aggregated_list(items):
+    result = AggregatedList()
+    for params, group_items in items:
+        result.add(params, group_items)
+    return result
+
+
+@benchmark
+def bench_add(scale):
+    items = fixtures.aggregated_list_items(scale)
+
+    def run():
+        aggregated_list(items)
+
+    return run
+
+
+@benchmark
+def bench_diff(scale):
+    current = aggregated_list(fixtures.aggregated_list_items(scale))
+    desired = aggregated_list(fixtures.aggregated_list_items(scale, shift=3))
+
+    def run():
+        current.diff(desired)
+
+    return run
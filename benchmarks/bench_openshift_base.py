@@ -0,0 +1,55 @@
+import copy
+
+from reconcile import openshift_base
+from reconcile.utils.openshift_resource import (OpenshiftResource as OR,
+                                                ResourceInventory)
+
+from benchmarks import benchmark
+from benchmarks import fixtures
+
+
+class OCMapStub:
+    """
+    Stands in for an OC_Map and its clients. In dry-run, realize_data only
+    asks the clients to recycle pods, which is a no-op for resources that
+    are not annotated to do so.
+    """
+    def get(self, cluster, privileged=False):
+        return self
+
+    def recycle_pods(self, dry_run, namespace, dep_kind, dep_resource):
+        pass
+
+
+def inventory(scale):
+    """
+    Builds an inventory where most of the current resources match the
+    desired ones, one in ten drifted and one in ten is no longer desired.
+    """
+    ri = ResourceInventory()
+    for i, (cluster, namespace, kind, body) in \
+            enumerate(fixtures.resource_bodies(scale)):
+        ri.initialize_resource_type(cluster, namespace, kind)
+        name = body['metadata']['name']
+        desired = OR(body, fixtures.INTEGRATION, fixtures.INTEGRATION_VERSION)
+        current = desired.annotate()
+        if i % 10 == 1:
+            drifted = copy.deepcopy(current.body)
+            drifted['metadata']['labels']['drifted'] = 'true'
+            current = OR(drifted, fixtures.INTEGRATION,
+                         fixtures.INTEGRATION_VERSION)
+        if i % 10 != 2:
+            ri.add_desired(cluster, namespace, kind, name, desired)
+        ri.add_current(cluster, namespace, kind, name, current)
+    return ri
+
+
+@benchmark
+def bench_realize_data(scale):
+    ri = inventory(scale)
+    oc_map = OCMapStub()
+
+    def run():
+        openshift_base.realize_data(True, oc_map, ri, 1)
+
+    return run
@@ -0,0 +1,84 @@
+from reconcile.utils.openshift_resource import (OpenshiftResource as OR,
+                                                ResourceInventory)
+
+from benchmarks import benchmark
+from benchmarks import fixtures
+
+
+# hashing and annotating deep copy the body, so these
+# run over a slice of the fleet to keep a run short
+RESOURCES_SLICE = 2000
+
+
+def resources(scale):
+    return [OR(body, fixtures.INTEGRATION, fixtures.INTEGRATION_VERSION)
+            for _, _, _, body in
+            fixtures.resource_bodies(scale)[:int(RESOURCES_SLICE * scale)]]
+
+
+@benchmark
+def bench_sha256sum(scale):
+    items = resources(scale)
+
+    def run():
+        for item in items:
+            item.sha256sum()
+
+    return run
+
+
+@benchmark
+def bench_annotate(scale):
+    items = resources(scale)
+
+    def run():
+        for item in items:
+            item.annotate()
+
+    return run
+
+
+@benchmark
+def bench_equal(scale):
+    desired = [OR(body, fixtures.INTEGRATION, fixtures.INTEGRATION_VERSION)
+               for _, _, _, body in fixtures.resource_bodies(scale)]
+    current = [d.annotate() for d in desired]
+
+    def run():
+        for d_item, c_item in zip(desired, current):
+            assert d_item == c_item
+
+    return run
+
+
+def populate(bodies):
+    ri = ResourceInventory()
+    for cluster, namespace, kind, body in bodies:
+        ri.initialize_resource_type(cluster, namespace, kind)
+        item = OR(body, fixtures.INTEGRATION, fixtures.INTEGRATION_VERSION)
+        name = body['metadata']['name']
+        ri.add_desired(cluster, namespace, kind, name, item)
+        ri.add_current(cluster, namespace, kind, name, item)
+    return ri
+
+
+@benchmark
+def bench_inventory_populate(scale):
+    bodies = fixtures.resource_bodies(scale)
+
+    def run():
+        populate(bodies)
+
+    return run
+
+
+@benchmark
+def bench_inventory_iterate(scale):
+    ri = populate(fixtures.resource_bodies(scale))
+
+    def run():
+        for _, _, _, data in ri:
+            for name in data['desired']:
+                data['current'].get(name)
+
+    return run
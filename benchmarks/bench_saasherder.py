@@ -0,0 +1,17 @@
+from reconcile.utils.saasherder import SaasHerder
+
+from benchmarks import benchmark
+from benchmarks import fixtures
+
+
+@benchmark
+def bench_get_saas_targets_config(scale):
+    saas_files = fixtures.saas_files(scale)
+    saasherder = SaasHerder(saas_files, 1, None, fixtures.INTEGRATION,
+                            fixtures.INTEGRATION_VERSION, {})
+
+    def run():
+        for saas_file in saas_files:
+            saasherder.get_saas_targets_config(saas_file)
+
+    return run
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from reconcile.utils.terrascript_client import TerrascriptClient
+
+from benchmarks import benchmark
+from benchmarks import fixtures
+
+
+INTEGRATION = 'terraform_users'
+
+
+def client(accounts):
+    def get_tf_secrets(self, account):
+        return account['name'], fixtures.aws_secret(account)
+
+    with patch.object(TerrascriptClient, 'get_tf_secrets', get_tf_secrets):
+        return TerrascriptClient(INTEGRATION, 'qrtf', 1, accounts)
+
+
+@benchmark
+def bench_populate_users(scale):
+    accounts = fixtures.aws_accounts(scale)
+    roles = fixtures.roles(accounts, scale)
+
+    def run():
+        client(accounts).populate_users(roles)
+
+    return run
+
+
+@benchmark
+def bench_render(scale):
+    accounts = fixtures.aws_accounts(scale)
+    ts = client(accounts)
+    ts.populate_users(fixtures.roles(accounts, scale))
+
+    def run():
+        for account_ts in ts.tss.values():
+            str(account_ts)
+
+    return run
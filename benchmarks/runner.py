@@ -0,0 +1,155 @@
+"""
+Runs the benchmarks and compares them against a baseline.
+
+Timings depend on the machine they are taken on. A baseline should be
+saved and compared on the same machine, e.g. by saving it on master
+and comparing against it on a feature branch:
+
+    git checkout master
+    python -m benchmarks.runner --save-baseline
+    git checkout my-branch
+    python -m benchmarks.runner
+
+Exits with 1 if a benchmark is slower than its baseline by more than
+the tolerance.
+"""
+import gc
+import importlib
+import json
+import logging
+import pkgutil
+import platform
+import statistics
+import sys
+import timeit
+
+import click
+
+import benchmarks
+
+
+DEFAULT_BASELINE = 'benchmarks/baseline.json'
+
+
+def load_benchmarks():
+    for module in pkgutil.iter_modules(benchmarks.__path__):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f'benchmarks.{module.name}')
+    return benchmarks.BENCHMARKS
+
+
+def run_benchmarks(scale=1.0, repeat=5, names=None):
+    """
+    Times the benchmarks with a name containing any of names.
+
+    Returns a dict of the min and median seconds of a single invocation,
+    indexed by benchmark name.
+    """
+    results = {}
+    for name, func in sorted(load_benchmarks().items()):
+        if names and not any(n in name for n in names):
+            continue
+        run = func(scale)
+        # leave no garbage of the previous benchmarks or the setup behind
+        gc.collect()
+        timings = timeit.repeat(run, number=1, repeat=repeat)
+        results[name] = {
+            'min': min(timings),
+            'median': statistics.median(timings),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares the min timings of results against the ones of baseline.
+
+    Returns a list of (name, baseline seconds, seconds) tuples of the
+    benchmarks that are slower than the baseline by more than tolerance.
+    Benchmarks missing from either side are not compared.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['min'] > base['min'] * (1 + tolerance):
+            regressions.append((name, base['min'], result['min']))
+    return regressions
+
+
+def report(results, baseline):
+    lines = [f'{"benchmark":<45} {"min":>10} {"median":>10} {"change":>8}']
+    for name, result in sorted(results.items()):
+        line = f'{name:<45} {result["min"]:>10.4f} {result["median"]:>10.4f}'
+        base = baseline.get(name)
+        if base:
+            line += f' {result["min"] / base["min"] - 1:>+8.1%}'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+@click.command()
+@click.option('--scale', default=1.0, show_default=True, type=float,
+              help='factor applied to the size of the fixtures.')
+@click.option('--repeat', default=5, show_default=True,
+              type=click.IntRange(min=1),
+              help='number of times each benchmark is timed.')
+@click.option('--filter', 'names', multiple=True,
+              help='only run benchmarks with a name containing this. '
+                   'can be repeated.')
+@click.option('--baseline', 'baseline_path', default=DEFAULT_BASELINE,
+              show_default=True,
+              help='path of the baseline to compare against or save to.')
+@click.option('--save-baseline', is_flag=True,
+              help='save the results as the baseline instead of comparing.')
+@click.option('--tolerance', default=0.2, show_default=True,
+              type=click.FloatRange(min=0),
+              help='allowed slowdown relative to the baseline.')
+@click.option('--output',
+              help='path to write the results to, as json.')
+def main(scale, repeat, names, baseline_path, save_baseline, tolerance,
+         output):
+    # fixtures trigger warnings like users without gpg keys
+    logging.basicConfig(level=logging.ERROR)
+
+    results = run_benchmarks(scale, repeat, names)
+    data = {
+        'scale': scale,
+        'python': platform.python_version(),
+        'benchmarks': results,
+    }
+    if output:
+        with open(output, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    if save_baseline:
+        with open(baseline_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        click.echo(report(results, {}))
+        click.echo(f'baseline saved to {baseline_path}')
+        return
+
+    try:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        click.echo(report(results, {}))
+        click.echo(f'no baseline found at {baseline_path}')
+        return
+
+    if baseline['scale'] != scale:
+        raise click.UsageError(
+            f'baseline was taken with --scale {baseline["scale"]}')
+
+    click.echo(report(results, baseline['benchmarks']))
+    regressions = compare(results, baseline['benchmarks'], tolerance)
+    for name, base, current in regressions:
+        click.echo(f'regression: {name} took {current:.4f}s, '
+                   f'baseline is {base:.4f}s', err=True)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
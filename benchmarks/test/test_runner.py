@@ -0,0 +1,84 @@
+import json
+
+from click.testing import CliRunner
+
+from benchmarks import runner
+
+
+SCALE = 0.05
+
+
+def test_benchmarks_run_offline():
+    results = runner.run_benchmarks(scale=SCALE, repeat=1)
+
+    assert set(results) == set(runner.load_benchmarks())
+    assert 'openshift_base.realize_data' in results
+    for result in results.values():
+        assert result['min'] <= result['median']
+
+
+def test_run_benchmarks_filter():
+    results = runner.run_benchmarks(scale=SCALE, repeat=1,
+                                    names=['aggregated_list.'])
+
+    assert set(results) == {'aggregated_list.add', 'aggregated_list.diff'}
+
+
+def test_compare():
+    baseline = {
+        'faster': {'min': 1.0, 'median': 1.0},
+        'within_tolerance': {'min': 1.0, 'median': 1.0},
+        'slower': {'min': 1.0, 'median': 1.0},
+        'removed': {'min': 1.0, 'median': 1.0},
+    }
+    results = {
+        'faster': {'min': 0.5, 'median': 0.5},
+        'within_tolerance': {'min': 1.1, 'median': 1.1},
+        'slower': {'min': 1.5, 'median': 1.5},
+        'added': {'min': 5.0, 'median': 5.0},
+    }
+
+    assert runner.compare(results, baseline, 0.2) == [('slower', 1.0, 1.5)]
+
+
+def test_main_save_and_compare(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    args = ['--scale', str(SCALE), '--repeat', '1',
+            '--filter', 'aggregated_list.', '--baseline', str(baseline)]
+    cli = CliRunner()
+
+    result = cli.invoke(runner.main, args + ['--save-baseline'])
+    assert result.exit_code == 0
+    saved = json.loads(baseline.read_text())
+    assert saved['scale'] == SCALE
+    assert set(saved['benchmarks']) == \
+        {'aggregated_list.add', 'aggregated_list.diff'}
+
+    # any slowdown is tolerated
+    result = cli.invoke(runner.main, args + ['--tolerance', '1000'])
+    assert result.exit_code == 0
+
+
+def test_main_regression(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({
+        'scale': SCALE,
+        'benchmarks': {'aggregated_list.diff': {'min': 1e-9,
+                                                'median': 1e-9}},
+    }))
+    args = ['--scale', str(SCALE), '--repeat', '1',
+            '--filter', 'aggregated_list.diff', '--baseline', str(baseline)]
+
+    result = CliRunner().invoke(runner.main, args)
+    assert result.exit_code == 1
+    assert 'regression: aggregated_list.diff' in result.output
+
+
+def test_main_baseline_scale_mismatch(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({'scale': 1.0, 'benchmarks': {}}))
+    args = ['--scale', str(SCALE), '--repeat', '1',
+            '--filter', 'aggregated_list.diff', '--baseline', str(baseline)]
+
+    result = CliRunner().invoke(runner.main, args)
+    assert result.exit_code == 2
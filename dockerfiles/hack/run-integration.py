@@ -112,6 +112,10 @@ def main():
       amount of seconds to sleep between successful integration runs
     * SLEEP_ON_ERROR (default 10)
       amount of seconds to sleep before another integration run is started
+    * QONTRACT_PROFILE_DIR (optional)
+      directory to write CPU profiles and peak memory of the runs to
+    * QONTRACT_PROFILE_SAMPLE_RATE (optional, default 1.0)
+      fraction of the runs to profile when QONTRACT_PROFILE_DIR is set
 
     Based on those variables, the following command will be executed
       $COMMAND --config $CONFIG $DRY_RUN $INTEGRATION_NAME $INTEGRATION_EXTRA_ARGS
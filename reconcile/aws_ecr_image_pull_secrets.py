@@ -45,24 +45,30 @@ def construct_basic_auth_secret_data(data):
     return {'user': enc_dec('AWS'), 'token': enc_dec(password), 'url': url}
 
 
-def write_output_to_vault(dry_run, vault_path, account, secret_data, name):
+def construct_output_secret(vault_path, account, secret_data, name):
     integration_name = QONTRACT_INTEGRATION
     secret_path = f"{vault_path}/{integration_name}/{account}/{name}"
-    secret = {'path': secret_path, 'data': secret_data}
-    logging.info(['write_secret', secret_path])
-    vault_client = VaultClient()
+    return {'path': secret_path, 'data': secret_data}
+
+
+def write_outputs_to_vault(dry_run, secrets):
+    for secret in secrets:
+        logging.info(['write_secret', secret['path']])
     if not dry_run:
-        vault_client.write(secret)
+        vault_client = VaultClient()
+        vault_client.write_many(secrets)
 
 
 def run(dry_run, vault_output_path=''):
     accounts = [a for a in queries.get_aws_accounts() if a.get('ecrs')]
     settings = queries.get_app_interface_settings()
     aws = AWSApi(1, accounts, settings=settings, init_ecr_auth_tokens=True)
+    secrets = []
     for account, data in aws.auth_tokens.items():
         dockercfg_secret_data = construct_dockercfg_secret_data(data)
         basic_auth_secret_data = construct_basic_auth_secret_data(data)
-        write_output_to_vault(dry_run, vault_output_path,
-                              account, dockercfg_secret_data, 'dockercfg')
-        write_output_to_vault(dry_run, vault_output_path,
-                              account, basic_auth_secret_data, 'basic-auth')
+        secrets.append(construct_output_secret(
+            vault_output_path, account, dockercfg_secret_data, 'dockercfg'))
+        secrets.append(construct_output_secret(
+            vault_output_path, account, basic_auth_secret_data, 'basic-auth'))
+    write_outputs_to_vault(dry_run, secrets)
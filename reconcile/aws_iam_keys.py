@@ -1,5 +1,4 @@
 import sys
-import shutil
 
 from reconcile import queries
 
@@ -7,8 +6,12 @@ from reconcile.utils.defer import defer
 from reconcile.utils.aws_api import AWSApi
 from reconcile.utils.terrascript_client \
     import TerrascriptClient as Terrascript
+from reconcile.utils.terrascript_client import cleanup_working_dirs
 
 QONTRACT_INTEGRATION = 'aws-iam-keys'
+# the terraform-resources config is rendered into working
+# directories of our own, not the ones of terraform-resources
+TF_WORKING_DIR_NAMESPACE = QONTRACT_INTEGRATION
 
 
 def filter_accounts(accounts, account_name):
@@ -38,13 +41,13 @@ def init_tf_working_dirs(accounts, thread_pool_size, settings):
                      QONTRACT_TF_PREFIX,
                      thread_pool_size,
                      accounts,
-                     settings=settings)
+                     settings=settings,
+                     working_dir_namespace=TF_WORKING_DIR_NAMESPACE)
     return ts.dump()
 
 
 def cleanup(working_dirs):
-    for wd in working_dirs.values():
-        shutil.rmtree(wd)
+    cleanup_working_dirs(working_dirs)
 
 
 @defer
@@ -54,9 +57,15 @@ def run(dry_run, thread_pool_size=10,
     if not accounts:
         raise ValueError(f"aws account {account_name} not found")
 
-    settings = queries.get_app_interface_settings()
-    aws = AWSApi(thread_pool_size, accounts, settings=settings)
     keys_to_delete = get_keys_to_delete(accounts)
+    if not keys_to_delete:
+        return
+
+    # only the accounts with keys to delete are of interest
+    accounts = [a for a in accounts if a['name'] in keys_to_delete]
+    settings = queries.get_app_interface_settings()
+    aws = AWSApi(thread_pool_size, accounts, settings=settings,
+                 init_users=False)
     working_dirs = init_tf_working_dirs(accounts, thread_pool_size, settings)
     defer(lambda: cleanup(working_dirs))
     error = aws.delete_keys(dry_run, keys_to_delete, working_dirs,
@@ -1,3 +1,4 @@
+import importlib
 import json
 import logging
 import os
@@ -9,105 +10,7 @@ import sentry_sdk
 
 from reconcile.utils import config
 from reconcile.utils import gql
-import reconcile.dyn_traffic_director
-import reconcile.github_org
-import reconcile.github_owners
-import reconcile.github_users
-import reconcile.github_scanner
-import reconcile.github_validator
-import reconcile.openshift_clusterrolebindings
-import reconcile.openshift_rolebindings
-import reconcile.openshift_groups
-import reconcile.openshift_limitranges
-import reconcile.openshift_resourcequotas
-import reconcile.openshift_users
-import reconcile.openshift_resources
-import reconcile.openshift_vault_secrets
-import reconcile.openshift_routes
-import reconcile.openshift_namespace_labels
-import reconcile.openshift_namespaces
-import reconcile.openshift_network_policies
-import reconcile.openshift_serviceaccount_tokens
-import reconcile.openshift_saas_deploy
-import reconcile.openshift_saas_deploy_wrapper
-import reconcile.openshift_saas_deploy_trigger_moving_commits
-import reconcile.openshift_saas_deploy_trigger_upstream_jobs
-import reconcile.openshift_saas_deploy_trigger_configs
-import reconcile.openshift_saas_deploy_trigger_cleaner
-import reconcile.openshift_tekton_resources
-import reconcile.saas_file_owners
-import reconcile.gitlab_ci_skipper
-import reconcile.gitlab_labeler
-import reconcile.saas_file_validator
-import reconcile.quay_membership
-import reconcile.gcr_mirror
-import reconcile.quay_mirror
-import reconcile.quay_mirror_org
-import reconcile.quay_repos
-import reconcile.quay_permissions
-import reconcile.ldap_users
-import reconcile.terraform_resources
-import reconcile.terraform_resources_wrapper
-import reconcile.terraform_users
-import reconcile.terraform_vpc_peerings
-import reconcile.terraform_tgw_attachments
-import reconcile.github_repo_invites
-import reconcile.github_repo_permissions_validator
-import reconcile.jenkins_roles
-import reconcile.jenkins_plugins
-import reconcile.jenkins_job_builder
-import reconcile.jenkins_job_cleaner
-import reconcile.jenkins_webhooks
-import reconcile.jenkins_webhooks_cleaner
-import reconcile.jira_watcher
-import reconcile.unleash_watcher
-import reconcile.openshift_upgrade_watcher
-import reconcile.slack_usergroups
-import reconcile.slack_cluster_usergroups
-import reconcile.gitlab_integrations
-import reconcile.gitlab_permissions
-import reconcile.gitlab_housekeeping
-import reconcile.gitlab_fork_compliance
-import reconcile.gitlab_members
-import reconcile.gitlab_owners
-import reconcile.gitlab_mr_sqs_consumer
-import reconcile.gitlab_projects
-import reconcile.aws_garbage_collector
-import reconcile.aws_iam_keys
-import reconcile.aws_iam_password_reset
-import reconcile.aws_ecr_image_pull_secrets
-import reconcile.aws_support_cases_sos
-import reconcile.ocm_groups
-import reconcile.ocm_clusters
-import reconcile.ocm_external_configuration_labels
-import reconcile.ocm_machine_pools
-import reconcile.ocm_upgrade_scheduler
-import reconcile.ocm_addons
-import reconcile.ocm_aws_infrastructure_access
-import reconcile.ocm_github_idp
-import reconcile.ocm_additional_routers
-import reconcile.email_sender
-import reconcile.sentry_helper
-import reconcile.requests_sender
-import reconcile.service_dependencies
-import reconcile.sentry_config
-import reconcile.sql_query
-import reconcile.user_validator
-import reconcile.integrations_validator
-import reconcile.dashdotdb_cso
-import reconcile.ocp_release_mirror
-import reconcile.ecr_mirror
-import reconcile.kafka_clusters
-import reconcile.terraform_aws_route53
-import reconcile.prometheus_rules_tester
-import reconcile.dashdotdb_dvo
-import reconcile.sendgrid_teammates
-import reconcile.osd_mirrors_data_updater
-import reconcile.dashdotdb_slo
-import reconcile.jenkins_job_builds_cleaner
-import reconcile.cluster_deployment_mapper
-import reconcile.gabi_authorized_users
-import reconcile.status_page_components
+from reconcile.utils import profiling
 
 from reconcile.status import ExitCodes
 from reconcile.status import RunningState
@@ -219,6 +122,22 @@ def gql_url_print(function):
     return function
 
 
+def profile(function):
+    help_msg = ('Directory to write a CPU profile and the peak memory of '
+                'the integration run to. Disabled if not set.')
+    function = click.option('--profile-dir',
+                            envvar='QONTRACT_PROFILE_DIR',
+                            help=help_msg)(function)
+
+    help_msg = 'Fraction of the integration runs to profile.'
+    function = click.option('--profile-sample-rate',
+                            envvar='QONTRACT_PROFILE_SAMPLE_RATE',
+                            default=1.0,
+                            type=click.FloatRange(0, 1),
+                            help=help_msg)(function)
+    return function
+
+
 def threaded(**kwargs):
     def f(function):
         opt = '--thread-pool-size'
@@ -309,6 +228,19 @@ def throughput(function):
     return function
 
 
+def drift_detection_interval(function):
+    help_msg = ('skip terraform plan for accounts whose rendered config and '
+                'remote state did not change since their last plan without '
+                'changes. a plan is still run every given number of seconds '
+                'to detect drift. plans are never skipped if not set.')
+    function = click.option('--drift-detection-interval',
+                            help=help_msg,
+                            type=int,
+                            default=None)(function)
+
+    return function
+
+
 def vault_input_path(function):
     function = click.option('--vault-input-path',
                             help='path in Vault to find input resources.',
@@ -410,6 +342,12 @@ def enable_rebase(**kwargs):
 
 
 def run_integration(func_container, ctx, *args, **kwargs):
+    # integration modules are imported only when their command is invoked
+    # to keep the heavy dependencies of all other integrations out of
+    # the process
+    if isinstance(func_container, str):
+        func_container = importlib.import_module(func_container)
+
     try:
         int_name = func_container.QONTRACT_INTEGRATION.replace('_', '-')
         running_state = RunningState()
@@ -435,7 +373,9 @@ def run_integration(func_container, ctx, *args, **kwargs):
     dry_run = ctx.get('dry_run', False)
 
     try:
-        func_container.run(dry_run, *args, **kwargs)
+        with profiling.profile(ctx.get('profile_dir'), int_name,
+                               ctx.get('profile_sample_rate', 1.0)):
+            func_container.run(dry_run, *args, **kwargs)
     except RunnerException as e:
         sys.stderr.write(str(e) + "\n")
         sys.exit(ExitCodes.ERROR)
@@ -462,9 +402,11 @@ def init_log_level(log_level):
 @gql_sha_url
 @gql_url_print
 @log_level
+@profile
 @click.pass_context
 def integration(ctx, configfile, dry_run, validate_schemas, dump_schemas_file,
-                log_level, gql_sha_url, gql_url_print):
+                log_level, gql_sha_url, gql_url_print, profile_dir,
+                profile_sample_rate):
     ctx.ensure_object(dict)
 
     init_log_level(log_level)
@@ -474,6 +416,8 @@ def integration(ctx, configfile, dry_run, validate_schemas, dump_schemas_file,
     ctx.obj['gql_sha_url'] = gql_sha_url
     ctx.obj['gql_url_print'] = gql_url_print
     ctx.obj['dump_schemas_file'] = dump_schemas_file
+    ctx.obj['profile_dir'] = profile_dir
+    ctx.obj['profile_sample_rate'] = profile_sample_rate
 
 
 @integration.command()
@@ -486,20 +430,20 @@ def integration(ctx, configfile, dry_run, validate_schemas, dump_schemas_file,
 @click.pass_context
 def terraform_aws_route53(ctx, print_to_file, enable_deletion,
                           thread_pool_size):
-    run_integration(reconcile.terraform_aws_route53, ctx.obj,
+    run_integration('reconcile.terraform_aws_route53', ctx.obj,
                     print_to_file, enable_deletion, thread_pool_size)
 
 
 @integration.command()
 @click.pass_context
 def github(ctx):
-    run_integration(reconcile.github_org, ctx.obj)
+    run_integration('reconcile.github_org', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def github_owners(ctx):
-    run_integration(reconcile.github_owners, ctx.obj)
+    run_integration('reconcile.github_owners', ctx.obj)
 
 
 @integration.command()
@@ -511,7 +455,7 @@ def github_owners(ctx):
 @click.pass_context
 def github_users(ctx, gitlab_project_id, thread_pool_size,
                  enable_deletion, send_mails):
-    run_integration(reconcile.github_users, ctx.obj,
+    run_integration('reconcile.github_users', ctx.obj,
                     gitlab_project_id, thread_pool_size,
                     enable_deletion, send_mails)
 
@@ -523,14 +467,14 @@ def github_users(ctx, gitlab_project_id, thread_pool_size,
 @binary(['git', 'git-secrets'])
 @click.pass_context
 def github_scanner(ctx, gitlab_project_id, thread_pool_size):
-    run_integration(reconcile.github_scanner, ctx.obj,
+    run_integration('reconcile.github_scanner', ctx.obj,
                     gitlab_project_id, thread_pool_size)
 
 
 @integration.command()
 @click.pass_context
 def github_validator(ctx):
-    run_integration(reconcile.github_validator, ctx.obj)
+    run_integration('reconcile.github_validator', ctx.obj)
 
 
 @integration.command()
@@ -542,7 +486,7 @@ def github_validator(ctx):
 @click.pass_context
 def openshift_clusterrolebindings(ctx, thread_pool_size, internal,
                                   use_jump_host):
-    run_integration(reconcile.openshift_clusterrolebindings,
+    run_integration('reconcile.openshift_clusterrolebindings',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host)
 
@@ -555,7 +499,7 @@ def openshift_clusterrolebindings(ctx, thread_pool_size, internal,
 @use_jump_host()
 @click.pass_context
 def openshift_rolebindings(ctx, thread_pool_size, internal, use_jump_host):
-    run_integration(reconcile.openshift_rolebindings, ctx.obj,
+    run_integration('reconcile.openshift_rolebindings', ctx.obj,
                     thread_pool_size, internal, use_jump_host)
 
 
@@ -567,7 +511,7 @@ def openshift_rolebindings(ctx, thread_pool_size, internal, use_jump_host):
 @use_jump_host()
 @click.pass_context
 def openshift_groups(ctx, thread_pool_size, internal, use_jump_host):
-    run_integration(reconcile.openshift_groups, ctx.obj,
+    run_integration('reconcile.openshift_groups', ctx.obj,
                     thread_pool_size, internal, use_jump_host)
 
 
@@ -579,7 +523,7 @@ def openshift_groups(ctx, thread_pool_size, internal, use_jump_host):
 @use_jump_host()
 @click.pass_context
 def openshift_users(ctx, thread_pool_size, internal, use_jump_host):
-    run_integration(reconcile.openshift_users, ctx.obj,
+    run_integration('reconcile.openshift_users', ctx.obj,
                     thread_pool_size, internal, use_jump_host)
 
 
@@ -593,7 +537,7 @@ def openshift_users(ctx, thread_pool_size, internal, use_jump_host):
 @click.pass_context
 def openshift_serviceaccount_tokens(ctx, thread_pool_size, internal,
                                     use_jump_host, vault_output_path):
-    run_integration(reconcile.openshift_serviceaccount_tokens,
+    run_integration('reconcile.openshift_serviceaccount_tokens',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host, vault_output_path)
 
@@ -601,13 +545,13 @@ def openshift_serviceaccount_tokens(ctx, thread_pool_size, internal,
 @integration.command()
 @click.pass_context
 def jenkins_roles(ctx):
-    run_integration(reconcile.jenkins_roles, ctx.obj)
+    run_integration('reconcile.jenkins_roles', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def jenkins_plugins(ctx):
-    run_integration(reconcile.jenkins_plugins, ctx.obj)
+    run_integration('reconcile.jenkins_plugins', ctx.obj)
 
 
 @integration.command()
@@ -620,46 +564,46 @@ def jenkins_plugins(ctx):
 @click.pass_context
 def jenkins_job_builder(ctx, io_dir, print_only,
                         config_name, job_name, instance_name):
-    run_integration(reconcile.jenkins_job_builder, ctx.obj, io_dir,
+    run_integration('reconcile.jenkins_job_builder', ctx.obj, io_dir,
                     print_only, config_name, job_name, instance_name)
 
 
 @integration.command()
 @click.pass_context
 def jenkins_job_builds_cleaner(ctx):
-    run_integration(reconcile.jenkins_job_builds_cleaner, ctx.obj)
+    run_integration('reconcile.jenkins_job_builds_cleaner', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def jenkins_job_cleaner(ctx):
-    run_integration(reconcile.jenkins_job_cleaner, ctx.obj)
+    run_integration('reconcile.jenkins_job_cleaner', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def jenkins_webhooks(ctx):
-    run_integration(reconcile.jenkins_webhooks, ctx.obj)
+    run_integration('reconcile.jenkins_webhooks', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def jenkins_webhooks_cleaner(ctx):
-    run_integration(reconcile.jenkins_webhooks_cleaner, ctx.obj)
+    run_integration('reconcile.jenkins_webhooks_cleaner', ctx.obj)
 
 
 @integration.command()
 @environ(['APP_INTERFACE_STATE_BUCKET', 'APP_INTERFACE_STATE_BUCKET_ACCOUNT'])
 @click.pass_context
 def jira_watcher(ctx):
-    run_integration(reconcile.jira_watcher, ctx.obj)
+    run_integration('reconcile.jira_watcher', ctx.obj)
 
 
 @integration.command()
 @environ(['APP_INTERFACE_STATE_BUCKET', 'APP_INTERFACE_STATE_BUCKET_ACCOUNT'])
 @click.pass_context
 def unleash_watcher(ctx):
-    run_integration(reconcile.unleash_watcher, ctx.obj)
+    run_integration('reconcile.unleash_watcher', ctx.obj)
 
 
 @integration.command()
@@ -671,33 +615,33 @@ def unleash_watcher(ctx):
 @use_jump_host()
 @click.pass_context
 def openshift_upgrade_watcher(ctx, thread_pool_size, internal, use_jump_host):
-    run_integration(reconcile.openshift_upgrade_watcher, ctx.obj,
+    run_integration('reconcile.openshift_upgrade_watcher', ctx.obj,
                     thread_pool_size, internal, use_jump_host)
 
 
 @integration.command()
 @click.pass_context
 def slack_usergroups(ctx):
-    run_integration(reconcile.slack_usergroups, ctx.obj)
+    run_integration('reconcile.slack_usergroups', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def slack_cluster_usergroups(ctx):
-    run_integration(reconcile.slack_cluster_usergroups, ctx.obj)
+    run_integration('reconcile.slack_cluster_usergroups', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def gitlab_integrations(ctx):
-    run_integration(reconcile.gitlab_integrations, ctx.obj)
+    run_integration('reconcile.gitlab_integrations', ctx.obj)
 
 
 @integration.command()
 @threaded()
 @click.pass_context
 def gitlab_permissions(ctx, thread_pool_size):
-    run_integration(reconcile.gitlab_permissions, ctx.obj,
+    run_integration('reconcile.gitlab_permissions', ctx.obj,
                     thread_pool_size)
 
 
@@ -707,17 +651,18 @@ def gitlab_permissions(ctx, thread_pool_size):
               help='wait for pending/running pipelines before acting.')
 @click.pass_context
 def gitlab_housekeeping(ctx, wait_for_pipeline):
-    run_integration(reconcile.gitlab_housekeeping, ctx.obj,
+    run_integration('reconcile.gitlab_housekeeping', ctx.obj,
                     wait_for_pipeline)
 
 
 @integration.command()
 @environ(['gitlab_pr_submitter_queue_url'])
 @click.argument('gitlab-project-id')
+@threaded()
 @click.pass_context
-def gitlab_mr_sqs_consumer(ctx, gitlab_project_id):
-    run_integration(reconcile.gitlab_mr_sqs_consumer, ctx.obj,
-                    gitlab_project_id)
+def gitlab_mr_sqs_consumer(ctx, gitlab_project_id, thread_pool_size):
+    run_integration('reconcile.gitlab_mr_sqs_consumer', ctx.obj,
+                    gitlab_project_id, thread_pool_size)
 
 
 @integration.command()
@@ -725,7 +670,7 @@ def gitlab_mr_sqs_consumer(ctx, gitlab_project_id):
 @threaded()
 @click.pass_context
 def aws_garbage_collector(ctx, thread_pool_size, io_dir):
-    run_integration(reconcile.aws_garbage_collector, ctx.obj,
+    run_integration('reconcile.aws_garbage_collector', ctx.obj,
                     thread_pool_size, io_dir)
 
 
@@ -734,7 +679,7 @@ def aws_garbage_collector(ctx, thread_pool_size, io_dir):
 @account_name
 @click.pass_context
 def aws_iam_keys(ctx, thread_pool_size, account_name):
-    run_integration(reconcile.aws_iam_keys, ctx.obj,
+    run_integration('reconcile.aws_iam_keys', ctx.obj,
                     thread_pool_size, account_name=account_name)
 
 
@@ -742,14 +687,14 @@ def aws_iam_keys(ctx, thread_pool_size, account_name):
 @environ(['APP_INTERFACE_STATE_BUCKET', 'APP_INTERFACE_STATE_BUCKET_ACCOUNT'])
 @click.pass_context
 def aws_iam_password_reset(ctx):
-    run_integration(reconcile.aws_iam_password_reset, ctx.obj)
+    run_integration('reconcile.aws_iam_password_reset', ctx.obj)
 
 
 @integration.command()
 @vault_output_path
 @click.pass_context
 def aws_ecr_image_pull_secrets(ctx, vault_output_path):
-    run_integration(reconcile.aws_ecr_image_pull_secrets, ctx.obj,
+    run_integration('reconcile.aws_ecr_image_pull_secrets', ctx.obj,
                     vault_output_path)
 
 
@@ -759,7 +704,7 @@ def aws_ecr_image_pull_secrets(ctx, vault_output_path):
 @threaded()
 @click.pass_context
 def aws_support_cases_sos(ctx, gitlab_project_id, thread_pool_size):
-    run_integration(reconcile.aws_support_cases_sos, ctx.obj,
+    run_integration('reconcile.aws_support_cases_sos', ctx.obj,
                     gitlab_project_id, thread_pool_size)
 
 
@@ -774,7 +719,7 @@ def aws_support_cases_sos(ctx, gitlab_project_id, thread_pool_size):
 @click.pass_context
 def openshift_resources(ctx, thread_pool_size, internal, use_jump_host,
                         cluster_name, namespace_name):
-    run_integration(reconcile.openshift_resources,
+    run_integration('reconcile.openshift_resources',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host,
                     cluster_name=cluster_name,
@@ -798,7 +743,7 @@ def openshift_resources(ctx, thread_pool_size, internal, use_jump_host,
 @click.pass_context
 def openshift_saas_deploy(ctx, thread_pool_size, io_dir,
                           saas_file_name, env_name, gitlab_project_id):
-    run_integration(reconcile.openshift_saas_deploy,
+    run_integration('reconcile.openshift_saas_deploy',
                     ctx.obj, thread_pool_size, io_dir,
                     saas_file_name, env_name, gitlab_project_id)
 
@@ -814,14 +759,14 @@ def openshift_saas_deploy(ctx, thread_pool_size, io_dir,
 @click.pass_context
 def openshift_saas_deploy_wrapper(ctx, thread_pool_size, io_dir,
                                   gitlab_project_id):
-    run_integration(reconcile.openshift_saas_deploy_wrapper,
+    run_integration('reconcile.openshift_saas_deploy_wrapper',
                     ctx.obj, thread_pool_size, io_dir, gitlab_project_id)
 
 
 @integration.command()
 @click.pass_context
 def saas_file_validator(ctx):
-    run_integration(reconcile.saas_file_validator, ctx.obj)
+    run_integration('reconcile.saas_file_validator', ctx.obj)
 
 
 @integration.command()
@@ -835,7 +780,7 @@ def saas_file_validator(ctx):
 def openshift_saas_deploy_trigger_moving_commits(ctx, thread_pool_size,
                                                  internal, use_jump_host):
     run_integration(
-        reconcile.openshift_saas_deploy_trigger_moving_commits,
+        'reconcile.openshift_saas_deploy_trigger_moving_commits',
         ctx.obj, thread_pool_size, internal, use_jump_host)
 
 
@@ -850,7 +795,7 @@ def openshift_saas_deploy_trigger_moving_commits(ctx, thread_pool_size,
 def openshift_saas_deploy_trigger_upstream_jobs(ctx, thread_pool_size,
                                                 internal, use_jump_host):
     run_integration(
-        reconcile.openshift_saas_deploy_trigger_upstream_jobs,
+        'reconcile.openshift_saas_deploy_trigger_upstream_jobs',
         ctx.obj, thread_pool_size, internal, use_jump_host)
 
 
@@ -865,7 +810,7 @@ def openshift_saas_deploy_trigger_upstream_jobs(ctx, thread_pool_size,
 def openshift_saas_deploy_trigger_configs(ctx, thread_pool_size,
                                           internal, use_jump_host):
     run_integration(
-        reconcile.openshift_saas_deploy_trigger_configs,
+        'reconcile.openshift_saas_deploy_trigger_configs',
         ctx.obj, thread_pool_size, internal, use_jump_host)
 
 
@@ -879,7 +824,7 @@ def openshift_saas_deploy_trigger_configs(ctx, thread_pool_size,
 def openshift_saas_deploy_trigger_cleaner(ctx, thread_pool_size,
                                           internal, use_jump_host):
     run_integration(
-        reconcile.openshift_saas_deploy_trigger_cleaner,
+        'reconcile.openshift_saas_deploy_trigger_cleaner',
         ctx.obj, thread_pool_size, internal, use_jump_host)
 
 
@@ -891,7 +836,7 @@ def openshift_saas_deploy_trigger_cleaner(ctx, thread_pool_size,
 @click.pass_context
 def openshift_tekton_resources(ctx, thread_pool_size,
                                internal, use_jump_host, saas_file_name):
-    run_integration(reconcile.openshift_tekton_resources,
+    run_integration('reconcile.openshift_tekton_resources',
                     ctx.obj,
                     thread_pool_size,
                     internal,
@@ -909,7 +854,7 @@ def openshift_tekton_resources(ctx, thread_pool_size,
 @click.pass_context
 def saas_file_owners(ctx, gitlab_project_id, gitlab_merge_request_id,
                      io_dir, compare):
-    run_integration(reconcile.saas_file_owners, ctx.obj,
+    run_integration('reconcile.saas_file_owners', ctx.obj,
                     gitlab_project_id, gitlab_merge_request_id,
                     io_dir, compare)
 
@@ -919,7 +864,7 @@ def saas_file_owners(ctx, gitlab_project_id, gitlab_merge_request_id,
 @click.argument('gitlab-merge-request-id')
 @click.pass_context
 def gitlab_ci_skipper(ctx, gitlab_project_id, gitlab_merge_request_id):
-    run_integration(reconcile.gitlab_ci_skipper, ctx.obj,
+    run_integration('reconcile.gitlab_ci_skipper', ctx.obj,
                     gitlab_project_id, gitlab_merge_request_id)
 
 
@@ -928,7 +873,7 @@ def gitlab_ci_skipper(ctx, gitlab_project_id, gitlab_merge_request_id):
 @click.argument('gitlab-merge-request-id')
 @click.pass_context
 def gitlab_labeler(ctx, gitlab_project_id, gitlab_merge_request_id):
-    run_integration(reconcile.gitlab_labeler, ctx.obj,
+    run_integration('reconcile.gitlab_labeler', ctx.obj,
                     gitlab_project_id, gitlab_merge_request_id)
 
 
@@ -941,7 +886,7 @@ def gitlab_labeler(ctx, gitlab_project_id, gitlab_merge_request_id):
 @use_jump_host()
 @click.pass_context
 def openshift_namespace_labels(ctx, thread_pool_size, internal, use_jump_host):
-    run_integration(reconcile.openshift_namespace_labels,
+    run_integration('reconcile.openshift_namespace_labels',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host)
 
@@ -954,7 +899,7 @@ def openshift_namespace_labels(ctx, thread_pool_size, internal, use_jump_host):
 @use_jump_host()
 @click.pass_context
 def openshift_namespaces(ctx, thread_pool_size, internal, use_jump_host):
-    run_integration(reconcile.openshift_namespaces,
+    run_integration('reconcile.openshift_namespaces',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host)
 
@@ -967,7 +912,7 @@ def openshift_namespaces(ctx, thread_pool_size, internal, use_jump_host):
 @use_jump_host()
 @click.pass_context
 def openshift_network_policies(ctx, thread_pool_size, internal, use_jump_host):
-    run_integration(reconcile.openshift_network_policies,
+    run_integration('reconcile.openshift_network_policies',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host)
 
@@ -982,7 +927,7 @@ def openshift_network_policies(ctx, thread_pool_size, internal, use_jump_host):
 @click.pass_context
 def openshift_limitranges(ctx, thread_pool_size, internal,
                           use_jump_host, take_over):
-    run_integration(reconcile.openshift_limitranges,
+    run_integration('reconcile.openshift_limitranges',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host, take_over)
 
@@ -997,7 +942,7 @@ def openshift_limitranges(ctx, thread_pool_size, internal,
 @click.pass_context
 def openshift_resourcequotas(ctx, thread_pool_size, internal,
                              use_jump_host, take_over):
-    run_integration(reconcile.openshift_resourcequotas,
+    run_integration('reconcile.openshift_resourcequotas',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host, take_over)
 
@@ -1013,7 +958,7 @@ def openshift_resourcequotas(ctx, thread_pool_size, internal,
 @click.pass_context
 def openshift_vault_secrets(ctx, thread_pool_size, internal, use_jump_host,
                             cluster_name, namespace_name):
-    run_integration(reconcile.openshift_vault_secrets,
+    run_integration('reconcile.openshift_vault_secrets',
                     ctx.obj, thread_pool_size, internal, use_jump_host,
                     cluster_name=cluster_name,
                     namespace_name=namespace_name)
@@ -1030,7 +975,7 @@ def openshift_vault_secrets(ctx, thread_pool_size, internal, use_jump_host,
 @click.pass_context
 def openshift_routes(ctx, thread_pool_size, internal, use_jump_host,
                      cluster_name, namespace_name):
-    run_integration(reconcile.openshift_routes,
+    run_integration('reconcile.openshift_routes',
                     ctx.obj, thread_pool_size, internal, use_jump_host,
                     cluster_name=cluster_name,
                     namespace_name=namespace_name)
@@ -1039,53 +984,55 @@ def openshift_routes(ctx, thread_pool_size, internal, use_jump_host,
 @integration.command()
 @click.pass_context
 def quay_membership(ctx):
-    run_integration(reconcile.quay_membership, ctx.obj)
+    run_integration('reconcile.quay_membership', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 @binary(['skopeo'])
 def gcr_mirror(ctx):
-    run_integration(reconcile.gcr_mirror, ctx.obj)
+    run_integration('reconcile.gcr_mirror', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 @binary(['skopeo'])
 def quay_mirror(ctx):
-    run_integration(reconcile.quay_mirror, ctx.obj)
+    run_integration('reconcile.quay_mirror', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 @binary(['skopeo'])
 def quay_mirror_org(ctx):
-    run_integration(reconcile.quay_mirror_org, ctx.obj)
+    run_integration('reconcile.quay_mirror_org', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def quay_repos(ctx):
-    run_integration(reconcile.quay_repos, ctx.obj)
+    run_integration('reconcile.quay_repos', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def quay_permissions(ctx):
-    run_integration(reconcile.quay_permissions, ctx.obj)
+    run_integration('reconcile.quay_permissions', ctx.obj)
 
 
 @integration.command()
 @click.argument('gitlab-project-id')
+@threaded()
 @click.pass_context
-def ldap_users(ctx, gitlab_project_id):
-    run_integration(reconcile.ldap_users, ctx.obj, gitlab_project_id)
+def ldap_users(ctx, gitlab_project_id, thread_pool_size):
+    run_integration('reconcile.ldap_users', ctx.obj, gitlab_project_id,
+                    thread_pool_size)
 
 
 @integration.command()
 @click.pass_context
 def user_validator(ctx):
-    run_integration(reconcile.user_validator, ctx.obj)
+    run_integration('reconcile.user_validator', ctx.obj)
 
 
 @integration.command()
@@ -1101,21 +1048,24 @@ def user_validator(ctx):
 @use_jump_host()
 @enable_deletion(default=False)
 @account_name
+@drift_detection_interval
 @click.option('--light/--full',
               default=False,
               help='run without executing terraform plan and apply.')
 @click.pass_context
 def terraform_resources(ctx, print_to_file, enable_deletion,
                         io_dir, thread_pool_size, internal, use_jump_host,
-                        light, vault_output_path, account_name):
+                        light, vault_output_path, account_name,
+                        drift_detection_interval):
     if print_to_file and is_file_in_git_repo(print_to_file):
         raise PrintToFileInGitRepositoryError(print_to_file)
-    run_integration(reconcile.terraform_resources,
+    run_integration('reconcile.terraform_resources',
                     ctx.obj, print_to_file,
                     enable_deletion, io_dir, thread_pool_size,
                     internal, use_jump_host, light, vault_output_path,
                     account_name=account_name,
-                    extra_labels=ctx.obj.get('extra_labels', {}))
+                    extra_labels=ctx.obj.get('extra_labels', {}),
+                    drift_detection_interval=drift_detection_interval)
 
 
 @integration.command()
@@ -1139,7 +1089,7 @@ def terraform_resources_wrapper(ctx, print_to_file, enable_deletion,
                                 use_jump_host, light, vault_output_path):
     if print_to_file and is_file_in_git_repo(print_to_file):
         raise PrintToFileInGitRepositoryError(print_to_file)
-    run_integration(reconcile.terraform_resources_wrapper,
+    run_integration('reconcile.terraform_resources_wrapper',
                     ctx.obj, print_to_file,
                     enable_deletion, io_dir, thread_pool_size,
                     internal, use_jump_host, light, vault_output_path,
@@ -1155,15 +1105,17 @@ def terraform_resources_wrapper(ctx, print_to_file, enable_deletion,
                 TERRAFORM_VERSION_REGEX, TERRAFORM_VERSION)
 @enable_deletion(default=True)
 @send_mails(default=True)
+@drift_detection_interval
 @click.pass_context
 def terraform_users(ctx, print_to_file, enable_deletion, io_dir,
-                    thread_pool_size, send_mails):
+                    thread_pool_size, send_mails, drift_detection_interval):
     if print_to_file and is_file_in_git_repo(print_to_file):
         raise PrintToFileInGitRepositoryError(print_to_file)
-    run_integration(reconcile.terraform_users,
+    run_integration('reconcile.terraform_users',
                     ctx.obj, print_to_file,
                     enable_deletion, io_dir,
-                    thread_pool_size, send_mails)
+                    thread_pool_size, send_mails,
+                    drift_detection_interval=drift_detection_interval)
 
 
 @integration.command()
@@ -1178,7 +1130,7 @@ def terraform_vpc_peerings(ctx, print_to_file, enable_deletion,
                            thread_pool_size):
     if print_to_file and is_file_in_git_repo(print_to_file):
         raise PrintToFileInGitRepositoryError(print_to_file)
-    run_integration(reconcile.terraform_vpc_peerings,
+    run_integration('reconcile.terraform_vpc_peerings',
                     ctx.obj, print_to_file,
                     enable_deletion, thread_pool_size)
 
@@ -1195,7 +1147,7 @@ def terraform_tgw_attachments(ctx, print_to_file, enable_deletion,
                               thread_pool_size):
     if print_to_file and is_file_in_git_repo(print_to_file):
         raise PrintToFileInGitRepositoryError(print_to_file)
-    run_integration(reconcile.terraform_tgw_attachments,
+    run_integration('reconcile.terraform_tgw_attachments',
                     ctx.obj, print_to_file,
                     enable_deletion, thread_pool_size)
 
@@ -1203,7 +1155,7 @@ def terraform_tgw_attachments(ctx, print_to_file, enable_deletion,
 @integration.command()
 @click.pass_context
 def github_repo_invites(ctx):
-    run_integration(reconcile.github_repo_invites, ctx.obj)
+    run_integration('reconcile.github_repo_invites', ctx.obj)
 
 
 @integration.command()
@@ -1211,27 +1163,27 @@ def github_repo_invites(ctx):
 @click.argument('bot-token-org-name')
 @click.pass_context
 def github_repo_permissions_validator(ctx, instance_name, bot_token_org_name):
-    run_integration(reconcile.github_repo_permissions_validator,
+    run_integration('reconcile.github_repo_permissions_validator',
                     ctx.obj, instance_name, bot_token_org_name)
 
 
 @integration.command()
 @click.pass_context
 def gitlab_members(ctx):
-    run_integration(reconcile.gitlab_members, ctx.obj)
+    run_integration('reconcile.gitlab_members', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def gitlab_projects(ctx):
-    run_integration(reconcile.gitlab_projects, ctx.obj)
+    run_integration('reconcile.gitlab_projects', ctx.obj)
 
 
 @integration.command()
 @threaded()
 @click.pass_context
 def ocm_groups(ctx, thread_pool_size):
-    run_integration(reconcile.ocm_groups, ctx.obj, thread_pool_size)
+    run_integration('reconcile.ocm_groups', ctx.obj, thread_pool_size)
 
 
 @integration.command()
@@ -1240,7 +1192,7 @@ def ocm_groups(ctx, thread_pool_size):
 @threaded()
 @click.pass_context
 def ocm_clusters(ctx, gitlab_project_id, thread_pool_size):
-    run_integration(reconcile.ocm_clusters, ctx.obj,
+    run_integration('reconcile.ocm_clusters', ctx.obj,
                     gitlab_project_id, thread_pool_size)
 
 
@@ -1248,7 +1200,7 @@ def ocm_clusters(ctx, gitlab_project_id, thread_pool_size):
 @threaded()
 @click.pass_context
 def ocm_external_configuration_labels(ctx, thread_pool_size):
-    run_integration(reconcile.ocm_external_configuration_labels, ctx.obj,
+    run_integration('reconcile.ocm_external_configuration_labels', ctx.obj,
                     thread_pool_size)
 
 
@@ -1256,7 +1208,7 @@ def ocm_external_configuration_labels(ctx, thread_pool_size):
 @threaded()
 @click.pass_context
 def ocm_machine_pools(ctx, thread_pool_size):
-    run_integration(reconcile.ocm_machine_pools, ctx.obj, thread_pool_size)
+    run_integration('reconcile.ocm_machine_pools', ctx.obj, thread_pool_size)
 
 
 @integration.command()
@@ -1264,7 +1216,7 @@ def ocm_machine_pools(ctx, thread_pool_size):
 @threaded()
 @click.pass_context
 def ocm_upgrade_scheduler(ctx, thread_pool_size):
-    run_integration(reconcile.ocm_upgrade_scheduler, ctx.obj,
+    run_integration('reconcile.ocm_upgrade_scheduler', ctx.obj,
                     thread_pool_size)
 
 
@@ -1272,60 +1224,60 @@ def ocm_upgrade_scheduler(ctx, thread_pool_size):
 @threaded()
 @click.pass_context
 def ocm_addons(ctx, thread_pool_size):
-    run_integration(reconcile.ocm_addons, ctx.obj,
+    run_integration('reconcile.ocm_addons', ctx.obj,
                     thread_pool_size)
 
 
 @integration.command()
 @click.pass_context
 def ocm_aws_infrastructure_access(ctx):
-    run_integration(reconcile.ocm_aws_infrastructure_access, ctx.obj)
+    run_integration('reconcile.ocm_aws_infrastructure_access', ctx.obj)
 
 
 @integration.command()
 @vault_input_path
 @click.pass_context
 def ocm_github_idp(ctx, vault_input_path):
-    run_integration(reconcile.ocm_github_idp, ctx.obj, vault_input_path)
+    run_integration('reconcile.ocm_github_idp', ctx.obj, vault_input_path)
 
 
 @integration.command()
 @click.pass_context
 def ocm_additional_routers(ctx):
-    run_integration(reconcile.ocm_additional_routers, ctx.obj)
+    run_integration('reconcile.ocm_additional_routers', ctx.obj)
 
 
 @integration.command()
 @environ(['APP_INTERFACE_STATE_BUCKET', 'APP_INTERFACE_STATE_BUCKET_ACCOUNT'])
 @click.pass_context
 def email_sender(ctx):
-    run_integration(reconcile.email_sender, ctx.obj)
+    run_integration('reconcile.email_sender', ctx.obj)
 
 
 @integration.command()
 @environ(['APP_INTERFACE_STATE_BUCKET', 'APP_INTERFACE_STATE_BUCKET_ACCOUNT'])
 @click.pass_context
 def sentry_helper(ctx):
-    run_integration(reconcile.sentry_helper, ctx.obj)
+    run_integration('reconcile.sentry_helper', ctx.obj)
 
 
 @integration.command()
 @environ(['APP_INTERFACE_STATE_BUCKET', 'APP_INTERFACE_STATE_BUCKET_ACCOUNT'])
 @click.pass_context
 def requests_sender(ctx):
-    run_integration(reconcile.requests_sender, ctx.obj)
+    run_integration('reconcile.requests_sender', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def service_dependencies(ctx):
-    run_integration(reconcile.service_dependencies, ctx.obj)
+    run_integration('reconcile.service_dependencies', ctx.obj)
 
 
 @integration.command()
 @click.pass_context
 def sentry_config(ctx):
-    run_integration(reconcile.sentry_config, ctx.obj)
+    run_integration('reconcile.sentry_config', ctx.obj)
 
 
 @integration.command()
@@ -1333,14 +1285,14 @@ def sentry_config(ctx):
 @enable_deletion(default=False)
 @click.pass_context
 def sql_query(ctx, enable_deletion):
-    run_integration(reconcile.sql_query, ctx.obj, enable_deletion)
+    run_integration('reconcile.sql_query', ctx.obj, enable_deletion)
 
 
 @integration.command()
 @threaded()
 @click.pass_context
 def gitlab_owners(ctx, thread_pool_size):
-    run_integration(reconcile.gitlab_owners, ctx.obj, thread_pool_size)
+    run_integration('reconcile.gitlab_owners', ctx.obj, thread_pool_size)
 
 
 @integration.command()
@@ -1350,7 +1302,7 @@ def gitlab_owners(ctx, thread_pool_size):
 @click.pass_context
 def gitlab_fork_compliance(ctx, gitlab_project_id, gitlab_merge_request_id,
                            gitlab_maintainers_group):
-    run_integration(reconcile.gitlab_fork_compliance, ctx.obj,
+    run_integration('reconcile.gitlab_fork_compliance', ctx.obj,
                     gitlab_project_id, gitlab_merge_request_id,
                     gitlab_maintainers_group)
 
@@ -1359,7 +1311,7 @@ def gitlab_fork_compliance(ctx, gitlab_project_id, gitlab_merge_request_id,
 @threaded(default=2)
 @click.pass_context
 def dashdotdb_cso(ctx, thread_pool_size):
-    run_integration(reconcile.dashdotdb_cso, ctx.obj, thread_pool_size)
+    run_integration('reconcile.dashdotdb_cso', ctx.obj, thread_pool_size)
 
 
 @integration.command()
@@ -1367,7 +1319,7 @@ def dashdotdb_cso(ctx, thread_pool_size):
 @click.pass_context
 @cluster_name
 def dashdotdb_dvo(ctx, thread_pool_size, cluster_name):
-    run_integration(reconcile.dashdotdb_dvo, ctx.obj,
+    run_integration('reconcile.dashdotdb_dvo', ctx.obj,
                     thread_pool_size, cluster_name)
 
 
@@ -1375,20 +1327,23 @@ def dashdotdb_dvo(ctx, thread_pool_size, cluster_name):
 @threaded(default=2)
 @click.pass_context
 def dashdotdb_slo(ctx, thread_pool_size):
-    run_integration(reconcile.dashdotdb_slo, ctx.obj, thread_pool_size)
+    run_integration('reconcile.dashdotdb_slo', ctx.obj, thread_pool_size)
 
 
 @integration.command()
+@environ(['APP_INTERFACE_STATE_BUCKET', 'APP_INTERFACE_STATE_BUCKET_ACCOUNT'])
+@threaded(default=4)
 @click.pass_context
-def ocp_release_mirror(ctx):
-    run_integration(reconcile.ocp_release_mirror, ctx.obj)
+def ocp_release_mirror(ctx, thread_pool_size):
+    run_integration('reconcile.ocp_release_mirror', ctx.obj,
+                    thread_pool_size)
 
 
 @integration.command()
 @gitlab_project_id
 @click.pass_context
 def osd_mirrors_data_updater(ctx, gitlab_project_id):
-    run_integration(reconcile.osd_mirrors_data_updater, ctx.obj,
+    run_integration('reconcile.osd_mirrors_data_updater', ctx.obj,
                     gitlab_project_id)
 
 
@@ -1396,7 +1351,7 @@ def osd_mirrors_data_updater(ctx, gitlab_project_id):
 @threaded()
 @click.pass_context
 def ecr_mirror(ctx, thread_pool_size):
-    run_integration(reconcile.ecr_mirror, ctx.obj, thread_pool_size)
+    run_integration('reconcile.ecr_mirror', ctx.obj, thread_pool_size)
 
 
 @integration.command()
@@ -1409,15 +1364,15 @@ def ecr_mirror(ctx, thread_pool_size):
 @click.pass_context
 def kafka_clusters(ctx, thread_pool_size, internal, use_jump_host,
                    vault_throughput_path):
-    run_integration(reconcile.kafka_clusters, ctx.obj, thread_pool_size,
+    run_integration('reconcile.kafka_clusters', ctx.obj, thread_pool_size,
                     internal, use_jump_host, vault_throughput_path)
 
 
 @integration.command()
 @click.pass_context
 def integrations_validator(ctx):
-    run_integration(reconcile.integrations_validator, ctx.obj,
-                    reconcile.cli.integration.commands.keys())
+    run_integration('reconcile.integrations_validator', ctx.obj,
+                    integration.commands.keys())
 
 
 @integration.command()
@@ -1426,21 +1381,21 @@ def integrations_validator(ctx):
 @cluster_name
 @click.pass_context
 def prometheus_rules_tester(ctx, thread_pool_size, cluster_name):
-    run_integration(reconcile.prometheus_rules_tester, ctx.obj,
+    run_integration('reconcile.prometheus_rules_tester', ctx.obj,
                     thread_pool_size, cluster_name)
 
 
 @integration.command()
 @click.pass_context
 def sendgrid_teammates(ctx):
-    run_integration(reconcile.sendgrid_teammates, ctx.obj)
+    run_integration('reconcile.sendgrid_teammates', ctx.obj)
 
 
 @integration.command()
 @vault_output_path
 @click.pass_context
 def cluster_deployment_mapper(ctx, vault_output_path):
-    run_integration(reconcile.cluster_deployment_mapper, ctx.obj,
+    run_integration('reconcile.cluster_deployment_mapper', ctx.obj,
                     vault_output_path)
 
 
@@ -1452,7 +1407,7 @@ def cluster_deployment_mapper(ctx, vault_output_path):
 @use_jump_host()
 @click.pass_context
 def gabi_authorized_users(ctx, thread_pool_size, internal, use_jump_host):
-    run_integration(reconcile.gabi_authorized_users,
+    run_integration('reconcile.gabi_authorized_users',
                     ctx.obj, thread_pool_size, internal,
                     use_jump_host)
 
@@ -1461,10 +1416,10 @@ def gabi_authorized_users(ctx, thread_pool_size, internal, use_jump_host):
 @enable_deletion(default=False)
 @click.pass_context
 def dyn_traffic_director(ctx, enable_deletion):
-    run_integration(reconcile.dyn_traffic_director, ctx.obj, enable_deletion)
+    run_integration('reconcile.dyn_traffic_director', ctx.obj, enable_deletion)
 
 
 @integration.command()
 @click.pass_context
 def status_page_components(ctx):
-    run_integration(reconcile.status_page_components, ctx.obj)
+    run_integration('reconcile.status_page_components', ctx.obj)
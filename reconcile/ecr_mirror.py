@@ -15,48 +15,55 @@ QONTRACT_INTEGRATION = 'ecr-mirror'
 LOG = logging.getLogger(__name__)
 
 
+class EcrRegistry:
+    """
+    The ECR repositories and credentials of an account in a region,
+    shared by all the mirrors pushing to that account and region.
+    """
+    def __init__(self, key, aws_cli):
+        account, region = key
+        self.account = account
+        self.region = region
+
+        self.repositories = {
+            r['repositoryName']: r['repositoryUri']
+            for r in aws_cli.get_ecr_repositories(account, region)
+        }
+
+        self.username, self.password = \
+            self._get_ecr_creds(aws_cli, account, region)
+        self.auth = f'{self.username}:{self.password}'
+
+    @staticmethod
+    def _get_ecr_creds(aws_cli, account, region):
+        auth_token = f'{account}/{region}'
+        data = aws_cli.auth_tokens[auth_token]
+        auth_data = data['authorizationData'][0]
+        token = auth_data['authorizationToken']
+        password = base64.b64decode(token).decode('utf-8').split(':')[1]
+        return 'AWS', password
+
+
 class EcrMirror:
-    def __init__(self, instance, dry_run):
+    def __init__(self, instance, dry_run, registry, secret_reader):
         self.dry_run = dry_run
         self.instance = instance
-        self.settings = queries.get_app_interface_settings()
-        self.secret_reader = SecretReader(settings=self.settings)
+        self.registry = registry
         self.skopeo_cli = Skopeo(dry_run)
         self.error = False
 
         identifier = instance['identifier']
-        account = instance['account']
-        region = instance.get('region')
-
-        self.aws_cli = AWSApi(thread_pool_size=1,
-                              accounts=[
-                                  self._get_aws_account_info(account)
-                              ],
-                              settings=self.settings,
-                              init_ecr_auth_tokens=True)
-
-        self.aws_cli.map_ecr_resources()
-
-        self.ecr_uri = self._get_image_uri(
-            account=account,
-            repository=identifier,
-        )
+        self.ecr_uri = registry.repositories.get(identifier)
         if self.ecr_uri is None:
             self.error = True
             LOG.error(f"Could not find the ECR repository {identifier}")
 
-        self.ecr_username, self.ecr_password = self._get_ecr_creds(
-            account=account,
-            region=region,
-        )
-        self.ecr_auth = f'{self.ecr_username}:{self.ecr_password}'
-
         self.image_username = None
         self.image_password = None
         self.image_auth = None
         pull_secret = self.instance['mirror']['pullCredentials']
         if pull_secret is not None:
-            raw_data = self.secret_reader.read_all(pull_secret)
+            raw_data = secret_reader.read_all(pull_secret)
             self.image_username = raw_data["user"]
             self.image_password = raw_data["token"]
             self.image_auth = f'{self.image_username}:{self.image_password}'
@@ -66,8 +73,8 @@ class EcrMirror:
             return
 
         ecr_mirror = Image(self.ecr_uri,
-                           username=self.ecr_username,
-                           password=self.ecr_password)
+                           username=self.registry.username,
+                           password=self.registry.password)
 
         image = Image(self.instance['mirror']['url'],
                       username=self.image_username,
@@ -80,41 +87,21 @@ class EcrMirror:
                     self.skopeo_cli.copy(src_image=image[tag],
                                          src_creds=self.image_auth,
                                          dst_image=ecr_mirror[tag],
-                                         dest_creds=self.ecr_auth)
+                                         dest_creds=self.registry.auth)
                 except SkopeoCmdError as details:
                     LOG.error('[%s]', details)
 
-    def _get_ecr_creds(self, account, region):
-        if region is None:
-            region = self.aws_cli.accounts[account]['resourcesDefaultRegion']
-        auth_token = f'{account}/{region}'
-        data = self.aws_cli.auth_tokens[auth_token]
-        auth_data = data['authorizationData'][0]
-        token = auth_data['authorizationToken']
-        password = base64.b64decode(token).decode('utf-8').split(':')[1]
-        return 'AWS', password
 
-    def _get_image_uri(self, account, repository):
-        for repo in self.aws_cli.resources[account]['ecr']:
-            if repo['repositoryName'] == repository:
-                return repo['repositoryUri']
-
-    @staticmethod
-    def _get_aws_account_info(account):
-        for account_info in queries.get_aws_accounts():
-            if 'name' not in account_info:
-                continue
-            if account_info['name'] != account:
-                continue
-            return account_info
-
-
-def worker(ecr_mirror_instance):
-    return ecr_mirror_instance.run()
+def worker(tfr, dry_run, registries, secret_reader):
+    registry = registries[tfr['account'], tfr['region']]
+    return EcrMirror(tfr, dry_run, registry, secret_reader).run()
 
 
 def run(dry_run, thread_pool_size=10):
     namespaces = queries.get_namespaces()
+    settings = queries.get_app_interface_settings()
+    accounts = {a['name']: a for a in queries.get_aws_accounts()
+                if 'name' in a}
 
     tfrs_to_mirror = []
     for namespace in namespaces:
@@ -129,9 +116,36 @@ def run(dry_run, thread_pool_size=10):
             if tfr['mirror'] is None:
                 continue
 
+            account = accounts.get(tfr['account'])
+            if account is None:
+                LOG.error(f"Could not find the AWS account {tfr['account']}")
+                continue
+
+            tfr = dict(tfr)
+            tfr['region'] = \
+                tfr.get('region') or account['resourcesDefaultRegion']
             tfrs_to_mirror.append(tfr)
 
-    work_list = threaded.run(EcrMirror, tfrs_to_mirror,
-                             thread_pool_size=thread_pool_size,
-                             dry_run=dry_run)
-    threaded.run(worker, work_list, thread_pool_size=thread_pool_size)
+    if not tfrs_to_mirror:
+        return
+
+    # account lookup, credentials, auth tokens and repositories are
+    # retrieved once per account and region, not once per mirror
+    mirror_accounts = {tfr['account'] for tfr in tfrs_to_mirror}
+    aws_cli = AWSApi(thread_pool_size=thread_pool_size,
+                     accounts=[accounts[a] for a in mirror_accounts],
+                     settings=settings,
+                     init_ecr_auth_tokens=True,
+                     init_users=False)
+
+    registry_keys = list({(tfr['account'], tfr['region'])
+                          for tfr in tfrs_to_mirror})
+    registries = dict(zip(registry_keys,
+                          threaded.run(EcrRegistry, registry_keys,
+                                       thread_pool_size=thread_pool_size,
+                                       aws_cli=aws_cli)))
+
+    secret_reader = SecretReader(settings=settings)
+    threaded.run(worker, tfrs_to_mirror, thread_pool_size=thread_pool_size,
+                 dry_run=dry_run, registries=registries,
+                 secret_reader=secret_reader)
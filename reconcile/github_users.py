@@ -3,35 +3,57 @@ import os
 import re
 
 from github import Github
-from github.GithubException import GithubException
-from requests.exceptions import ReadTimeout
-from sretoolbox.utils import retry
-from sretoolbox.utils import threaded
 
 from reconcile import queries
 from reconcile import mr_client_gateway
 from reconcile.github_org import get_config
 from reconcile.ldap_users import init_users as init_users_and_paths
+from reconcile.utils.github_user_resolver import GithubUserResolver
 from reconcile.utils.mr import CreateDeleteUser
 from reconcile.utils.smtp_client import SmtpClient
+from reconcile.utils.state import State
 
 
 GH_BASE_URL = os.environ.get('GITHUB_API', 'https://api.github.com')
+# seconds to keep resolved GitHub users in the state across runs.
+# users are not kept across runs if not set.
+GH_USERS_CACHE_TTL = int(os.environ.get('GITHUB_USERS_CACHE_TTL', 0))
 
 QONTRACT_INTEGRATION = 'github-users'
 
 
-def init_github():
+def get_github_token():
     config = get_config()
     github_config = config['github']
-    token = github_config['app-sre']['token']
-    return Github(token, base_url=GH_BASE_URL)
+    return github_config['app-sre']['token']
+
+
+def init_github():
+    return Github(get_github_token(), base_url=GH_BASE_URL)
+
+
+def init_github_user_resolver(integration=QONTRACT_INTEGRATION):
+    state = None
+    if GH_USERS_CACHE_TTL:
+        state = State(integration=integration,
+                      accounts=queries.get_aws_accounts(),
+                      settings=queries.get_app_interface_settings())
+    return GithubUserResolver(get_github_token(), state=state,
+                              ttl=GH_USERS_CACHE_TTL, base_url=GH_BASE_URL)
 
 
-@retry(exceptions=(GithubException, ReadTimeout))
-def get_user_company(user, github):
-    gh_user = github.get_user(login=user['github_username'])
-    return user['org_username'], gh_user.company
+def get_users_companies(users, resolver, thread_pool_size=1):
+    gh_users = resolver.get_users([u['github_username'] for u in users],
+                                  thread_pool_size=thread_pool_size)
+    results = []
+    for user in users:
+        gh_user = gh_users[user['github_username']]
+        if gh_user is None:
+            logging.error(f"GitHub user {user['github_username']} of user "
+                          f"{user['org_username']} not found")
+            continue
+        results.append((user['org_username'], gh_user['company']))
+    return results
 
 
 def get_users_to_delete(results):
@@ -75,10 +97,9 @@ def run(dry_run, gitlab_project_id=None, thread_pool_size=10,
         enable_deletion=False, send_mails=False):
     settings = queries.get_app_interface_settings()
     users = queries.get_users()
-    g = init_github()
+    resolver = init_github_user_resolver()
 
-    results = threaded.run(get_user_company, users, thread_pool_size,
-                           github=g)
+    results = get_users_companies(users, resolver, thread_pool_size)
 
     users_to_delete = get_users_to_delete(results)
 
@@ -63,23 +63,100 @@ def clean_pipelines(dry_run: bool, gl_instance: str, gl_project_id: int,
                               f'error message {err.error_message}')
 
 
-def handle_stale_items(dry_run, gl, days_interval, enable_closing, item_type):
+class RepoSnapshot:
+    """Per run view of a housekeeping repository.
+
+    Open issues and merge requests are listed once per run. Branch heads,
+    merge request commits, pipelines and comparisons are fetched on first
+    use and shared by the stale, merge and rebase handlers.
+    """
+
+    def __init__(self, gl):
+        self.gl = gl
+        self.issues = gl.get_issues(state='opened')
+        self.merge_requests = gl.get_merge_requests(state='opened')
+        self.merged = set()
+        self.closed = set()
+        self._branch_heads = {}
+        self._has_commits = {}
+        self._pipelines = {}
+        self._compares = {}
+
+    def get_items(self, item_type):
+        if item_type == 'issue':
+            return self.issues
+        if item_type == 'merge-request':
+            return self.open_merge_requests()
+        raise ValueError(f'unknown item type: {item_type}')
+
+    def open_merge_requests(self):
+        return [mr for mr in self.merge_requests
+                if mr.iid not in self.merged and mr.iid not in self.closed]
+
+    def branch_head(self, branch):
+        if branch not in self._branch_heads:
+            self._branch_heads[branch] = \
+                self.gl.project.commits.list(ref_name=branch)[0].id
+        return self._branch_heads[branch]
+
+    def has_commits(self, mr):
+        if mr.iid not in self._has_commits:
+            self._has_commits[mr.iid] = len(mr.commits()) > 0
+        return self._has_commits[mr.iid]
+
+    def is_rebased(self, mr):
+        head = self.branch_head(mr.target_branch)
+        key = (mr.sha, head)
+        if key not in self._compares:
+            result = self.gl.project.repository_compare(mr.sha, head)
+            self._compares[key] = len(result['commits']) == 0
+        return self._compares[key]
+
+    def pipelines(self, mr):
+        if mr.iid not in self._pipelines:
+            self._pipelines[mr.iid] = mr.pipelines()
+        return self._pipelines[mr.iid]
+
+    def invalidate_pipelines(self, mr):
+        self._pipelines.pop(mr.iid, None)
+
+    def mark_merged(self, mr):
+        self.merged.add(mr.iid)
+        # the target branch moved
+        self._branch_heads.pop(mr.target_branch, None)
+
+    def mark_closed(self, mr):
+        self.closed.add(mr.iid)
+
+    @staticmethod
+    def last_note_date(item):
+        notes = item.notes.list(order_by='updated_at', sort='desc',
+                                page=1, per_page=1)
+        if not notes:
+            return None
+        return datetime.strptime(notes[0].attributes.get('updated_at'),
+                                 DATE_FORMAT)
+
+
+def handle_stale_items(dry_run, gl, days_interval, enable_closing, item_type,
+                       snapshot=None):
     LABEL = 'stale'
 
-    if item_type == 'issue':
-        items = gl.get_issues(state='opened')
-    elif item_type == 'merge-request':
-        items = gl.get_merge_requests(state='opened')
+    if snapshot is None:
+        snapshot = RepoSnapshot(gl)
+    items = snapshot.get_items(item_type)
 
     now = datetime.utcnow()
     for item in items:
         item_iid = item.attributes.get('iid')
         item_labels = item.attributes.get('labels')
-        notes = item.notes.list()
-        note_dates = \
-            [datetime.strptime(note.attributes.get('updated_at'), DATE_FORMAT)
-             for note in notes]
-        update_date = max(d for d in note_dates) if note_dates else now
+        # updated_at is the last activity on the item and is bumped by
+        # new notes as well. items without notes are never stale.
+        update_date = datetime.strptime(item.attributes.get('updated_at'),
+                                        DATE_FORMAT)
+        current_interval = now.date() - update_date.date()
+        if current_interval > timedelta(days=days_interval):
+            update_date = snapshot.last_note_date(item) or now
 
         # if item is over days_interval
         current_interval = now.date() - update_date.date()
@@ -97,6 +174,8 @@ def handle_stale_items(dry_run, gl, days_interval, enable_closing, item_type):
                 if enable_closing:
                     if not dry_run:
                         gl.close(item)
+                        if item_type == 'merge-request':
+                            snapshot.mark_closed(item)
                 else:
                     warning_message = \
                         '\'close_item\' action is not enabled. ' + \
@@ -109,6 +188,7 @@ def handle_stale_items(dry_run, gl, days_interval, enable_closing, item_type):
                 continue
 
             # if item has 'stale' label - check the notes
+            notes = item.notes.list()
             cancel_notes = [n for n in notes
                             if n.attributes.get('body') ==
                             '/{} cancel'.format(LABEL)]
@@ -135,141 +215,142 @@ def is_good_to_merge(merge_label, labels):
         not any(b in HOLD_LABELS for b in labels)
 
 
-def rebase_merge_requests(dry_run, gl, rebase_limit, pipeline_timeout=None,
-                          wait_for_pipeline=False, gl_instance=None,
-                          gl_settings=None):
-    mrs = gl.get_merge_requests(state='opened')
-    rebases = 0
-    for rebase_label in REBASE_LABELS_PRIORITY:
+def get_merge_candidates(snapshot, labels_priority):
+    """Yields the (label, mr) pairs of open MRs that can be merged or rebased,
+    in priority order. Every MR is yielded once, for its first matching label.
+    """
+    mrs = snapshot.open_merge_requests()
+    seen = set()
+    for label in labels_priority:
         for mr in reversed(mrs):
+            if mr.iid in seen:
+                continue
             if mr.merge_status == 'cannot_be_merged':
                 continue
             if mr.work_in_progress:
                 continue
-            if len(mr.commits()) == 0:
-                continue
 
             labels = mr.attributes.get('labels')
             if not labels:
                 continue
 
-            good_to_rebase = is_good_to_merge(rebase_label, labels)
-            if not good_to_rebase:
-                continue
-
-            target_branch = mr.target_branch
-            head = gl.project.commits.list(ref_name=target_branch)[0].id
-            result = gl.project.repository_compare(mr.sha, head)
-            if len(result['commits']) == 0:  # rebased
+            if not is_good_to_merge(label, labels):
                 continue
 
-            pipelines = mr.pipelines()
+            seen.add(mr.iid)
+            yield label, mr
 
-            # If pipeline_timeout is None no pipeline will be canceled
-            if pipeline_timeout is not None:
-                timed_out_pipelines = \
-                    get_timed_out_pipelines(pipelines, pipeline_timeout)
-                if timed_out_pipelines:
-                    clean_pipelines(dry_run, gl_instance,
-                                    mr.source_project_id, gl_settings,
-                                    timed_out_pipelines)
 
-            if wait_for_pipeline:
-                if not pipelines:
-                    continue
-                # possible statuses:
-                # running, pending, success, failed, canceled, skipped
-                running_pipelines = \
-                    [p for p in pipelines if p['status'] == 'running']
-                if running_pipelines:
-                    continue
+def rebase_merge_requests(dry_run, gl, rebase_limit, pipeline_timeout=None,
+                          wait_for_pipeline=False, gl_instance=None,
+                          gl_settings=None, snapshot=None):
+    if snapshot is None:
+        snapshot = RepoSnapshot(gl)
+    rebases = 0
+    for _, mr in get_merge_candidates(snapshot, REBASE_LABELS_PRIORITY):
+        if not snapshot.has_commits(mr):
+            continue
 
-            logging.info(['rebase', gl.project.name, mr.iid])
-            if not dry_run and rebases < rebase_limit:
-                try:
-                    mr.rebase()
-                    rebases += 1
-                except gitlab.exceptions.GitlabMRRebaseError as e:
-                    logging.error('unable to rebase {}: {}'.format(mr.iid, e))
+        if snapshot.is_rebased(mr):
+            continue
 
+        pipelines = snapshot.pipelines(mr)
 
-@retry(max_attempts=10)
-def merge_merge_requests(dry_run, gl, merge_limit, rebase,
-                         pipeline_timeout=None, insist=False,
-                         wait_for_pipeline=False, gl_instance=None,
-                         gl_settings=None):
-    mrs = gl.get_merge_requests(state='opened')
-    merges = 0
-    for merge_label in MERGE_LABELS_PRIORITY:
-        for mr in reversed(mrs):
-            if mr.merge_status == 'cannot_be_merged':
-                continue
-            if mr.work_in_progress:
-                continue
-            if len(mr.commits()) == 0:
-                continue
+        # If pipeline_timeout is None no pipeline will be canceled
+        if pipeline_timeout is not None:
+            timed_out_pipelines = \
+                get_timed_out_pipelines(pipelines, pipeline_timeout)
+            if timed_out_pipelines:
+                clean_pipelines(dry_run, gl_instance,
+                                mr.source_project_id, gl_settings,
+                                timed_out_pipelines)
 
-            labels = mr.attributes.get('labels')
-            if not labels:
+        if wait_for_pipeline:
+            if not pipelines:
                 continue
-
-            good_to_merge = is_good_to_merge(merge_label, labels)
-            if not good_to_merge:
+            # possible statuses:
+            # running, pending, success, failed, canceled, skipped
+            running_pipelines = \
+                [p for p in pipelines if p['status'] == 'running']
+            if running_pipelines:
                 continue
 
-            if SAAS_FILE_LABEL in labels and LGTM_LABEL in labels:
-                logging.warning(
-                    f"[{gl.project.name}/{mr.iid}] 'lgtm' label not " +
-                    "suitable for saas file update. removing 'lgtm' label"
-                )
-                if not dry_run:
-                    gl.remove_label_from_merge_request(mr.iid, LGTM_LABEL)
-                continue
+        logging.info(['rebase', gl.project.name, mr.iid])
+        if not dry_run and rebases < rebase_limit:
+            try:
+                mr.rebase()
+                rebases += 1
+            except gitlab.exceptions.GitlabMRRebaseError as e:
+                logging.error('unable to rebase {}: {}'.format(mr.iid, e))
 
-            target_branch = mr.target_branch
-            head = gl.project.commits.list(ref_name=target_branch)[0].id
-            result = gl.project.repository_compare(mr.sha, head)
-            if rebase and len(result['commits']) != 0:  # not rebased
-                continue
 
-            pipelines = mr.pipelines()
-            if not pipelines:
-                continue
+@retry(max_attempts=10)
+def merge_merge_requests(dry_run, gl, merge_limit, rebase,
+                         pipeline_timeout=None, insist=False,
+                         wait_for_pipeline=False, gl_instance=None,
+                         gl_settings=None, snapshot=None):
+    if snapshot is None:
+        snapshot = RepoSnapshot(gl)
+    merges = 0
+    for merge_label, mr in get_merge_candidates(snapshot,
+                                                MERGE_LABELS_PRIORITY):
+        if not snapshot.has_commits(mr):
+            continue
+
+        labels = mr.attributes.get('labels')
+        if SAAS_FILE_LABEL in labels and LGTM_LABEL in labels:
+            logging.warning(
+                f"[{gl.project.name}/{mr.iid}] 'lgtm' label not " +
+                "suitable for saas file update. removing 'lgtm' label"
+            )
+            if not dry_run:
+                gl.remove_label_from_merge_request(mr.iid, LGTM_LABEL)
+            continue
+
+        if rebase and not snapshot.is_rebased(mr):
+            continue
+
+        pipelines = snapshot.pipelines(mr)
+        if not pipelines:
+            continue
+
+        # If pipeline_timeout is None no pipeline will be canceled
+        if pipeline_timeout is not None:
+            timed_out_pipelines = \
+                get_timed_out_pipelines(pipelines, pipeline_timeout)
+            if timed_out_pipelines:
+                clean_pipelines(dry_run, gl_instance,
+                                mr.source_project_id, gl_settings,
+                                timed_out_pipelines)
+
+        if wait_for_pipeline:
+            # possible statuses:
+            # running, pending, success, failed, canceled, skipped
+            running_pipelines = \
+                [p for p in pipelines
+                 if p['status'] == 'running']
+            if running_pipelines:
+                if insist:
+                    # the retry has to see the current pipelines
+                    snapshot.invalidate_pipelines(mr)
+                    raise Exception(f'insisting on {merge_label}')
+                else:
+                    continue
 
-            # If pipeline_timeout is None no pipeline will be canceled
-            if pipeline_timeout is not None:
-                timed_out_pipelines = \
-                    get_timed_out_pipelines(pipelines, pipeline_timeout)
-                if timed_out_pipelines:
-                    clean_pipelines(dry_run, gl_instance,
-                                    mr.source_project_id, gl_settings,
-                                    timed_out_pipelines)
-
-            if wait_for_pipeline:
-                # possible statuses:
-                # running, pending, success, failed, canceled, skipped
-                running_pipelines = \
-                    [p for p in pipelines
-                     if p['status'] == 'running']
-                if running_pipelines:
-                    if insist:
-                        raise Exception(f'insisting on {merge_label}')
-                    else:
-                        continue
-
-            last_pipeline_result = pipelines[0]['status']
-            if last_pipeline_result != 'success':
-                continue
+        last_pipeline_result = pipelines[0]['status']
+        if last_pipeline_result != 'success':
+            continue
 
-            logging.info(['merge', gl.project.name, mr.iid])
-            if not dry_run and merges < merge_limit:
-                try:
-                    mr.merge()
-                    if rebase:
-                        return
-                    merges += 1
-                except gitlab.exceptions.GitlabMRClosedError as e:
-                    logging.error('unable to merge {}: {}'.format(mr.iid, e))
+        logging.info(['merge', gl.project.name, mr.iid])
+        if not dry_run and merges < merge_limit:
+            try:
+                mr.merge()
+                snapshot.mark_merged(mr)
+                if rebase:
+                    return
+                merges += 1
+            except gitlab.exceptions.GitlabMRClosedError as e:
+                logging.error('unable to merge {}: {}'.format(mr.iid, e))
 
 
 def run(dry_run, wait_for_pipeline):
@@ -288,23 +369,27 @@ def run(dry_run, wait_for_pipeline):
         limit = hk.get('limit') or default_limit
         pipeline_timeout = hk.get('pipeline_timeout')
         gl = GitLabApi(instance, project_url=project_url, settings=settings)
+        snapshot = RepoSnapshot(gl)
 
         handle_stale_items(dry_run, gl, days_interval, enable_closing,
-                           'issue')
+                           'issue', snapshot=snapshot)
         handle_stale_items(dry_run, gl, days_interval, enable_closing,
-                           'merge-request')
+                           'merge-request', snapshot=snapshot)
         rebase = hk.get('rebase')
         try:
             merge_merge_requests(dry_run, gl, limit, rebase, pipeline_timeout,
                                  insist=True,
                                  wait_for_pipeline=wait_for_pipeline,
-                                 gl_instance=instance, gl_settings=settings)
+                                 gl_instance=instance, gl_settings=settings,
+                                 snapshot=snapshot)
         except Exception:
             merge_merge_requests(dry_run, gl, limit, rebase, pipeline_timeout,
                                  wait_for_pipeline=wait_for_pipeline,
-                                 gl_instance=instance, gl_settings=settings)
+                                 gl_instance=instance, gl_settings=settings,
+                                 snapshot=snapshot)
         if rebase:
             rebase_merge_requests(dry_run, gl, limit,
                                   pipeline_timeout=pipeline_timeout,
                                   wait_for_pipeline=wait_for_pipeline,
-                                  gl_instance=instance, gl_settings=settings)
+                                  gl_instance=instance, gl_settings=settings,
+                                  snapshot=snapshot)
@@ -6,6 +6,8 @@ import json
 import logging
 import sys
 
+from sretoolbox.utils import threaded
+
 from reconcile import queries
 
 from reconcile.utils import mr
@@ -16,7 +18,27 @@ from reconcile.utils.gitlab_api import GitLabApi
 QONTRACT_INTEGRATION = 'gitlab-mr-sqs-consumer'
 
 
-def run(dry_run, gitlab_project_id):
+def submit_merge_request(spec, gitlab_cli, open_mr_titles):
+    """
+    Submits a merge request to Gitlab.
+
+    :return: a tuple of the receipt handles of the messages that are
+      handled and can be deleted and whether an error occurred
+    """
+    merge_request, receipt_handles = spec
+    try:
+        created = merge_request.submit_to_gitlab(
+            gitlab_cli=gitlab_cli, open_mr_titles=open_mr_titles)
+    except mr.MergeRequestProcessingError as processing_error:
+        logging.error(processing_error)
+        return [], True
+
+    if created:
+        open_mr_titles.add(merge_request.title)
+    return receipt_handles, False
+
+
+def run(dry_run, gitlab_project_id, thread_pool_size=10):
     settings = queries.get_app_interface_settings()
 
     accounts = queries.get_aws_accounts()
@@ -28,6 +50,9 @@ def run(dry_run, gitlab_project_id):
                            settings=settings, saas_files=saas_files)
 
     errors_occured = False
+    # titles of the open MRs, listed once per run. MRs created
+    # during the run are added to it.
+    open_mr_titles = None
     while True:
         messages = sqs_cli.receive_messages()
         logging.info('received %s messages', len(messages))
@@ -38,32 +63,55 @@ def run(dry_run, gitlab_project_id):
             # we end this integration run
             break
 
+        for receipt_handle, body in messages:
+            logging.info('received message %s with body %s',
+                         receipt_handle[:6], json.dumps(body))
+
+        if dry_run:
+            continue
+
+        if open_mr_titles is None:
+            open_mr_titles = gitlab_cli.get_open_mr_titles()
+
         # not all integrations are going to resend their MR messages
         # therefore we need to be careful not to delete any messages
         # before they have been properly handled
 
-        for m in messages:
-            receipt_handle, body = m[0], m[1]
-            logging.info('received message %s with body %s',
-                         receipt_handle[:6], json.dumps(body))
+        # messages for the same MR title are submitted only once and
+        # are deleted together if the submission is handled
+        merge_requests = {}
+        for receipt_handle, body in messages:
+            try:
+                merge_request = mr.init_from_sqs_message(body)
+            except mr.UnknownMergeRequestType as ex:
+                # Received an unknown MR type.
+                # This could be a producer being on a newer version
+                # of qontract-reconcile than the consumer.
+                # Therefore we don't delete it from the queue for
+                # potential future processing.
+                # TODO - monitor age of messages in queue
+                logging.warning(ex)
+                errors_occured = True
+                continue
+
+            _, receipt_handles = merge_requests.setdefault(
+                merge_request.title, (merge_request, []))
+            receipt_handles.append(str(receipt_handle))
+
+        results = threaded.run(submit_merge_request,
+                               merge_requests.values(),
+                               thread_pool_size,
+                               gitlab_cli=gitlab_cli,
+                               open_mr_titles=open_mr_titles)
+
+        handled = []
+        for receipt_handles, error in results:
+            handled.extend(receipt_handles)
+            if error:
+                errors_occured = True
 
-            if not dry_run:
-                try:
-                    merge_request = mr.init_from_sqs_message(body)
-                    merge_request.submit_to_gitlab(gitlab_cli=gitlab_cli)
-                    sqs_cli.delete_message(str(receipt_handle))
-                except mr.UnknownMergeRequestType as ex:
-                    # Received an unknown MR type.
-                    # This could be a producer being on a newer version
-                    # of qontract-reconcile than the consumer.
-                    # Therefore we don't delete it from the queue for
-                    # potential future processing.
-                    # TODO - monitor age of messages in queue
-                    logging.warning(ex)
-                    errors_occured = True
-                except mr.MergeRequestProcessingError as processing_error:
-                    logging.error(processing_error)
-                    errors_occured = True
+        if sqs_cli.delete_messages(handled):
+            errors_occured = True
 
     if errors_occured:
         sys.exit(1)
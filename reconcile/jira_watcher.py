@@ -1,4 +1,5 @@
 import logging
+import time
 
 from reconcile import queries
 
@@ -10,10 +11,17 @@ from reconcile.utils.state import State
 
 QONTRACT_INTEGRATION = 'jira-watcher'
 
+# runs only query the issues updated since the previous run. deleted issues
+# are not part of such queries, so the whole board is fetched once in a while
+FULL_SYNC_INTERVAL = 24 * 60 * 60
+# covers clock skew and the Jira search index lagging behind updates
+HIGH_WATER_MARK_OVERLAP = 5 * 60
 
-def fetch_current_state(jira_board, settings):
+
+def fetch_current_state(jira_board, settings, updated_since=None):
     jira = JiraClient(jira_board, settings=settings)
-    issues = jira.get_issues(fields=['key', 'status', 'summary'])
+    issues = jira.get_issues(fields=['status', 'summary'],
+                             updated_since=updated_since)
     return jira, {issue.key: {'status': issue.fields.status.name,
                               'summary': issue.fields.summary}
                   for issue in issues}
@@ -23,6 +31,20 @@ def fetch_previous_state(state, project):
     return state.get(project, {})
 
 
+def high_water_mark_key(project):
+    return f'high-water-marks/{project}'
+
+
+def fetch_high_water_mark(state, project):
+    return state.get(high_water_mark_key(project), {})
+
+
+def is_full_sync(previous_state, high_water_mark, now):
+    if not previous_state or not high_water_mark:
+        return True
+    return now - high_water_mark['full_sync_at'] > FULL_SYNC_INTERVAL
+
+
 def format_message(server, key, data, event,
                    previous_state=None, current_state=None):
     summary = data['summary']
@@ -106,6 +128,13 @@ def write_state(state, project, state_to_write):
     state.add(project, value=state_to_write, force=True)
 
 
+def write_high_water_mark(state, project, updated_since, full_sync_at):
+    state[high_water_mark_key(project)] = {
+        'updated_since': updated_since,
+        'full_sync_at': full_sync_at,
+    }
+
+
 def run(dry_run):
     jira_boards = [j for j in queries.get_jira_boards()
                    if j.get('slack')]
@@ -119,16 +148,36 @@ def run(dry_run):
     for index, jira_board in enumerate(jira_boards):
         if not is_in_shard_round_robin(jira_board['name'], index):
             continue
-        jira, current_state = fetch_current_state(jira_board, settings)
-        if not current_state:
-            logging.warning(
-                'not acting on empty Jira boards. ' +
-                'please create a ticket to get started.'
-            )
-            continue
-        previous_state = fetch_previous_state(state, jira.project)
+        project = jira_board['name']
+        now = time.time()
+        previous_state = fetch_previous_state(state, project)
+        high_water_mark = fetch_high_water_mark(state, project)
+        full_sync = is_full_sync(previous_state, high_water_mark, now)
+        if full_sync:
+            jira, current_state = fetch_current_state(jira_board, settings)
+            if not current_state:
+                logging.warning(
+                    'not acting on empty Jira boards. ' +
+                    'please create a ticket to get started.'
+                )
+                continue
+            full_sync_at = now
+            state_to_write = current_state
+            compared_state = previous_state
+        else:
+            updated_since = \
+                high_water_mark['updated_since'] - HIGH_WATER_MARK_OVERLAP
+            jira, current_state = fetch_current_state(
+                jira_board, settings, updated_since=updated_since)
+            full_sync_at = high_water_mark['full_sync_at']
+            state_to_write = {**previous_state, **current_state}
+            # only the updated issues are compared
+            compared_state = {k: v for k, v in previous_state.items()
+                              if k in current_state}
         if previous_state:
-            diffs = calculate_diff(jira.server, current_state, previous_state)
+            diffs = calculate_diff(jira.server, current_state, compared_state)
             act(dry_run, jira_board, diffs)
         if not dry_run:
-            write_state(state, jira.project, current_state)
+            if state_to_write != previous_state:
+                write_state(state, jira.project, state_to_write)
+            write_high_water_mark(state, jira.project, now, full_sync_at)
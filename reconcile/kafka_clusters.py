@@ -93,12 +93,14 @@ def read_input_from_vault(vault_path, name, field):
     return vault_client.read(secret)
 
 
-def write_output_to_vault(vault_path, name, data):
+def write_outputs_to_vault(vault_path, outputs, thread_pool_size=10):
+    """outputs: dictionary of secret data indexed by kafka cluster name"""
     integration_name = QONTRACT_INTEGRATION
     vault_client = VaultClient()
-    secret_path = f"{vault_path}/{integration_name}/{name}"
-    secret = {'path': secret_path, 'data': data}
-    vault_client.write(secret)
+    secrets = [{'path': f"{vault_path}/{integration_name}/{name}",
+                'data': data}
+               for name, data in outputs.items()]
+    vault_client.write_many(secrets, thread_pool_size=thread_pool_size)
 
 
 @defer
@@ -135,6 +137,7 @@ def run(dry_run, thread_pool_size=10,
     desired_state = fetch_desired_state(kafka_clusters)
     kafka_service_accounts = ocm_map.kafka_service_account_specs()
 
+    vault_outputs = {}
     for kafka_cluster in kafka_clusters:
         kafka_cluster_name = kafka_cluster['name']
         desired_cluster = [c for c in desired_state
@@ -198,10 +201,11 @@ def run(dry_run, thread_pool_size=10,
                 resource.name,
                 resource
             )
-        if not dry_run:
-            write_output_to_vault(vault_throughput_path,
-                                  kafka_cluster_name,
-                                  resource.body['data'])
+        vault_outputs[kafka_cluster_name] = resource.body['data']
+
+    if not dry_run:
+        write_outputs_to_vault(vault_throughput_path, vault_outputs,
+                               thread_pool_size)
 
     ob.realize_data(dry_run, oc_map, ri, thread_pool_size)
 
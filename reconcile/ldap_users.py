@@ -35,9 +35,10 @@ def init_users():
             for username, paths in users.items()]
 
 
-def run(dry_run, gitlab_project_id=None):
+def run(dry_run, gitlab_project_id=None, thread_pool_size=10):
     users = init_users()
-    ldap_users = ldap_client.get_users([u['username'] for u in users])
+    ldap_users = ldap_client.get_users([u['username'] for u in users],
+                                       thread_pool_size=thread_pool_size)
     users_to_delete = [u for u in users if u['username'] not in ldap_users]
 
     if not dry_run:
@@ -1,15 +1,18 @@
 import base64
 import logging
 import sys
+import time
 
 from urllib.parse import urlparse
 from collections import namedtuple
 
 from sretoolbox.container import Image
+from sretoolbox.utils import threaded
 
 from reconcile.utils.oc import OC
 from reconcile.utils.oc import OC_Map
 from reconcile.utils.ocm import OCMMap
+from reconcile.utils.state import State
 
 from reconcile import queries
 from reconcile.utils.aws_api import AWSApi
@@ -21,7 +24,14 @@ QONTRACT_INTEGRATION = 'ocp-release-mirror'
 
 LOG = logging.getLogger(__name__)
 
+# releases are immutable once mirrored. Completed mirrors are recorded in a
+# ledger so that runs skip them without probing the registries. Entries are
+# verified again against the registries once the interval has passed.
+LEDGER_VERIFY_INTERVAL = 7 * 24 * 60 * 60
+
 OcpReleaseInfo = namedtuple('OcpReleaseInfo', ['ocp_release', 'tag'])
+MirrorSpec = namedtuple('MirrorSpec', ['ocp_release', 'dest_ocp_release',
+                                       'dest_ocp_art_dev'])
 
 
 class OcpReleaseMirrorError(Exception):
@@ -31,12 +41,15 @@ class OcpReleaseMirrorError(Exception):
 
 
 class OcpReleaseMirror:
-    def __init__(self, dry_run, instance):
+    def __init__(self, dry_run, instance, state=None, thread_pool_size=1):
         self.dry_run = dry_run
         self.settings = queries.get_app_interface_settings()
+        self.state = state
+        self.thread_pool_size = thread_pool_size
 
         cluster_info = instance['hiveCluster']
         hive_cluster = instance['hiveCluster']['name']
+        self.ledger_key = f'ledger/{hive_cluster}'
 
         # Getting the OCM Client for the hive cluster
         ocm_map = OCMMap(clusters=[cluster_info],
@@ -169,37 +182,85 @@ class OcpReleaseMirror:
         if not ocp_releases:
             raise RuntimeError('No OCP Releases found')
 
+        mirrors = []
         for ocp_release_info in ocp_releases:
             ocp_release = ocp_release_info.ocp_release
             tag = ocp_release_info.tag
 
             # mirror to ecr
             dest_ocp_release = f'{self.ocp_release_ecr_uri}:{tag}'
-            self._run_mirror(ocp_release=ocp_release,
-                             dest_ocp_release=dest_ocp_release,
-                             dest_ocp_art_dev=self.ocp_art_dev_ecr_uri)
+            mirrors.append(MirrorSpec(ocp_release, dest_ocp_release,
+                                      self.ocp_art_dev_ecr_uri))
 
             # mirror to all quay target orgs
             for quay_target_org in self.quay_target_orgs:
                 dest_ocp_release = (f'{quay_target_org["dest_ocp_release"]}:'
                                     f'{tag}')
                 dest_ocp_art_dev = quay_target_org["dest_ocp_art_dev"]
-                self._run_mirror(ocp_release=ocp_release,
-                                 dest_ocp_release=dest_ocp_release,
-                                 dest_ocp_art_dev=dest_ocp_art_dev)
+                mirrors.append(MirrorSpec(ocp_release, dest_ocp_release,
+                                          dest_ocp_art_dev))
+
+        ledger = self._get_ledger()
+        now = time.time()
+        pending = [m for m in mirrors
+                   if now - ledger.get(self._ledger_entry(m), 0) >
+                   LEDGER_VERIFY_INTERVAL]
+        LOG.debug(f'{len(mirrors) - len(pending)} mirrors found in the '
+                  f'ledger, {len(pending)} to verify')
+
+        results = threaded.run(self._run_mirror_spec, pending,
+                               self.thread_pool_size,
+                               return_exceptions=True)
+
+        # the ledger only keeps track of the current releases
+        entries = {self._ledger_entry(m) for m in mirrors}
+        new_ledger = {e: t for e, t in ledger.items() if e in entries}
+        errors = []
+        for mirror, result in zip(pending, results):
+            if isinstance(result, Exception):
+                errors.append(result)
+            elif result:
+                new_ledger[self._ledger_entry(mirror)] = now
+        self._set_ledger(ledger, new_ledger)
+
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _ledger_entry(mirror):
+        return f'{mirror.ocp_release} -> {mirror.dest_ocp_release}'
+
+    def _get_ledger(self):
+        if self.state is None:
+            return {}
+        return self.state.get(self.ledger_key, {})
+
+    def _set_ledger(self, ledger, new_ledger):
+        if self.state is None or self.dry_run or ledger == new_ledger:
+            return
+        self.state[self.ledger_key] = new_ledger
+
+    def _run_mirror_spec(self, mirror):
+        return self._run_mirror(ocp_release=mirror.ocp_release,
+                                dest_ocp_release=mirror.dest_ocp_release,
+                                dest_ocp_art_dev=mirror.dest_ocp_art_dev)
 
     def _run_mirror(self, ocp_release, dest_ocp_release, dest_ocp_art_dev):
+        """
+        Mirrors the release unless it is already in the destination.
+        Returns True if the release is in the destination afterwards.
+        """
         # Checking if the image is already there
         if self._is_image_there(dest_ocp_release):
             LOG.debug(f'Image {ocp_release} already in '
                       f'the mirror. Skipping.')
-            return
+            return True
 
         LOG.info(f'Mirroring {ocp_release} to {dest_ocp_art_dev} '
                  f'to_release {dest_ocp_release}')
 
         if self.dry_run:
-            return
+            return False
 
         # Creating a new, bare, OC client since we don't
         # want to run this against any cluster or via
@@ -209,6 +270,7 @@ class OcpReleaseMirror:
                               to=dest_ocp_art_dev,
                               to_release=dest_ocp_release,
                               dockerconfig=self.registry_creds)
+        return True
 
     def _is_image_there(self, image):
         image_obj = Image(image)
@@ -325,12 +387,17 @@ class OcpReleaseMirror:
         }
 
 
-def run(dry_run):
+def run(dry_run, thread_pool_size=4):
     instances = queries.get_ocp_release_mirror()
+    state = State(integration=QONTRACT_INTEGRATION,
+                  accounts=queries.get_aws_accounts(),
+                  settings=queries.get_app_interface_settings())
     for instance in instances:
         try:
             quay_mirror = OcpReleaseMirror(dry_run,
-                                           instance=instance)
+                                           instance=instance,
+                                           state=state,
+                                           thread_pool_size=thread_pool_size)
             quay_mirror.run()
         except OcpReleaseMirrorError as details:
             LOG.error(str(details))
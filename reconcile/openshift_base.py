@@ -9,6 +9,7 @@ from sretoolbox.utils import retry
 from sretoolbox.utils import threaded
 
 from reconcile import queries
+from reconcile.utils.metrics import phase_timer
 from reconcile.utils.oc import FieldIsImmutableError
 from reconcile.utils.oc import MayNotChangeOnceSetError
 from reconcile.utils.oc import PrimaryClusterIPCanNotBeUnsetError
@@ -211,6 +212,7 @@ def populate_current_state(spec, ri, integration, integration_version):
         ri.register_error(cluster=spec.cluster)
 
 
+@phase_timer('fetch_current_state')
 def fetch_current_state(namespaces=None,
                         clusters=None,
                         thread_pool_size=None,
@@ -515,6 +517,7 @@ def _realize_resource_data(unpacked_ri_item,
     return actions
 
 
+@phase_timer('realize_data')
 def realize_data(dry_run, oc_map: OC_Map, ri: ResourceInventory,
                  thread_pool_size,
                  take_over=False,
@@ -546,6 +549,7 @@ def realize_data(dry_run, oc_map: OC_Map, ri: ResourceInventory,
     return list(itertools.chain.from_iterable(results))
 
 
+@phase_timer('validate_data')
 @retry(exceptions=(ValidationError), max_attempts=100)
 def validate_data(oc_map, actions):
     """
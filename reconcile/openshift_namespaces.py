@@ -1,7 +1,8 @@
 import logging
 import sys
 
-from typing import List, Dict, Optional, Any, Iterable, Mapping, Tuple, cast
+from typing import (List, Dict, Optional, Any, Iterable, Mapping, Set,
+                    Tuple, cast)
 from sretoolbox.utils import threaded
 
 from reconcile import queries
@@ -79,8 +80,38 @@ def get_shard_namespaces(
     return list(filtered_ns.values()), err
 
 
+def get_projects(cluster: str, oc_map: OC_Map) -> Optional[Set[str]]:
+    """
+    Lists the projects of a cluster. Returns None if they can not be
+    listed, in which case each namespace has to be checked on its own.
+    """
+    oc = oc_map.get(cluster)
+    if not oc:
+        return None
+
+    try:
+        projects = oc.get_all('Project.project.openshift.io')['items']
+    except Exception as e:
+        logging.warning(f'[{cluster}] could not list projects, '
+                        f'checking namespaces one by one: {e}')
+        return None
+
+    return {p['metadata']['name'] for p in projects}
+
+
+def get_projects_snapshot(clusters: Iterable[str], oc_map: OC_Map,
+                          thread_pool_size: int) \
+        -> Dict[str, Optional[Set[str]]]:
+    clusters = list(clusters)
+    results = threaded.run(get_projects, clusters, thread_pool_size,
+                           oc_map=oc_map)
+    return dict(zip(clusters, results))
+
+
 def manage_namespaces(spec: Mapping[str, str],
-                      oc_map: OC_Map, dry_run: bool) -> None:
+                      oc_map: OC_Map, dry_run: bool,
+                      projects: Optional[Mapping[str, Optional[Set[str]]]]
+                      = None) -> None:
     cluster = spec['cluster']
     namespace = spec['namespace']
     desired_state = spec["desired_state"]
@@ -95,7 +126,11 @@ def manage_namespaces(spec: Mapping[str, str],
         NS_ACTION_DELETE: oc.delete_project
     }
 
-    exists = oc.project_exists(namespace)
+    cluster_projects = projects.get(cluster) if projects else None
+    if cluster_projects is not None:
+        exists = namespace in cluster_projects
+    else:
+        exists = oc.project_exists(namespace)
     action = None
     if not exists and desired_state == NS_STATE_PRESENT:
         action = NS_ACTION_CREATE
@@ -138,14 +173,19 @@ def run(dry_run: bool, thread_pool_size=10,
                     integration=QONTRACT_INTEGRATION,
                     settings=settings, internal=internal,
                     use_jump_host=use_jump_host,
-                    thread_pool_size=thread_pool_size,
-                    init_projects=True)
+                    thread_pool_size=thread_pool_size)
 
     defer(oc_map.cleanup)
 
+    # projects are listed once per cluster instead of checking
+    # the existence of each namespace on its own
+    clusters = {s['cluster'] for s in desired_state}
+    projects = get_projects_snapshot(clusters, oc_map, thread_pool_size)
+
     results = threaded.run(manage_namespaces, desired_state,
                            thread_pool_size, return_exceptions=True,
-                           dry_run=dry_run, oc_map=oc_map)
+                           dry_run=dry_run, oc_map=oc_map,
+                           projects=projects)
 
     err = check_results(desired_state, results)
     if err or duplicates:
@@ -139,12 +139,14 @@ def setup(thread_pool_size,
     tkn_provider_namespaces = [pp['namespace'] for pp in pipelines_providers
                                if pp['provider'] == 'tekton']
 
+    # only the clusters of the triggered pipelines are used
     oc_map = OC_Map(
         namespaces=tkn_provider_namespaces,
         integration=integration,
         settings=settings, internal=internal,
         use_jump_host=use_jump_host,
-        thread_pool_size=thread_pool_size)
+        thread_pool_size=thread_pool_size,
+        lazy=True)
 
     saasherder = SaasHerder(
         saas_files,
@@ -2,6 +2,7 @@ import base64
 import logging
 import sys
 
+from sretoolbox.utils import threaded
 
 from reconcile import queries
 import reconcile.openshift_base as ob
@@ -32,7 +33,10 @@ def construct_sa_token_oc_resource(name, sa_name, sa_token):
               error_details=name)
 
 
-def fetch_desired_state(namespaces, ri, oc_map):
+def fetch_desired_state(namespaces, ri, oc_map, thread_pool_size=1):
+    # consumers of each token indexed by
+    # (cluster, namespace, service account)
+    consumers = {}
     for namespace_info in namespaces:
         if not namespace_info.get('openshiftServiceAccountTokens'):
             continue
@@ -53,23 +57,54 @@ def fetch_desired_state(namespaces, ri, oc_map):
                     ri.register_error()
                 logging.log(level=oc.log_level, msg=oc.message)
                 continue
-            sa_token = oc.sa_get_token(sa_namespace_name, sa_name)
             oc_resource_name = sat.get('name') or \
                 f"{sa_cluster_name}-{sa_namespace_name}-{sa_name}"
-            oc_resource = construct_sa_token_oc_resource(
-                oc_resource_name, sa_name, sa_token)
-            ri.add_desired(
-                cluster_name,
-                namespace_name,
-                'Secret',
-                oc_resource_name,
-                oc_resource
-            )
-
-
-def write_outputs_to_vault(vault_path, ri):
+            token_key = (sa_cluster_name, sa_namespace_name, sa_name)
+            consumers.setdefault(token_key, []).append(
+                (cluster_name, namespace_name, oc_resource_name))
+
+    # tokens are fetched once, concurrently across clusters and with
+    # a bounded concurrency within each cluster
+    tokens_by_cluster = {}
+    for token_key, token_consumers in consumers.items():
+        tokens_by_cluster.setdefault(token_key[0], []).append(
+            (token_key, token_consumers))
+    cluster_thread_pool_size = threaded.estimate_available_thread_pool_size(
+        thread_pool_size, len(tokens_by_cluster))
+    threaded.run(fetch_cluster_tokens, tokens_by_cluster.items(),
+                 thread_pool_size,
+                 ri=ri, oc_map=oc_map,
+                 cluster_thread_pool_size=cluster_thread_pool_size)
+
+
+def fetch_cluster_tokens(cluster_tokens, ri, oc_map,
+                         cluster_thread_pool_size):
+    sa_cluster_name, tokens = cluster_tokens
+    oc = oc_map.get(sa_cluster_name)
+    threaded.run(fetch_token, tokens, cluster_thread_pool_size,
+                 ri=ri, oc=oc)
+
+
+def fetch_token(token, ri, oc):
+    (_, sa_namespace_name, sa_name), token_consumers = token
+    sa_token = oc.sa_get_token(sa_namespace_name, sa_name)
+    # add the token to the inventory as soon as it is fetched
+    for cluster_name, namespace_name, oc_resource_name in token_consumers:
+        oc_resource = construct_sa_token_oc_resource(
+            oc_resource_name, sa_name, sa_token)
+        ri.add_desired(
+            cluster_name,
+            namespace_name,
+            'Secret',
+            oc_resource_name,
+            oc_resource
+        )
+
+
+def write_outputs_to_vault(vault_path, ri, thread_pool_size=10):
     integration_name = QONTRACT_INTEGRATION.replace('_', '-')
     vault_client = VaultClient()
+    secrets = []
     for cluster, namespace, _, data in ri:
         for name, d_item in data['desired'].items():
             body_data = d_item.body['data']
@@ -78,13 +113,14 @@ def write_outputs_to_vault(vault_path, ri):
                 f"{vault_path}/{integration_name}/" + \
                 f"{cluster}/{namespace}/{name}"
             secret = {'path': secret_path, 'data': body_data}
-            vault_client.write(secret)
+            secrets.append(secret)
             # write secret to shared-resources location
             secret_path = \
                 f"{vault_path}/{integration_name}/" + \
                 f"shared-resources/{name}"
             secret = {'path': secret_path, 'data': body_data}
-            vault_client.write(secret)
+            secrets.append(secret)
+    vault_client.write_many(secrets, thread_pool_size=thread_pool_size)
 
 
 def canonicalize_namespaces(namespaces):
@@ -115,10 +151,10 @@ def run(dry_run, thread_pool_size=10, internal=None,
         internal=internal,
         use_jump_host=use_jump_host)
     defer(oc_map.cleanup)
-    fetch_desired_state(namespaces, ri, oc_map)
+    fetch_desired_state(namespaces, ri, oc_map, thread_pool_size)
     ob.realize_data(dry_run, oc_map, ri, thread_pool_size)
     if not dry_run and vault_output_path:
-        write_outputs_to_vault(vault_output_path, ri)
+        write_outputs_to_vault(vault_output_path, ri, thread_pool_size)
 
     if ri.has_error_registered():
         sys.exit(1)
@@ -1,4 +1,5 @@
 import sys
+import copy
 import logging
 import json
 from typing import Any, Optional, Union
@@ -62,6 +63,27 @@ class OpenshiftTektonResourcesBadConfigError(Exception):
     pass
 
 
+class TknTemplates:
+    '''Cache of the tekton templates used while building the desired state.
+    Each template is fetched and compiled once and rendered once per set of
+    variables. Callers get their own copy of the rendered objects'''
+    def __init__(self) -> None:
+        self._compiled: dict[str, jinja2.Template] = {}
+        self._rendered: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def load(self, path: str, variables: dict[str, str]) -> dict[str, Any]:
+        key = (path, json.dumps(variables, sort_keys=True))
+        if key not in self._rendered:
+            if path not in self._compiled:
+                resource = gql.get_api().get_resource(path)
+                self._compiled[path] = jinja2.Template(
+                    resource['content'], undefined=jinja2.StrictUndefined)
+            body = self._compiled[path].render(variables)
+            self._rendered[key] = yaml.safe_load(body)
+
+        return copy.deepcopy(self._rendered[key])
+
+
 def fetch_saas_files(saas_file_name: Optional[str]) -> list[dict[str, Any]]:
     '''Fetch saas v2 files'''
     saas_files = gql.get_api().query(SAAS_FILES_QUERY)['saas_files']
@@ -122,6 +144,7 @@ def fetch_desired_resources(tkn_providers: dict[str, Any]) \
     This will also add resourceNames inside tkn_providers['namespace']
     while we are migrating from the current system to this integration'''
     desired_resources = []
+    templates = TknTemplates()
     for tknp in tkn_providers.values():
         namespace = tknp['namespace']['name']
         cluster = tknp['namespace']['cluster']['name']
@@ -143,7 +166,8 @@ def fetch_desired_resources(tkn_providers: dict[str, Any]) \
                 task_template_config['type']
 
             if task_template_config['type'] == 'onePerNamespace':
-                task = build_one_per_namespace_task(task_template_config)
+                task = build_one_per_namespace_task(task_template_config,
+                                                    templates)
                 desired_tasks.append(
                     build_desired_resource(task,
                                            task_template_config['path'],
@@ -152,7 +176,7 @@ def fetch_desired_resources(tkn_providers: dict[str, Any]) \
             elif task_template_config['type'] == 'onePerSaasFile':
                 for sf in tknp['saas_files']:
                     task = build_one_per_saas_file_task(
-                        task_template_config, sf, deploy_resources)
+                        task_template_config, sf, deploy_resources, templates)
                     desired_tasks.append(
                         build_desired_resource(task,
                                                task_template_config['path'],
@@ -182,7 +206,7 @@ def fetch_desired_resources(tkn_providers: dict[str, Any]) \
         desired_pipelines = []
         for sf in tknp['saas_files']:
             pipeline = build_one_per_saas_file_pipeline(
-                pipeline_template_config, sf, task_templates_types)
+                pipeline_template_config, sf, task_templates_types, templates)
             desired_pipelines.append(
                 build_desired_resource(pipeline,
                                        pipeline_template_config['path'],
@@ -199,13 +223,15 @@ def fetch_desired_resources(tkn_providers: dict[str, Any]) \
     return desired_resources
 
 
-def build_one_per_namespace_task(task_template_config: dict[str, str]) \
+def build_one_per_namespace_task(task_template_config: dict[str, str],
+                                 templates: Optional[TknTemplates] = None) \
         -> dict[str, Any]:
     '''Builds onePerNamespace Task objects. The name of the task template
     will be used as Task name and there won't be any resource configuration'''
     variables = json.loads(task_template_config['variables']) \
         if task_template_config.get('variables') else {}
-    task = load_tkn_template(task_template_config['path'], variables)
+    task = load_tkn_template(task_template_config['path'], variables,
+                             templates)
     task['metadata']['name'] = \
         build_one_per_namespace_tkn_object_name(task_template_config['name'])
 
@@ -214,7 +240,8 @@ def build_one_per_namespace_task(task_template_config: dict[str, str]) \
 
 def build_one_per_saas_file_task(task_template_config: dict[str, str],
                                  saas_file: dict[str, Any],
-                                 deploy_resources: dict[str, dict[str, str]]) \
+                                 deploy_resources: dict[str, dict[str, str]],
+                                 templates: Optional[TknTemplates] = None) \
                                          -> dict[str, Any]:
     '''Builds onePerSaasFile Task objects. The name of the Task will be set
     using the template config name and the saas file name. The step
@@ -223,7 +250,8 @@ def build_one_per_saas_file_task(task_template_config: dict[str, str],
     file configuration'''
     variables = json.loads(task_template_config['variables']) \
         if task_template_config.get('variables') else {}
-    task = load_tkn_template(task_template_config['path'], variables)
+    task = load_tkn_template(task_template_config['path'], variables,
+                             templates)
     task['metadata']['name'] = \
         build_one_per_saas_file_tkn_object_name(task_template_config['name'],
                                                 saas_file['name'])
@@ -246,15 +274,17 @@ def build_one_per_saas_file_task(task_template_config: dict[str, str],
     return task
 
 
-def build_one_per_saas_file_pipeline(pipeline_template_config: dict[str, str],
-                                     saas_file: dict[str, Any],
-                                     task_templates_types: dict[str, str]) \
-                                        -> dict[str, Any]:
+def build_one_per_saas_file_pipeline(
+        pipeline_template_config: dict[str, str],
+        saas_file: dict[str, Any],
+        task_templates_types: dict[str, str],
+        templates: Optional[TknTemplates] = None) -> dict[str, Any]:
     '''Builds onePerSaasFile Pipeline objects. The task references names will
     be set depending if the tasks are onePerNamespace or onePerSaasFile'''
     variables = json.loads(pipeline_template_config['variables']) \
         if pipeline_template_config.get('variables') else {}
-    pipeline = load_tkn_template(pipeline_template_config['path'], variables)
+    pipeline = load_tkn_template(pipeline_template_config['path'], variables,
+                                 templates)
     pipeline['metadata']['name'] = build_one_per_saas_file_tkn_object_name(
         pipeline_template_config['name'], saas_file['name'])
 
@@ -276,13 +306,13 @@ def build_one_per_saas_file_pipeline(pipeline_template_config: dict[str, str],
     return pipeline
 
 
-def load_tkn_template(path: str, variables: dict[str, str]) -> dict[str, Any]:
+def load_tkn_template(path: str, variables: dict[str, str],
+                      templates: Optional[TknTemplates] = None) \
+        -> dict[str, Any]:
     '''Fetches a yaml resource from qontract-server and parses it'''
-    resource = gql.get_api().get_resource(path)
-    body = jinja2.Template(resource['content'],
-                           undefined=jinja2.StrictUndefined).render(variables)
-
-    return yaml.safe_load(body)
+    if templates is None:
+        templates = TknTemplates()
+    return templates.load(path, variables)
 
 
 def build_desired_resource(tkn_object: dict[str, Any], path: str, cluster: str,
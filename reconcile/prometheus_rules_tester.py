@@ -5,8 +5,6 @@ import sys
 import traceback
 import yaml
 
-from sretoolbox.utils import threaded
-
 from reconcile import queries
 from reconcile.utils import gql
 from reconcile.utils import promtool
@@ -122,12 +120,10 @@ def get_prometheus_rules(cluster_name):
 #       labels:
 #         service: serviceName
 #         ...
-def check_valid_services(rule):
+def check_valid_services(rule, allowed_services):
     '''Check that all services in Prometheus rules are known.
     This replaces an enum in the json schema with a list
     in app-interface settings.'''
-    allowed_services = \
-        queries.get_app_interface_settings()['alertingServices']
     missing_services = set()
     spec = rule['spec']
     groups = spec['groups']
@@ -152,13 +148,6 @@ def check_valid_services(rule):
     return CommandExecutionResult(True, '')
 
 
-def check_rule(rule):
-    promtool_check_result = promtool.check_rule(yaml_spec=rule['spec'])
-    valid_services_result = check_valid_services(rule)
-    rule['check_result'] = promtool_check_result and valid_services_result
-    return rule
-
-
 def check_prometheus_rules(rules, thread_pool_size):
     '''Returns a list of dicts with failed rule checks'''
     # flatten the list of prometheus rules to have a list of dicts
@@ -173,18 +162,21 @@ def check_prometheus_rules(rules, thread_pool_size):
                     'spec': rule_data['spec']
                 })
 
-    result = threaded.run(func=check_rule,
-                          iterable=rules_to_check,
-                          thread_pool_size=thread_pool_size)
-
-    # return invalid rules
-    return [rule for rule in result if not rule['check_result']]
+    # rules are checked in promtool batches, failures are attributed back
+    # to each rule by its position in rules_to_check
+    promtool_check_results = promtool.check_rules(
+        {i: rule['spec'] for i, rule in enumerate(rules_to_check)},
+        thread_pool_size=thread_pool_size)
 
+    allowed_services = \
+        queries.get_app_interface_settings()['alertingServices']
+    for i, rule in enumerate(rules_to_check):
+        valid_services_result = check_valid_services(rule, allowed_services)
+        rule['check_result'] = \
+            promtool_check_results[i] and valid_services_result
 
-def run_test(test):
-    test['check_result'] = promtool.run_test(test_yaml_spec=test['test'],
-                                             rule_files=test['rule_files'])
-    return test
+    # return invalid rules
+    return [rule for rule in rules_to_check if not rule['check_result']]
 
 
 def get_rule_files_from_jinja_test_template(template):
@@ -284,11 +276,15 @@ def check_prometheus_tests(tests, rules, thread_pool_size):
             failed_tests.append({**test_to_run, 'check_result': msg})
             continue
 
-    result = threaded.run(func=run_test,
-                          iterable=tests_to_run,
-                          thread_pool_size=thread_pool_size)
+    results = promtool.run_tests(
+        {i: (test['test'], test['rule_files'])
+         for i, test in enumerate(tests_to_run)},
+        thread_pool_size=thread_pool_size)
+    for i, test in enumerate(tests_to_run):
+        test['check_result'] = results[i]
 
-    failed_tests.extend([test for test in result if not test['check_result']])
+    failed_tests.extend(
+        [test for test in tests_to_run if not test['check_result']])
 
     return failed_tests
 
@@ -6,8 +6,9 @@ from reconcile.utils.secret_reader import SecretReader
 from reconcile.utils.smtp_client import SmtpClient
 from reconcile import queries
 
+from reconcile.utils.defer import defer
 from reconcile.utils.state import State
-from reconcile.utils.gpg import gpg_encrypt
+from reconcile.utils.gpg import GpgKeyring, gpg_encrypt
 
 
 QONTRACT_INTEGRATION = 'requests-sender'
@@ -32,7 +33,8 @@ Encrypted credentials:
 """
 
 
-def get_encrypted_credentials(credentials_name, user, settings):
+def get_encrypted_credentials(credentials_name, user, settings,
+                              keyring=None):
     credentials_map = settings['credentials']
     credentials_map_item = \
         [c for c in credentials_map if c['name'] == credentials_name]
@@ -43,12 +45,13 @@ def get_encrypted_credentials(credentials_name, user, settings):
     credentials = secret_reader.read(secret)
     public_gpg_key = user['public_gpg_key']
     encrypted_credentials = \
-        gpg_encrypt(credentials, public_gpg_key)
+        gpg_encrypt(credentials, public_gpg_key, keyring=keyring)
 
     return encrypted_credentials
 
 
-def run(dry_run):
+@defer
+def run(dry_run, defer=None):
     settings = queries.get_app_interface_settings()
     accounts = queries.get_aws_accounts()
     smtp_client = SmtpClient(settings=settings)
@@ -69,6 +72,9 @@ def run(dry_run):
 
     credentials_requests_to_send = \
         [r for r in credentials_requests if not state.exists(r['name'])]
+    # keys are imported once per run
+    keyring = GpgKeyring()
+    defer(keyring.cleanup)
     for credentials_request_to_send in credentials_requests_to_send:
         try:
             user = credentials_request_to_send['user']
@@ -80,7 +86,7 @@ def run(dry_run):
             names = [org_username]
             subject = request_name
             encrypted_credentials = get_encrypted_credentials(
-                credentials_name, user, settings
+                credentials_name, user, settings, keyring=keyring
             )
             if not dry_run:
                 body = MESSAGE_TEMPLATE.format(
@@ -99,6 +105,12 @@ def run(dry_run):
                 f"({credentials_name}): {e.stdout}"
             )
             error = True
+        except ValueError as e:
+            logging.error(
+                f"Failed to handle GPG key for {org_username} "
+                f"({credentials_name}): {e}"
+            )
+            error = True
 
     if error:
         sys.exit(1)
@@ -1,5 +1,4 @@
 import logging
-import shutil
 import sys
 
 from textwrap import indent
@@ -17,7 +16,9 @@ from reconcile.utils.oc import OC_Map
 from reconcile.utils.ocm import OCMMap
 from reconcile.utils.oc import StatusCodeError
 from reconcile.utils.openshift_resource import ResourceInventory
+from reconcile.utils.state import State
 from reconcile.utils.terrascript_client import TerrascriptClient as Terrascript
+from reconcile.utils.terrascript_client import cleanup_working_dirs
 from reconcile.utils.terraform_client import OR, TerraformClient as Terraform
 from reconcile.utils.vault import VaultClient
 
@@ -397,9 +398,10 @@ def init_working_dirs(accounts, thread_pool_size,
 
 
 def setup(dry_run, print_to_file, thread_pool_size, internal,
-          use_jump_host, account_name, extra_labels):
+          use_jump_host, account_name, extra_labels,
+          drift_detection_interval=None):
     gqlapi = gql.get_api()
-    accounts = queries.get_aws_accounts()
+    all_accounts = accounts = queries.get_aws_accounts()
     if account_name:
         accounts = [n for n in accounts
                     if n['name'] == account_name]
@@ -414,12 +416,19 @@ def setup(dry_run, print_to_file, thread_pool_size, internal,
     ts, working_dirs = init_working_dirs(accounts, thread_pool_size,
                                          oc_map=oc_map,
                                          settings=settings)
+    plan_state = None
+    if drift_detection_interval is not None:
+        plan_state = State(integration=QONTRACT_INTEGRATION,
+                           accounts=all_accounts,
+                           settings=settings)
     tf = Terraform(QONTRACT_INTEGRATION,
                    QONTRACT_INTEGRATION_VERSION,
                    QONTRACT_TF_PREFIX,
                    accounts,
                    working_dirs,
-                   thread_pool_size)
+                   thread_pool_size,
+                   plan_state=plan_state,
+                   drift_detection_interval=drift_detection_interval)
     existing_secrets = tf.get_terraform_output_secrets()
     clusters = [c for c in queries.get_clusters()
                 if c.get('ocm') is not None]
@@ -456,22 +465,23 @@ def filter_tf_namespaces(namespaces, account_name):
 
 def cleanup_and_exit(tf=None, status=False, working_dirs={}):
     if tf is None:
-        for wd in working_dirs.values():
-            shutil.rmtree(wd)
+        cleanup_working_dirs(working_dirs)
     else:
         tf.cleanup()
     sys.exit(status)
 
 
-def write_outputs_to_vault(vault_path, ri):
+def write_outputs_to_vault(vault_path, ri, thread_pool_size=10):
     integration_name = QONTRACT_INTEGRATION.replace('_', '-')
     vault_client = VaultClient()
+    secrets = []
     for cluster, namespace, _, data in ri:
         for name, d_item in data['desired'].items():
             secret_path = \
                 f"{vault_path}/{integration_name}/{cluster}/{namespace}/{name}"
             secret = {'path': secret_path, 'data': d_item.body['data']}
-            vault_client.write(secret)
+            secrets.append(secret)
+    vault_client.write_many(secrets, thread_pool_size=thread_pool_size)
 
 
 @defer
@@ -479,11 +489,13 @@ def run(dry_run, print_to_file=None,
         enable_deletion=False, io_dir='throughput/',
         thread_pool_size=10, internal=None, use_jump_host=True,
         light=False, vault_output_path='',
-        account_name=None, extra_labels=None, defer=None):
+        account_name=None, extra_labels=None,
+        drift_detection_interval=None, defer=None):
 
     ri, oc_map, tf, tf_namespaces = \
         setup(dry_run, print_to_file, thread_pool_size, internal,
-              use_jump_host, account_name, extra_labels)
+              use_jump_host, account_name, extra_labels,
+              drift_detection_interval=drift_detection_interval)
 
     if not dry_run:
         defer(oc_map.cleanup)
@@ -520,7 +532,7 @@ def run(dry_run, print_to_file=None,
                  account_name=account_name)
 
     if actions and vault_output_path:
-        write_outputs_to_vault(vault_output_path, ri)
+        write_outputs_to_vault(vault_output_path, ri, thread_pool_size)
 
     if ri.has_error_registered():
         err = True
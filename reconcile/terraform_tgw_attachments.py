@@ -132,7 +132,8 @@ def run(dry_run, print_to_file=None,
         ocm_map = {}
 
     accounts = queries.get_aws_accounts()
-    awsapi = AWSApi(1, accounts, settings=settings, init_users=False)
+    awsapi = AWSApi(thread_pool_size, accounts, settings=settings,
+                    init_users=False)
 
     # Fetch desired state for cluster-to-vpc(account) VPCs
     desired_state, err = \
@@ -5,6 +5,7 @@ from reconcile.utils.smtp_client import SmtpClient
 from reconcile import queries
 
 from reconcile.utils.semver_helper import make_semver
+from reconcile.utils.state import State
 from reconcile.utils.terrascript_client import TerrascriptClient as Terrascript
 from reconcile.utils.terraform_client import TerraformClient as Terraform
 
@@ -101,7 +102,8 @@ def cleanup_and_exit(tf=None, status=False):
 
 def run(dry_run, print_to_file=None,
         enable_deletion=False, io_dir='throughput/',
-        thread_pool_size=10, send_mails=True):
+        thread_pool_size=10, send_mails=True,
+        drift_detection_interval=None):
     accounts, working_dirs = setup(print_to_file, thread_pool_size)
     if print_to_file:
         cleanup_and_exit()
@@ -109,13 +111,20 @@ def run(dry_run, print_to_file=None,
         err = True
         cleanup_and_exit(status=err)
 
+    plan_state = None
+    if drift_detection_interval is not None:
+        plan_state = State(integration=QONTRACT_INTEGRATION,
+                           accounts=accounts,
+                           settings=queries.get_app_interface_settings())
     tf = Terraform(QONTRACT_INTEGRATION,
                    QONTRACT_INTEGRATION_VERSION,
                    QONTRACT_TF_PREFIX,
                    accounts,
                    working_dirs,
                    thread_pool_size,
-                   init_users=True)
+                   init_users=True,
+                   plan_state=plan_state,
+                   drift_detection_interval=drift_detection_interval)
     if tf is None:
         err = True
         cleanup_and_exit(tf, err)
@@ -387,7 +387,8 @@ def run(dry_run, print_to_file=None,
                          settings=settings)
 
     accounts = queries.get_aws_accounts()
-    awsapi = aws_api.AWSApi(1, accounts, settings=settings, init_users=False)
+    awsapi = aws_api.AWSApi(thread_pool_size, accounts, settings=settings,
+                            init_users=False)
 
     errors = []
     # Fetch desired state for cluster-to-vpc(account) VPCs
@@ -1,4 +1,5 @@
 from unittest import TestCase
+from unittest.mock import patch
 import reconcile.aws_iam_keys as integ
 
 
@@ -26,3 +27,32 @@ class TestSupportFunctions(TestCase):
         expected_result = {a['name']: a['deleteKeys']}
         keys_to_delete = integ.get_keys_to_delete(accounts)
         self.assertEqual(keys_to_delete, expected_result)
+
+
+@patch.object(integ, 'init_tf_working_dirs')
+@patch.object(integ, 'AWSApi')
+@patch.object(integ.queries, 'get_app_interface_settings')
+@patch.object(integ.queries, 'get_aws_accounts')
+class TestRun(TestCase):
+
+    def test_run_only_accounts_with_keys(self, get_aws_accounts, _,
+                                         aws_api, init_tf_working_dirs):
+        a = {'name': 'a', 'deleteKeys': ['k1']}
+        b = {'name': 'b', 'deleteKeys': None}
+        get_aws_accounts.return_value = [a, b]
+        aws_api.return_value.delete_keys.return_value = False
+
+        integ.run(True, thread_pool_size=1)
+
+        self.assertEqual(aws_api.call_args[0][1], [a])
+        self.assertEqual(init_tf_working_dirs.call_args[0][0], [a])
+        aws_api.return_value.delete_keys.assert_called_once()
+
+    def test_run_no_keys(self, get_aws_accounts, _,
+                         aws_api, init_tf_working_dirs):
+        get_aws_accounts.return_value = [{'name': 'a', 'deleteKeys': []}]
+
+        integ.run(True, thread_pool_size=1)
+
+        aws_api.assert_not_called()
+        init_tf_working_dirs.assert_not_called()
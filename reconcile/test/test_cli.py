@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from click.testing import CliRunner
 
 import reconcile.cli as reconcile_cli
@@ -9,3 +12,12 @@ class TestCli:
         runner = CliRunner()
         result = runner.invoke(reconcile_cli.integration)
         assert result.exit_code == 0
+
+    @staticmethod
+    def test_integration_modules_are_lazily_imported():
+        # a fresh interpreter is needed as other tests import integrations
+        code = ('import sys; import reconcile.cli; '
+                'print("reconcile.terraform_resources" in sys.modules)')
+        result = subprocess.run([sys.executable, '-c', code],
+                                stdout=subprocess.PIPE, check=True)
+        assert result.stdout.decode().strip() == 'False'
@@ -0,0 +1,115 @@
+import base64
+from unittest.mock import MagicMock
+
+import pytest
+
+from reconcile import ecr_mirror
+
+
+def tfr(identifier, account='acc1', region=None):
+    return {
+        'provider': 'ecr',
+        'account': account,
+        'region': region,
+        'identifier': identifier,
+        'mirror': {'url': f'quay.io/org/{identifier}',
+                   'pullCredentials': None},
+    }
+
+
+@pytest.fixture
+def aws_api(mocker):
+    token = base64.b64encode(b'AWS:password').decode()
+    aws_api = mocker.patch.object(ecr_mirror, 'AWSApi', autospec=True)
+    aws_cli = aws_api.return_value
+    aws_cli.get_ecr_repositories.side_effect = \
+        lambda account, region: [
+            {'repositoryName': f'repo{i}',
+             'repositoryUri': f'{account}.{region}/repo{i}'}
+            for i in range(3)
+        ]
+    aws_cli.auth_tokens = {
+        f'{account}/{region}': {
+            'authorizationData': [{'authorizationToken': token}]}
+        for account in ['acc1', 'acc2']
+        for region in ['us-east-1', 'eu-west-1']
+    }
+    return aws_api
+
+
+@pytest.fixture
+def mirrors(mocker):
+    mocker.patch.object(ecr_mirror.queries, 'get_app_interface_settings')
+    mocker.patch.object(ecr_mirror.queries, 'get_aws_accounts',
+                        return_value=[
+                            {'name': 'acc1',
+                             'resourcesDefaultRegion': 'us-east-1'},
+                            {'name': 'acc2',
+                             'resourcesDefaultRegion': 'eu-west-1'},
+                        ])
+    mocker.patch.object(ecr_mirror.queries, 'get_namespaces',
+                        return_value=[
+                            {'terraformResources': [
+                                tfr('repo0'),
+                                tfr('repo1', region='us-east-1'),
+                                tfr('repo2', region='eu-west-1'),
+                                tfr('repo0', account='acc2'),
+                                tfr('missing', account='acc2'),
+                                tfr('repo0', account='unknown'),
+                            ]},
+                            {'terraformResources': None},
+                        ])
+    return mocker.patch.object(ecr_mirror.EcrMirror, 'run', autospec=True)
+
+
+def test_setup_once_per_account_region(aws_api, mirrors):
+    ecr_mirror.run(dry_run=True, thread_pool_size=1)
+
+    aws_api.assert_called_once()
+    accounts = aws_api.call_args[1]['accounts']
+    assert sorted(a['name'] for a in accounts) == ['acc1', 'acc2']
+    assert aws_api.call_args[1]['init_ecr_auth_tokens']
+
+    aws_cli = aws_api.return_value
+    assert sorted(c[0] for c in
+                  aws_cli.get_ecr_repositories.call_args_list) == [
+        ('acc1', 'eu-west-1'), ('acc1', 'us-east-1'),
+        ('acc2', 'eu-west-1'),
+    ]
+
+    instances = {(m.instance['account'], m.instance['identifier']): m
+                 for (m,), _ in mirrors.call_args_list}
+    assert sorted(instances) == [('acc1', 'repo0'), ('acc1', 'repo1'),
+                                 ('acc1', 'repo2'), ('acc2', 'missing'),
+                                 ('acc2', 'repo0')]
+    assert instances['acc1', 'repo0'].ecr_uri == 'acc1.us-east-1/repo0'
+    assert instances['acc1', 'repo2'].ecr_uri == 'acc1.eu-west-1/repo2'
+    assert instances['acc1', 'repo1'].registry is \
+        instances['acc1', 'repo0'].registry
+    assert instances['acc1', 'repo0'].registry.password == 'password'
+    assert instances['acc2', 'missing'].error
+
+
+def test_nothing_to_mirror(aws_api, mocker):
+    mocker.patch.object(ecr_mirror.queries, 'get_app_interface_settings')
+    mocker.patch.object(ecr_mirror.queries, 'get_aws_accounts',
+                        return_value=[])
+    mocker.patch.object(ecr_mirror.queries, 'get_namespaces',
+                        return_value=[])
+
+    ecr_mirror.run(dry_run=True)
+
+    aws_api.assert_not_called()
+
+
+def test_registry_missing_repository():
+    aws_cli = MagicMock()
+    aws_cli.get_ecr_repositories.return_value = []
+    token = base64.b64encode(b'AWS:pw').decode()
+    aws_cli.auth_tokens = {
+        'acc/region': {'authorizationData': [{'authorizationToken': token}]}
+    }
+    registry = ecr_mirror.EcrRegistry(('acc', 'region'), aws_cli)
+
+    assert registry.auth == 'AWS:pw'
+    assert registry.repositories == {}
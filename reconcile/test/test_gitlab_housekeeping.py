@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
 from gitlab import Gitlab
 
@@ -79,3 +79,119 @@ class TestGitLabHousekeeping:
 
         # Test if mock have this exact calls
         http_post.assert_called_once_with('/projects/1/pipelines/47/cancel')
+
+
+def mr_mock(iid, labels, target_branch='master', sha=None):
+    mr = MagicMock()
+    mr.iid = iid
+    mr.merge_status = 'can_be_merged'
+    mr.work_in_progress = False
+    mr.target_branch = target_branch
+    mr.sha = sha or f'sha{iid}'
+    mr.attributes = {'iid': iid, 'labels': labels}
+    mr.commits.return_value = ['commit']
+    mr.pipelines.return_value = [{'status': 'success'}]
+    return mr
+
+
+def gl_mock(mrs=None, issues=None):
+    gl = MagicMock()
+    gl.get_merge_requests.return_value = mrs or []
+    gl.get_issues.return_value = issues or []
+    gl.project.commits.list.return_value = [MagicMock(id='head')]
+    gl.project.repository_compare.return_value = {'commits': []}
+    return gl
+
+
+class TestRepoSnapshot:
+    @staticmethod
+    def test_branch_head_fetched_once():
+        mrs = [mr_mock(i, ['lgtm']) for i in range(5)]
+        gl = gl_mock(mrs=mrs)
+        snapshot = gl_h.RepoSnapshot(gl)
+
+        gl_h.merge_merge_requests(True, gl, 10, True, snapshot=snapshot)
+        gl_h.rebase_merge_requests(True, gl, 10, snapshot=snapshot)
+
+        gl.get_merge_requests.assert_called_once()
+        gl.project.commits.list.assert_called_once_with(ref_name='master')
+        for mr in mrs:
+            mr.commits.assert_called_once()
+            mr.pipelines.assert_called_once()
+
+    @staticmethod
+    def test_merge_in_priority_order_once_per_mr():
+        low = mr_mock(1, ['bot/automerge', 'lgtm'])
+        high = mr_mock(2, ['bot/approved'])
+        gl = gl_mock(mrs=[high, low])
+
+        with patch('reconcile.gitlab_housekeeping.logging') as log:
+            gl_h.merge_merge_requests(False, gl, 10, False)
+
+        merges = [c[0][0] for c in log.info.call_args_list]
+        assert merges == [['merge', gl.project.name, 2],
+                          ['merge', gl.project.name, 1]]
+        high.merge.assert_called_once()
+        low.merge.assert_called_once()
+
+    @staticmethod
+    def test_merged_mr_not_rebased():
+        merged = mr_mock(1, ['lgtm'])
+        other = mr_mock(2, ['lgtm'])
+        gl = gl_mock(mrs=[other, merged])
+        gl.project.repository_compare.side_effect = \
+            lambda sha, head: {'commits': [] if sha == 'sha1' else ['c']}
+        snapshot = gl_h.RepoSnapshot(gl)
+
+        gl_h.merge_merge_requests(False, gl, 10, True, snapshot=snapshot)
+        gl_h.rebase_merge_requests(False, gl, 10, snapshot=snapshot)
+
+        merged.merge.assert_called_once()
+        merged.rebase.assert_not_called()
+        other.rebase.assert_called_once()
+        # the target branch head is fetched again after the merge
+        assert gl.project.commits.list.call_count == 2
+
+    @staticmethod
+    def test_stale_notes_only_listed_when_needed():
+        now = datetime.utcnow()
+        fresh = MagicMock()
+        fresh.attributes = {'iid': 1, 'labels': [],
+                            'updated_at': now.strftime(DATE_FORMAT)}
+        old = MagicMock()
+        old_date = (now - timedelta(days=30)).strftime(DATE_FORMAT)
+        old.attributes = {'iid': 2, 'labels': [], 'updated_at': old_date}
+        note = MagicMock()
+        note.attributes = {'updated_at': old_date}
+        old.notes.list.return_value = [note]
+        gl = gl_mock(issues=[fresh, old])
+
+        gl_h.handle_stale_items(False, gl, 15, False, 'issue')
+
+        fresh.notes.list.assert_not_called()
+        old.notes.list.assert_called_once()
+        gl.add_label.assert_called_once_with(old, 'issue', 'stale')
+
+    @staticmethod
+    def test_closed_stale_mr_not_merged():
+        now = datetime.utcnow()
+        old_date = (now - timedelta(days=30)).strftime(DATE_FORMAT)
+        stale = mr_mock(1, ['lgtm', 'stale'])
+        stale.attributes['updated_at'] = old_date
+        note = MagicMock()
+        note.attributes = {'updated_at': old_date}
+        stale.notes.list.return_value = [note]
+        other = mr_mock(2, ['lgtm'])
+        other.attributes['updated_at'] = now.strftime(DATE_FORMAT)
+        gl = gl_mock(mrs=[other, stale])
+        snapshot = gl_h.RepoSnapshot(gl)
+
+        gl_h.handle_stale_items(False, gl, 15, True, 'merge-request',
+                                snapshot=snapshot)
+        gl_h.merge_merge_requests(False, gl, 10, True, snapshot=snapshot)
+        gl_h.rebase_merge_requests(False, gl, 10, snapshot=snapshot)
+
+        gl.close.assert_called_once_with(stale)
+        stale.merge.assert_not_called()
+        stale.rebase.assert_not_called()
+        other.merge.assert_called_once()
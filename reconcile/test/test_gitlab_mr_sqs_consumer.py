@@ -0,0 +1,104 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import reconcile.gitlab_mr_sqs_consumer as integ
+from reconcile.utils import mr
+
+
+def build_merge_request(title, created=True, error=None):
+    merge_request = MagicMock()
+    merge_request.title = title
+    if error:
+        merge_request.submit_to_gitlab.side_effect = error
+    else:
+        merge_request.submit_to_gitlab.return_value = \
+            MagicMock() if created else None
+    return merge_request
+
+
+@pytest.fixture
+def clients():
+    with patch.object(integ, 'queries'), \
+            patch.object(integ, 'SQSGateway') as sqs_gateway, \
+            patch.object(integ, 'GitLabApi') as gitlab_api, \
+            patch.object(integ.mr, 'init_from_sqs_message') as init_mr:
+        sqs_cli = sqs_gateway.return_value
+        sqs_cli.delete_messages.return_value = []
+        gitlab_cli = gitlab_api.return_value
+        gitlab_cli.get_open_mr_titles.return_value = {'existing'}
+        merge_requests = {}
+        init_mr.side_effect = lambda body: merge_requests[body['id']]
+        yield sqs_cli, gitlab_cli, merge_requests
+
+
+def test_messages_with_same_title_submitted_once(clients):
+    sqs_cli, gitlab_cli, merge_requests = clients
+    first = build_merge_request('a')
+    merge_requests['first'] = first
+    second = build_merge_request('a')
+    merge_requests['second'] = second
+    sqs_cli.receive_messages.side_effect = [
+        [('h1', {'id': 'first'}), ('h2', {'id': 'second'})],
+        [],
+    ]
+
+    integ.run(False, 1)
+
+    first.submit_to_gitlab.assert_called_once()
+    second.submit_to_gitlab.assert_not_called()
+    sqs_cli.delete_messages.assert_called_once_with(['h1', 'h2'])
+    gitlab_cli.get_open_mr_titles.assert_called_once()
+
+
+def test_failed_messages_not_deleted(clients):
+    sqs_cli, _, merge_requests = clients
+    ok = build_merge_request('ok')
+    merge_requests['ok'] = ok
+    failed = build_merge_request(
+        'failed', error=mr.MergeRequestProcessingError('boom'))
+    merge_requests['failed'] = failed
+    sqs_cli.receive_messages.side_effect = [
+        [('h1', {'id': 'ok'}), ('h2', {'id': 'failed'})],
+        [],
+    ]
+
+    with pytest.raises(SystemExit):
+        integ.run(False, 1)
+
+    sqs_cli.delete_messages.assert_called_once_with(['h1'])
+
+
+def test_created_titles_are_tracked(clients):
+    sqs_cli, gitlab_cli, merge_requests = clients
+    first = build_merge_request('a')
+    merge_requests['first'] = first
+    second = build_merge_request('a')
+    merge_requests['second'] = second
+    sqs_cli.receive_messages.side_effect = [
+        [('h1', {'id': 'first'})],
+        [('h2', {'id': 'second'})],
+        [],
+    ]
+
+    integ.run(False, 1)
+
+    open_mr_titles = \
+        second.submit_to_gitlab.call_args.kwargs['open_mr_titles']
+    assert open_mr_titles == {'existing', 'a'}
+    gitlab_cli.get_open_mr_titles.assert_called_once()
+
+
+def test_dry_run_does_not_submit(clients):
+    sqs_cli, _, merge_requests = clients
+    merge_request = build_merge_request('a')
+    merge_requests['merge_request'] = merge_request
+    sqs_cli.receive_messages.side_effect = [
+        [('h1', {'id': 'merge_request'})],
+        [],
+    ]
+
+    integ.run(True, 1)
+
+    merge_request.submit_to_gitlab.assert_not_called()
+    sqs_cli.delete_messages.assert_not_called()
@@ -0,0 +1,95 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import reconcile.jira_watcher as jw
+
+
+BOARD = {'name': 'PROJ', 'slack': {'channel': 'jira'}}
+
+
+class FakeState(dict):
+    def add(self, key, value=None, force=False):
+        self[key] = value
+
+
+def issue(key, status, summary='summary'):
+    i = MagicMock()
+    i.key = key
+    i.fields.status.name = status
+    i.fields.summary = summary
+    return i
+
+
+@pytest.fixture
+def env(mocker):
+    mocker.patch.object(jw.queries, 'get_jira_boards',
+                        return_value=[BOARD])
+    mocker.patch.object(jw.queries, 'get_aws_accounts')
+    mocker.patch.object(jw.queries, 'get_app_interface_settings')
+    mocker.patch.object(jw, 'is_in_shard_round_robin', return_value=True)
+    state = FakeState()
+    mocker.patch.object(jw, 'State', return_value=state)
+    jira = mocker.patch.object(jw, 'JiraClient').return_value
+    jira.project = 'PROJ'
+    jira.server = 'https://jira'
+    act = mocker.patch.object(jw, 'act')
+    return state, jira, act
+
+
+def test_first_run_fetches_whole_board(env):
+    state, jira, act = env
+    jira.get_issues.return_value = [issue('PROJ-1', 'New')]
+
+    jw.run(False)
+
+    assert jira.get_issues.call_args[1]['updated_since'] is None
+    act.assert_not_called()
+    assert state['PROJ'] == {'PROJ-1': {'status': 'New',
+                                        'summary': 'summary'}}
+    mark = state[jw.high_water_mark_key('PROJ')]
+    assert mark['updated_since'] == mark['full_sync_at']
+
+
+def test_incremental_run_merges_updates(env):
+    state, jira, act = env
+    last_run = time.time() - 60
+    state['PROJ'] = {'PROJ-1': {'status': 'New', 'summary': 's'},
+                     'PROJ-2': {'status': 'New', 'summary': 's'}}
+    state[jw.high_water_mark_key('PROJ')] = {'updated_since': last_run,
+                                             'full_sync_at': last_run}
+    jira.get_issues.return_value = [issue('PROJ-2', 'Done', 's'),
+                                    issue('PROJ-3', 'New', 's')]
+
+    jw.run(False)
+
+    updated_since = jira.get_issues.call_args[1]['updated_since']
+    assert updated_since == last_run - jw.HIGH_WATER_MARK_OVERLAP
+    diffs = act.call_args[0][2]
+    # PROJ-1 is not part of the updates and is not reported as deleted
+    assert diffs == ['https://jira/browse/PROJ-3 (s) created',
+                     'https://jira/browse/PROJ-2 (s) status change: '
+                     'New -> Done']
+    assert state['PROJ'] == {'PROJ-1': {'status': 'New', 'summary': 's'},
+                             'PROJ-2': {'status': 'Done', 'summary': 's'},
+                             'PROJ-3': {'status': 'New', 'summary': 's'}}
+    mark = state[jw.high_water_mark_key('PROJ')]
+    assert mark['updated_since'] > last_run
+    assert mark['full_sync_at'] == last_run
+
+
+def test_full_sync_detects_deleted_issues(env):
+    state, jira, act = env
+    last_sync = time.time() - jw.FULL_SYNC_INTERVAL - 1
+    state['PROJ'] = {'PROJ-1': {'status': 'New', 'summary': 's'},
+                     'PROJ-2': {'status': 'New', 'summary': 's'}}
+    state[jw.high_water_mark_key('PROJ')] = {'updated_since': time.time(),
+                                             'full_sync_at': last_sync}
+    jira.get_issues.return_value = [issue('PROJ-1', 'New', 's')]
+
+    jw.run(False)
+
+    assert jira.get_issues.call_args[1]['updated_since'] is None
+    assert act.call_args[0][2] == ['PROJ-2 (s) deleted']
+    assert state['PROJ'] == {'PROJ-1': {'status': 'New', 'summary': 's'}}
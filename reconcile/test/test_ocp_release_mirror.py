@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from reconcile import ocp_release_mirror
+from reconcile.ocp_release_mirror import OcpReleaseInfo, OcpReleaseMirror
+
+
+RELEASES = [
+    OcpReleaseInfo('quay.io/openshift-release-dev/ocp-release:4.8.1', 'r1'),
+    OcpReleaseInfo('quay.io/openshift-release-dev/ocp-release:4.8.2', 'r2'),
+]
+
+
+class FakeState(dict):
+    def get(self, key, *args):
+        return super().get(key, *args)
+
+
+@pytest.fixture
+def mirror(mocker):
+    mirror = OcpReleaseMirror.__new__(OcpReleaseMirror)
+    mirror.dry_run = False
+    mirror.state = FakeState()
+    mirror.thread_pool_size = 2
+    mirror.ledger_key = 'ledger/hive'
+    mirror.ocp_release_ecr_uri = 'ecr/ocp-release'
+    mirror.ocp_art_dev_ecr_uri = 'ecr/ocp-v4.0-art-dev'
+    mirror.quay_target_orgs = [{
+        'dest_ocp_release': 'quay.io/org/ocp-release',
+        'dest_ocp_art_dev': 'quay.io/org/ocp-v4.0-art-dev',
+    }]
+    mirror.registry_creds = {}
+    mocker.patch.object(mirror, '_get_ocp_releases', return_value=RELEASES)
+    mocker.patch.object(mirror, '_is_image_there', return_value=False)
+    mocker.patch.object(ocp_release_mirror, 'OC')
+    return mirror
+
+
+def test_mirrors_every_destination(mirror):
+    mirror.run()
+
+    oc = ocp_release_mirror.OC.return_value
+    assert sorted(c[1]['to_release']
+                  for c in oc.release_mirror.call_args_list) == [
+        'ecr/ocp-release:r1', 'ecr/ocp-release:r2',
+        'quay.io/org/ocp-release:r1', 'quay.io/org/ocp-release:r2',
+    ]
+    assert len(mirror.state['ledger/hive']) == 4
+
+
+def test_ledger_skips_completed_mirrors(mirror):
+    mirror.run()
+    mirror._is_image_there.reset_mock()
+    ocp_release_mirror.OC.reset_mock()
+
+    mirror.run()
+
+    mirror._is_image_there.assert_not_called()
+    ocp_release_mirror.OC.return_value.release_mirror.assert_not_called()
+
+
+def test_ledger_verified_after_interval(mirror):
+    expired = time.time() - ocp_release_mirror.LEDGER_VERIFY_INTERVAL - 1
+    mirror.state['ledger/hive'] = {
+        f'{RELEASES[0].ocp_release} -> ecr/ocp-release:r1': expired,
+        f'{RELEASES[0].ocp_release} -> quay.io/org/ocp-release:r1':
+            time.time(),
+        'quay.io/old-release -> ecr/ocp-release:old': time.time(),
+    }
+    mirror._is_image_there.return_value = True
+
+    mirror.run()
+
+    assert sorted(c[0][0] for c in mirror._is_image_there.call_args_list) \
+        == ['ecr/ocp-release:r1', 'ecr/ocp-release:r2',
+            'quay.io/org/ocp-release:r2']
+    ledger = mirror.state['ledger/hive']
+    assert len(ledger) == 4
+    assert 'quay.io/old-release -> ecr/ocp-release:old' not in ledger
+
+
+def test_failed_mirror_not_recorded(mirror):
+    oc = ocp_release_mirror.OC.return_value
+
+    def release_mirror(**kwargs):
+        if kwargs['to_release'] == 'ecr/ocp-release:r2':
+            raise Exception('mirror failed')
+    oc.release_mirror.side_effect = release_mirror
+
+    with pytest.raises(Exception, match='mirror failed'):
+        mirror.run()
+
+    assert oc.release_mirror.call_count == 4
+    assert len(mirror.state['ledger/hive']) == 3
+
+
+def test_dry_run_does_not_write_ledger(mirror):
+    mirror.dry_run = True
+
+    mirror.run()
+
+    assert 'ledger/hive' not in mirror.state
+    ocp_release_mirror.OC.return_value.release_mirror.assert_not_called()
@@ -42,6 +42,12 @@ class TestOpenshiftNamespaces(TestCase):
                 return ns.exists
         return False
 
+    def _get_all(self, cluster, kind):
+        """ Mock OC.get_all() listing the existing projects of a cluster """
+        return {'items': [{'metadata': {'name': ns.name}}
+                          for ns in self.test_ns
+                          if ns.cluster == cluster and ns.exists]}
+
     def _oc_map_get(self, cluster):
         """ Mock OCM_Map.get() to return a Mock object
         """
@@ -51,6 +57,8 @@ class TestOpenshiftNamespaces(TestCase):
             oc = self.oc_clients.setdefault(cluster,
                                             Mock(name=f'oc_{cluster}'))
             oc.project_exists.side_effect = self._project_exists
+            oc.get_all.side_effect = \
+                lambda kind: self._get_all(cluster, kind)
         else:
             oc = self.oc_clients[cluster]
         return oc
@@ -200,3 +208,31 @@ class TestOpenshiftNamespaces(TestCase):
         with self.assertRaises(SystemExit), contextlib.redirect_stderr(f):
             openshift_namespaces.run(False, thread_pool_size=1)
             self.assertIn("SomeError", f.getvalue())
+
+    def test_projects_listed_once_per_cluster(self):
+        self.test_ns = [
+            NS(c1, n1, delete=False, exists=True),
+            NS(c1, n2, delete=False, exists=False),
+            NS(c2, n1, delete=True, exists=True),
+        ]
+        openshift_namespaces.run(False, thread_pool_size=2)
+
+        for cluster in [c1, c2]:
+            oc = self.oc_clients[cluster]
+            oc.get_all.assert_called_once_with('Project.project.openshift.io')
+            oc.project_exists.assert_not_called()
+        self.oc_clients[c1].new_project.assert_called_once_with(n2)
+        self.oc_clients[c2].delete_project.assert_called_once_with(n1)
+
+    def test_projects_listing_error_falls_back(self):
+        oc = self._oc_map_get(c1)
+        oc.get_all.side_effect = StatusCodeError("Forbidden")
+
+        self.test_ns = [
+            NS(c1, n1, delete=False, exists=True),
+            NS(c1, n2, delete=False, exists=False),
+        ]
+        openshift_namespaces.run(False, thread_pool_size=1)
+
+        self.assertEqual(oc.project_exists.call_count, 2)
+        oc.new_project.assert_called_once_with(n2)
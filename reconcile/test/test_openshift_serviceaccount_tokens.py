@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+import reconcile.openshift_serviceaccount_tokens as osat
+from reconcile.utils.openshift_resource import ResourceInventory
+
+
+def namespace(cluster, name, tokens=None):
+    ns = {'name': name, 'cluster': {'name': cluster}}
+    if tokens:
+        ns['openshiftServiceAccountTokens'] = tokens
+    return ns
+
+
+def token(cluster, name, sa_name, resource_name=None):
+    sat = {'serviceAccountName': sa_name,
+           'namespace': namespace(cluster, name)}
+    if resource_name:
+        sat['name'] = resource_name
+    return sat
+
+
+def init_ri(namespaces):
+    ri = ResourceInventory()
+    for ns in namespaces:
+        ri.initialize_resource_type(ns['cluster']['name'], ns['name'],
+                                    'Secret')
+    return ri
+
+
+def test_fetch_desired_state_deduplicates_tokens():
+    shared = token('source', 'source-ns', 'sa')
+    namespaces = [
+        namespace('c1', 'ns1', [shared]),
+        namespace('c2', 'ns2', [shared, token('source', 'source-ns', 'sa',
+                                              resource_name='renamed')]),
+        namespace('c3', 'ns3', [token('other', 'other-ns', 'sa')]),
+    ]
+    ocs = {name: MagicMock() for name in ['c1', 'c2', 'c3', 'source',
+                                          'other']}
+    for name, oc in ocs.items():
+        oc.sa_get_token.return_value = name.encode()
+    oc_map = MagicMock()
+    oc_map.get.side_effect = ocs.get
+    ri = init_ri(namespaces)
+
+    osat.fetch_desired_state(namespaces, ri, oc_map, thread_pool_size=4)
+
+    ocs['source'].sa_get_token.assert_called_once_with('source-ns', 'sa')
+    ocs['other'].sa_get_token.assert_called_once_with('other-ns', 'sa')
+    desired = {(cluster, ns, name): d_item.body['data']['token']
+               for cluster, ns, _, data in ri
+               for name, d_item in data['desired'].items()}
+    assert desired == {
+        ('c1', 'ns1', 'source-source-ns-sa'): 'c291cmNl',
+        ('c2', 'ns2', 'source-source-ns-sa'): 'c291cmNl',
+        ('c2', 'ns2', 'renamed'): 'c291cmNl',
+        ('c3', 'ns3', 'other-other-ns-sa'): 'b3RoZXI=',
+    }
@@ -269,3 +269,17 @@ class TestOpenshiftTektonResources():
         with pytest.raises(otr.OpenshiftTektonResourcesNameTooLongError,
                            match=msg):
             otr.fetch_desired_resources(otr.fetch_tkn_providers(None))
+
+    def test_templates_fetched_once(self) -> None:
+        self.test_data.saas_files = [self.saas1, self.saas2, self.saas2_wr]
+        self.test_data.providers = [self.provider1, self.provider2_wr]
+
+        desired_resources = otr.fetch_desired_resources(
+            otr.fetch_tkn_providers(None))
+
+        paths = [c[0][0] for c in
+                 self.gql.return_value.get_resource.call_args_list]
+        assert len(paths) == len(set(paths))
+        # rendered objects are not shared between the desired resources
+        bodies = [dr['value'].body for dr in desired_resources]
+        assert len({id(b) for b in bodies}) == len(bodies)
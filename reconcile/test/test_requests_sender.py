@@ -39,6 +39,8 @@ class TestRunInteg(TestCase):
         self.get_credentials_requests_patcher = patch.object(
             queries, 'get_credentials_requests', autospec=True)
         self.state_patcher = patch.object(integ, 'State', autospec=True)
+        self.keyring_patcher = patch.object(integ, 'GpgKeyring',
+                                            autospec=True)
 
         self.do_exit = self.exit_patcher.start()
         self.get_encrypted_credentials = \
@@ -51,6 +53,7 @@ class TestRunInteg(TestCase):
         self.get_credentials_requests.return_value = self.requests
         self.get_encrypted_credentials.return_value = 'anencryptedcred'
         self.state = self.state_patcher.start()
+        self.keyring = self.keyring_patcher.start()
         self.settings = {
             'smtp': {
                 'secret_path': 'asecretpath',
@@ -74,6 +77,7 @@ class TestRunInteg(TestCase):
                 self.get_credentials_requests_patcher,
                 self.get_aws_accounts_patcher,
                 self.state_patcher,
+                self.keyring_patcher,
         ):
             p.stop()
 
@@ -86,8 +90,10 @@ class TestRunInteg(TestCase):
         self.get_encrypted_credentials.assert_called_once_with(
             'credentials_name',
             self.user,
-            self.settings
+            self.settings,
+            keyring=self.keyring.return_value
         )
+        self.keyring.return_value.cleanup.assert_called_once()
         calls = self.smtpclient.return_value.send_mail.call_args_list
         self.assertEqual(len(calls), 1)
         # I don't care too much about the body of the email, TBH
@@ -1,4 +1,7 @@
+import os
+import tempfile
 from unittest import TestCase
+from unittest.mock import patch
 import reconcile.utils.terrascript_client as tsclient
 
 
@@ -32,3 +35,21 @@ class TestSupportFunctions(TestCase):
             'aws_username': result
         }
         self.assertEqual(ts._get_aws_username(user), result)
+
+    def test_working_dir_per_integration(self):
+        with tempfile.TemporaryDirectory() as root, \
+                patch.object(tsclient, 'TF_WORKING_DIRS_ROOT', root):
+            ts = tsclient.TerrascriptClient('terraform_resources', '', 1, [])
+            self.assertEqual(
+                ts.get_working_dir('a'),
+                os.path.join(root, 'terraform_resources', 'a'))
+
+    def test_working_dir_namespace(self):
+        with tempfile.TemporaryDirectory() as root, \
+                patch.object(tsclient, 'TF_WORKING_DIRS_ROOT', root):
+            ts = tsclient.TerrascriptClient(
+                'terraform_resources', '', 1, [],
+                working_dir_namespace='aws-iam-keys')
+            wd = ts.get_working_dir('a')
+            self.assertEqual(wd, os.path.join(root, 'aws-iam-keys', 'a'))
+            self.assertTrue(os.path.isdir(wd))
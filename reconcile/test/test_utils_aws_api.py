@@ -0,0 +1,212 @@
+import threading
+from datetime import datetime, timedelta
+
+import boto3
+import botocore
+import pytest
+from dateutil.tz import tzutc
+from moto import mock_ec2, mock_ecr, mock_iam, mock_sts
+
+from reconcile.utils.aws_api import AWSApi, MissingARNError
+
+
+@pytest.fixture
+def accounts():
+    return [{'name': 'some-account'}]
+
+
+@pytest.fixture
+def aws_api(accounts, mocker, monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    mocker.patch.object(
+        AWSApi, 'get_tf_secrets',
+        side_effect=lambda a: (a['name'], {
+            'aws_access_key_id': 'testing',
+            'aws_secret_access_key': 'testing',
+            'region': 'us-east-1',
+        }))
+    with mock_ec2():
+        yield AWSApi(4, accounts, init_users=False)
+
+
+def create_vpc(region, cidr_block, tags):
+    ec2 = boto3.client('ec2', region_name=region)
+    vpc = ec2.create_vpc(CidrBlock=cidr_block)['Vpc']
+    ec2.create_tags(Resources=[vpc['VpcId']],
+                    Tags=[{'Key': k, 'Value': v} for k, v in tags.items()])
+    return vpc['VpcId']
+
+
+def test_get_vpcs_details_all_regions(aws_api, accounts):
+    east = create_vpc('us-east-1', '10.1.0.0/16', {'peer': 'yes'})
+    west = create_vpc('us-west-2', '10.2.0.0/16', {'peer': 'yes'})
+    create_vpc('us-west-2', '10.3.0.0/16', {'peer': 'no'})
+
+    vpcs = aws_api.get_vpcs_details(accounts[0], tags={'peer': 'yes'},
+                                    route_tables=True)
+
+    assert {(v['vpc_id'], v['region'], v['cidr_block']) for v in vpcs} == \
+        {(east, 'us-east-1', '10.1.0.0/16'),
+         (west, 'us-west-2', '10.2.0.0/16')}
+    assert all(v['route_table_ids'] for v in vpcs)
+
+
+@mock_ecr
+def test_get_ecr_repositories_in_region(aws_api, accounts):
+    boto3.client('ecr', region_name='us-east-1') \
+        .create_repository(repositoryName='east')
+    boto3.client('ecr', region_name='eu-west-1') \
+        .create_repository(repositoryName='west')
+
+    name = accounts[0]['name']
+    assert [r['repositoryName']
+            for r in aws_api.get_ecr_repositories(name)] == ['east']
+    assert [r['repositoryName']
+            for r in aws_api.get_ecr_repositories(name, 'eu-west-1')] == \
+        ['west']
+
+
+def test_get_vpcs_details_memoized(aws_api, accounts, mocker):
+    create_vpc('us-east-1', '10.1.0.0/16', {'peer': 'yes'})
+    spy = mocker.spy(aws_api, '_account_ec2_client')
+
+    first = aws_api.get_vpcs_details(accounts[0], tags={'peer': 'yes'})
+    calls = spy.call_count
+    second = aws_api.get_vpcs_details(accounts[0], tags={'peer': 'yes'})
+
+    assert first == second
+    assert spy.call_count == calls
+    # callers get their own copy of the memoized results
+    first[0]['vpc_id'] = 'changed'
+    assert aws_api.get_vpcs_details(accounts[0], tags={'peer': 'yes'}) == \
+        second
+
+
+def test_run_in_regions(aws_api):
+    results = aws_api.run_in_regions(lambda r, suffix: r + suffix,
+                                     ['a', 'b', 'c'], suffix='-1')
+
+    assert results == {'a': 'a-1', 'b': 'b-1', 'c': 'c-1'}
+
+
+ROLE_ARN = 'arn:aws:iam::123456789012:role/some-role'
+
+
+def test_assume_role_session_reused(aws_api, mocker):
+    with mock_sts():
+        spy = mocker.spy(aws_api, '_assume_role')
+        aws_api._get_assumed_role_client('some-account', ROLE_ARN,
+                                         'us-east-1', 'ec2')
+        aws_api._get_assumed_role_client('some-account', ROLE_ARN,
+                                         'us-east-1', 'elb')
+        aws_api._get_assume_role_session('some-account', ROLE_ARN,
+                                         'us-west-2')
+
+    # one session per (account, role, region)
+    assert spy.call_count == 2
+
+
+def test_assume_role_session_refreshed_before_expiry(aws_api, mocker):
+    with mock_sts():
+        spy = mocker.spy(aws_api, '_assume_role')
+        session = aws_api._get_assume_role_session('some-account', ROLE_ARN,
+                                                   'us-east-1')
+        credentials = session.get_credentials()
+
+        credentials.get_frozen_credentials()
+        assert spy.call_count == 1
+
+        # about to expire
+        credentials._expiry_time = \
+            datetime.now(tz=tzutc()) + timedelta(minutes=1)
+        credentials.get_frozen_credentials()
+        assert spy.call_count == 2
+        assert aws_api._get_assume_role_session(
+            'some-account', ROLE_ARN, 'us-east-1') is session
+
+
+def test_assume_role_sessions_created_concurrently(aws_api, mocker):
+    # both threads have to be assuming a role at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    expiry = (datetime.now(tz=tzutc()) + timedelta(hours=1)).isoformat()
+
+    def assume_role(account_name, assume_role):
+        barrier.wait()
+        return {'access_key': 'a', 'secret_key': 's', 'token': 't',
+                'expiry_time': expiry}
+
+    mocker.patch.object(aws_api, '_assume_role', side_effect=assume_role)
+    errors = []
+
+    def get_session(region):
+        try:
+            aws_api._get_assume_role_session('some-account', ROLE_ARN,
+                                             region)
+        except threading.BrokenBarrierError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=get_session, args=(region,))
+               for region in ['us-east-1', 'us-west-2']]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+
+
+def test_assume_role_missing_arn(aws_api):
+    with pytest.raises(MissingARNError):
+        aws_api._get_assume_role_session('some-account', None, 'us-east-1')
+
+
+@mock_iam
+def test_delete_keys_looks_up_owners(aws_api, accounts, mocker):
+    iam = boto3.client('iam')
+    iam.create_user(UserName='manual')
+    manual_key = iam.create_access_key(UserName='manual')
+    iam.create_user(UserName='tf-user',
+                    Tags=[{'Key': 'managed_by_integration',
+                           'Value': 'terraform_users'}])
+    user_key = iam.create_access_key(UserName='tf-user')
+    iam.create_user(UserName='other')
+    iam.create_access_key(UserName='other')
+    spy = mocker.spy(aws_api, 'get_user_keys')
+
+    keys_to_delete = {accounts[0]['name']: [
+        manual_key['AccessKey']['AccessKeyId'],
+        user_key['AccessKey']['AccessKeyId'],
+        'AKIAMISSINGKEY000000',
+    ]}
+    error = aws_api.delete_keys(False, keys_to_delete, {}, False)
+
+    assert not error
+    assert sorted(c[0][1] for c in spy.call_args_list) == \
+        ['manual', 'tf-user']
+    manual_keys = iam.list_access_keys(UserName='manual')
+    assert manual_keys['AccessKeyMetadata'][0]['Status'] == 'Inactive'
+    assert not iam.list_access_keys(UserName='tf-user')['AccessKeyMetadata']
+    assert len(iam.list_access_keys(UserName='other')['AccessKeyMetadata']) \
+        == 1
+
+
+def client_error(code):
+    return botocore.exceptions.ClientError(
+        {'Error': {'Code': code, 'Message': code}}, 'GetAccessKeyLastUsed')
+
+
+@pytest.mark.parametrize('code', ['NoSuchEntity', 'AccessDenied'])
+def test_get_access_key_owner_unknown_key(mocker, code):
+    iam = mocker.Mock()
+    iam.get_access_key_last_used.side_effect = client_error(code)
+
+    assert AWSApi.get_access_key_owner(iam, 'AKIAOTHERACCOUNTKEY0') is None
+
+
+def test_get_access_key_owner_error(mocker):
+    iam = mocker.Mock()
+    iam.get_access_key_last_used.side_effect = client_error('Throttling')
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        AWSApi.get_access_key_owner(iam, 'AKIASOMEKEY000000000')
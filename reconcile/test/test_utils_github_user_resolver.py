@@ -0,0 +1,120 @@
+import json
+import time
+
+import pytest
+import responses
+
+from reconcile.utils import github_user_resolver
+from reconcile.utils.github_user_resolver import GithubUserResolver
+
+
+URL = 'https://api.github.com/graphql'
+COMPANIES = {'alice': 'Red Hat', 'bob': None, 'Carol': 'ACME'}
+
+
+def graphql_callback(request):
+    variables = json.loads(request.body)['variables']
+    data = {}
+    errors = []
+    for var, login in variables.items():
+        if login.lower() in {k.lower() for k in COMPANIES}:
+            real = next(k for k in COMPANIES if k.lower() == login.lower())
+            data[var] = {'login': real, 'company': COMPANIES[real]}
+        else:
+            data[var] = None
+            errors.append({'type': 'NOT_FOUND', 'path': [var]})
+    return 200, {}, json.dumps({'data': data, 'errors': errors})
+
+
+@pytest.fixture
+def github():
+    with responses.RequestsMock() as rsps:
+        rsps.add_callback(responses.POST, URL, callback=graphql_callback)
+        yield rsps
+
+
+class FakeState(dict):
+    def get(self, key, *args):
+        return super().get(key, *args)
+
+
+def test_graphql_url():
+    assert github_user_resolver.graphql_url('https://api.github.com') == \
+        URL
+    assert github_user_resolver.graphql_url(
+        'https://github.example.com/api/v3/') == \
+        'https://github.example.com/api/graphql'
+
+
+def test_get_users(github):
+    resolver = GithubUserResolver('token')
+
+    users = resolver.get_users(['alice', 'bob', 'carol', 'dave'])
+
+    assert users == {
+        'alice': {'login': 'alice', 'company': 'Red Hat'},
+        'bob': {'login': 'bob', 'company': None},
+        'carol': {'login': 'Carol', 'company': 'ACME'},
+        'dave': None,
+    }
+    assert len(github.calls) == 1
+    assert github.calls[0].request.headers['Authorization'] == \
+        'bearer token'
+
+
+def test_get_users_batches(github, mocker):
+    mocker.patch.object(github_user_resolver, 'BATCH_SIZE', 2)
+    resolver = GithubUserResolver('token')
+
+    users = resolver.get_users(['alice', 'bob', 'Carol'], thread_pool_size=2)
+
+    assert all(users.values())
+    assert len(github.calls) == 2
+
+
+def test_get_users_cached_per_run(github):
+    resolver = GithubUserResolver('token')
+    resolver.get_users(['alice', 'bob'])
+
+    users = resolver.get_users(['bob', 'Carol'])
+
+    assert users['bob'] == {'login': 'bob', 'company': None}
+    assert len(github.calls) == 2
+    assert json.loads(github.calls[1].request.body)['variables'] == \
+        {'u0': 'Carol'}
+
+
+def test_get_users_cached_across_runs(github):
+    state = FakeState()
+    GithubUserResolver('token', state=state, ttl=60).get_users(['alice'])
+    assert 'alice' in state[github_user_resolver.STATE_KEY]
+
+    resolver = GithubUserResolver('token', state=state, ttl=60)
+    users = resolver.get_users(['alice'])
+
+    assert users['alice']['company'] == 'Red Hat'
+    assert len(github.calls) == 1
+
+
+def test_get_users_state_expired(github):
+    state = FakeState()
+    state[github_user_resolver.STATE_KEY] = {
+        'alice': {'user': {'login': 'alice', 'company': 'Old'},
+                  'fetched_at': time.time() - 120}
+    }
+    resolver = GithubUserResolver('token', state=state, ttl=60)
+
+    users = resolver.get_users(['alice'])
+
+    assert users['alice']['company'] == 'Red Hat'
+    assert len(github.calls) == 1
+
+
+def test_get_users_error(mocker):
+    mocker.patch('time.sleep')
+    resolver = GithubUserResolver('token')
+    with responses.RequestsMock() as rsps:
+        rsps.add(responses.POST, URL,
+                 json={'errors': [{'type': 'RATE_LIMITED'}]})
+        with pytest.raises(github_user_resolver.GithubUserResolverError):
+            resolver.get_users(['alice'])
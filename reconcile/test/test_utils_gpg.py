@@ -1,7 +1,7 @@
 import os
 import sys
 from unittest import TestCase, skipIf
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from reconcile.utils import gpg
 
@@ -71,13 +71,51 @@ class TestGpgKeyValid(TestCase):
         self.assertEqual(str(e.exception), gpg.ERR_BASE64)
 
 
+class TestGpgKeyValidCache(TestCase):
+    def setUp(self):
+        gpg._validated_keys.clear()
+
+    def tearDown(self):
+        gpg._validated_keys.clear()
+
+    @patch.object(gpg, '_gpg_key_valid')
+    def test_gpg_key_valid_cached(self, validate):
+        gpg.gpg_key_valid('akey')
+        gpg.gpg_key_valid('akey')
+        gpg.gpg_key_valid('anotherkey')
+
+        self.assertEqual(validate.call_count, 2)
+
+    @patch.object(gpg, '_gpg_key_valid')
+    def test_gpg_key_invalid_cached(self, validate):
+        validate.side_effect = ValueError(gpg.ERR_ENTRIES)
+        for _ in range(2):
+            with self.assertRaises(ValueError) as e:
+                gpg.gpg_key_valid('akey')
+            self.assertEqual(str(e.exception), gpg.ERR_ENTRIES)
+
+        validate.assert_called_once()
+
+    @patch.object(gpg, '_gpg_key_valid')
+    def test_gpg_failure_not_cached(self, validate):
+        validate.side_effect = [ValueError((b'gpg: out of memory', None)),
+                                None]
+        with self.assertRaises(ValueError):
+            gpg.gpg_key_valid('akey')
+        gpg.gpg_key_valid('akey')
+
+        self.assertEqual(validate.call_count, 2)
+
+
 # We have to mangle the namespace of the gpg module, since it imports
 # Popen. Had that module chosen "import subprocess;
 # subprocess.Popen(...)" we'd be patching subprocess instead.
 class TestGpgEncrypt(TestCase):
     @patch.object(gpg, 'run')
     def test_gpg_encrypt_all_ok(self, popen):
-        popen.return_value.stdout = b"<stdout>"
+        imported = MagicMock(stdout=b"[GNUPG:] IMPORT_OK 1 0123456789ABCDEF")
+        encrypted = MagicMock(stdout=b"<stdout>")
+        popen.side_effect = [imported, encrypted]
 
         self.assertEqual(gpg.gpg_encrypt('acontent', 'akey'),
                          '<stdout>')
@@ -89,3 +127,38 @@ class TestGpgEncrypt(TestCase):
         self.assertTrue(
             gpg.gpg_encrypt("a message", VALID_KEY)
         )
+
+
+class TestGpgKeyring(TestCase):
+    @patch.object(gpg, 'run')
+    def test_import_key_once(self, run):
+        run.return_value.stdout = \
+            b"gpg: key ABCD: public key imported\n" \
+            b"[GNUPG:] IMPORT_OK 1 0123456789ABCDEF\n"
+        keyring = gpg.GpgKeyring()
+
+        keyring.encrypt('a', 'akey')
+        keyring.encrypt('b', 'akey')
+
+        # one import and two encryptions
+        self.assertEqual(run.call_count, 3)
+        self.assertEqual(run.call_args[0][0][-1], '0123456789ABCDEF')
+        keyring.cleanup()
+
+    @patch.object(gpg, 'run')
+    def test_import_key_without_fingerprint(self, run):
+        run.return_value.stdout = \
+            b"gpg: key ABCD: public key \"a <a@example.com>\" imported\n"
+
+        with gpg.GpgKeyring() as keyring:
+            with self.assertRaises(ValueError) as e:
+                keyring.encrypt('a', 'akey')
+
+        self.assertEqual(e.exception.args[0], gpg.ERR_FINGERPRINT)
+        # nothing is encrypted to a guessed recipient
+        run.assert_called_once()
+
+    def test_keyring_removed_on_exit(self):
+        with gpg.GpgKeyring() as keyring:
+            self.assertTrue(os.path.isdir(keyring.home_dir))
+        self.assertFalse(os.path.exists(keyring.home_dir))
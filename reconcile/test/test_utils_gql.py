@@ -0,0 +1,64 @@
+import json
+from urllib.parse import urlparse
+
+import pytest
+import responses
+
+from reconcile.utils import gql
+
+
+URL = 'http://qontract-server/graphql'
+QUERY = '{ clusters_v1 { name } }'
+
+
+@pytest.fixture
+def gqlapi():
+    return gql.GqlApi(URL, token='Basic secret')
+
+
+@responses.activate
+def test_query(gqlapi):
+    responses.add(responses.POST, URL,
+                  json={'data': {'clusters_v1': [{'name': 'c1'}]}})
+
+    result = gqlapi.query(QUERY, {'var': 'value'})
+
+    assert result == {'clusters_v1': [{'name': 'c1'}]}
+    request = responses.calls[0].request
+    assert json.loads(request.body) == {'query': QUERY,
+                                        'variables': {'var': 'value'}}
+    assert request.headers['Authorization'] == 'Basic secret'
+    assert 'gzip' in request.headers['Accept-Encoding']
+
+
+def test_session_is_shared(gqlapi):
+    assert gqlapi.session is gql.get_session()
+    assert gql.GqlApi(URL).session is gqlapi.session
+
+
+@responses.activate
+def test_query_retries_server_errors(gqlapi, mocker):
+    mocker.patch('time.sleep')
+    responses.add(responses.POST, URL, status=502)
+    responses.add(responses.POST, URL, json={'data': {'ok': True}})
+
+    assert gqlapi.query(QUERY) == {'ok': True}
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_query_errors(gqlapi, mocker):
+    mocker.patch('time.sleep')
+    responses.add(responses.POST, URL, json={'errors': ['boom']})
+
+    with pytest.raises(gql.GqlApiError):
+        gqlapi.query(QUERY)
+    assert len(responses.calls) == 5
+
+
+@responses.activate
+def test_get_sha():
+    responses.add(responses.GET, 'http://qontract-server/sha256',
+                  body='abcdef')
+
+    assert gql.get_sha(urlparse(URL)) == 'abcdef'
@@ -0,0 +1,85 @@
+import re
+from unittest.mock import MagicMock
+
+import pytest
+
+from reconcile.utils import ldap_client
+
+
+EXISTING = {f'user{i}' for i in range(0, 250, 2)}
+SUCCESS = {'result': 0, 'description': 'success', 'message': ''}
+
+
+def entry(uid):
+    return {'type': 'searchResEntry', 'attributes': {'uid': [uid]}}
+
+
+def fake_search(base_dn, search_filter, attributes, paged_size,
+                paged_cookie):
+    uids = re.findall(r'\(uid=([^)]+)\)', search_filter)
+    found = sorted(u for u in uids if u in EXISTING)
+    start = int(paged_cookie or 0)
+    page = found[start:start + paged_size]
+    end = start + paged_size
+    cookie = str(end).encode() if end < len(found) else b''
+    result = dict(SUCCESS, controls={
+        ldap_client.PAGED_RESULTS_CONTROL: {'value': {'cookie': cookie}}})
+    response = [entry(u) for u in page] + \
+        [{'type': 'searchResRef', 'uri': ['ldap://other']}]
+    return True, result, response, None
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.search.side_effect = fake_search
+    return client
+
+
+def test_get_users_chunks(client, mocker):
+    mocker.patch.object(ldap_client, 'CHUNK_SIZE', 50)
+    uids = [f'user{i}' for i in range(250)]
+
+    users = ldap_client.get_users(uids, client=client, thread_pool_size=3)
+
+    assert users == EXISTING
+    assert client.search.call_count == 5
+    for call in client.search.call_args_list:
+        assert call[0][1].count('(uid=') <= 50
+
+
+def test_get_users_pages(client, mocker):
+    mocker.patch.object(ldap_client, 'PAGE_SIZE', 10)
+    uids = [f'user{i}' for i in range(50)]
+
+    users = ldap_client.get_users(uids, client=client)
+
+    assert users == {u for u in EXISTING if int(u[4:]) < 50}
+    assert client.search.call_count == 3
+
+
+def test_get_users_search_error(client):
+    client.search.side_effect = None
+    client.search.return_value = (
+        False,
+        {'result': 4, 'description': 'sizeLimitExceeded', 'message': ''},
+        [entry('user0')],
+        None)
+
+    with pytest.raises(ldap_client.LdapClientError,
+                       match='sizeLimitExceeded'):
+        ldap_client.get_users(['user0', 'user1'], client=client)
+
+
+def test_get_users_escapes_filter(client):
+    ldap_client.get_users(['user*'], client=client)
+
+    assert '(uid=user\\2a)' in client.search.call_args[0][1]
+
+
+def test_get_users_opens_connection(client, mocker):
+    init = mocker.patch.object(ldap_client, 'init_from_config')
+    init.return_value.__enter__.return_value = client
+
+    assert ldap_client.get_users(['user0', 'user1']) == {'user0'}
+    init.assert_called_once()
@@ -0,0 +1,43 @@
+from prometheus_client import REGISTRY
+
+from reconcile.utils import metrics
+
+
+def get_phase_count(phase):
+    labels = {
+        'integration': metrics.INTEGRATION_NAME,
+        'shards': str(metrics.SHARDS),
+        'shard_id': str(metrics.SHARD_ID),
+        'phase': phase,
+        'shard_key': 'None',
+    }
+    return REGISTRY.get_sample_value(
+        'qontract_reconcile_phase_duration_seconds_count', labels) or 0
+
+
+def test_phase_timer_context_manager():
+    before = get_phase_count('test_context')
+    with metrics.phase_timer('test_context'):
+        pass
+    assert get_phase_count('test_context') == before + 1
+
+
+def test_phase_timer_decorator():
+    @metrics.phase_timer('test_decorator')
+    def f(x):
+        return x * 2
+
+    before = get_phase_count('test_decorator')
+    assert f(2) == 4
+    assert f(3) == 6
+    assert get_phase_count('test_decorator') == before + 2
+
+
+def test_phase_timer_observes_on_error():
+    before = get_phase_count('test_error')
+    try:
+        with metrics.phase_timer('test_error'):
+            raise ValueError()
+    except ValueError:
+        pass
+    assert get_phase_count('test_error') == before + 1
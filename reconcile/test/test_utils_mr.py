@@ -80,3 +80,19 @@ class TestMergeRequestBaseProcessContractTests(TestCase):
         with self.assertRaises(MergeRequestProcessingError):
             mr.submit_to_gitlab(cli)
         cli.project.mergerequests.create.assert_not_called()
+
+    def test_cancellation_on_duplicate_mr_from_titles(self):
+        cli = build_gitlab_cli_mock()
+        mr = DummyMergeRequest()
+        mr.submit_to_gitlab(cli, open_mr_titles={mr.title})
+        self.assertTrue(mr.cancelled)
+        cli.mr_exists.assert_not_called()
+        cli.project.mergerequests.create.assert_not_called()
+
+    @staticmethod
+    def test_mr_opened_from_titles():
+        cli = build_gitlab_cli_mock()
+        mr = DummyMergeRequest()
+        mr.submit_to_gitlab(cli, open_mr_titles={'other title'})
+        cli.mr_exists.assert_not_called()
+        cli.project.mergerequests.create.assert_called()
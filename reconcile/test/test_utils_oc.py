@@ -1,3 +1,4 @@
+import logging
 import os
 from unittest import TestCase
 from unittest.mock import patch
@@ -640,3 +641,48 @@ class TestOCMapGetClusters(TestCase):
 
         oc_map = OC_Map(integration=calling_int, namespaces=[namespace])
         self.assertFalse(oc_map.get(cluster['name']))
+
+
+@patch.object(reconcile.utils.oc, 'OC', autospec=True)
+@patch.object(SecretReader, 'read', autospec=True)
+class TestOCMapLazy(TestCase):
+    @staticmethod
+    def cluster(name, **kwargs):
+        return {
+            'name': name,
+            'serverUrl': 'http://localhost',
+            'automationToken': {
+                'path': 'some-path',
+                'field': 'some-field'
+            },
+            **kwargs
+        }
+
+    def test_init_on_get(self, mock_secret_reader, mock_oc):
+        oc_map = OC_Map(clusters=[self.cluster('cl1'), self.cluster('cl2')],
+                        lazy=True)
+        mock_oc.assert_not_called()
+
+        self.assertIsInstance(oc_map.get('cl1'), OC)
+        self.assertEqual(mock_oc.call_count, 1)
+        self.assertIs(oc_map.get('cl1'), oc_map.get('cl1'))
+        # cl2 was never used
+        self.assertEqual(mock_oc.call_count, 1)
+
+    def test_errors_preserved(self, mock_secret_reader, mock_oc):
+        cluster = self.cluster('cl1')
+        del cluster['serverUrl']
+        oc_map = OC_Map(clusters=[cluster], lazy=True)
+
+        oc = oc_map.get('cl1')
+        self.assertIsInstance(oc, OCLogMsg)
+        self.assertEqual(oc.log_level, logging.ERROR)
+        self.assertEqual(oc.message, '[cl1] has no serverUrl')
+        self.assertEqual(oc_map.get('unknown').log_level, logging.DEBUG)
+
+    def test_clusters_inits_all(self, mock_secret_reader, mock_oc):
+        oc_map = OC_Map(clusters=[self.cluster('cl1'), self.cluster('cl2')],
+                        lazy=True)
+
+        self.assertEqual(sorted(oc_map.clusters()), ['cl1', 'cl2'])
+        self.assertEqual(mock_oc.call_count, 2)
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from reconcile.status import RunningState
+from reconcile.utils import profiling
+
+
+def work():
+    return sum(i * i for i in range(1000))
+
+
+@pytest.fixture
+def sha():
+    RunningState().sha = 'abcdef0123456789'
+    yield
+    RunningState().sha = None
+
+
+def test_profile_writes_files(tmp_path, sha):
+    with profiling.profile(str(tmp_path), 'some-integration'):
+        work()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len(files) == 2
+    assert files[0].startswith('some-integration-shard-0-of-1-abcdef012345-')
+    assert files[0].endswith('.json')
+    assert files[1].endswith('.prof')
+
+    with open(tmp_path / files[0]) as f:
+        summary = json.load(f)
+    assert summary['integration'] == 'some-integration'
+    assert summary['sha'] == 'abcdef0123456789'
+    assert summary['peak_traced_memory_bytes'] > 0
+
+
+def test_profile_written_on_exit(tmp_path):
+    with pytest.raises(SystemExit):
+        with profiling.profile(str(tmp_path), 'some-integration'):
+            raise SystemExit(1)
+
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_profile_disabled(tmp_path):
+    with profiling.profile(None, 'some-integration'):
+        work()
+    with profiling.profile(str(tmp_path), 'some-integration',
+                           sample_rate=0):
+        work()
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_profile_sampled(tmp_path, mocker):
+    mocker.patch.object(profiling.random, 'random', side_effect=[0.2, 0.7])
+    for _ in range(2):
+        with profiling.profile(str(tmp_path), 'some-integration',
+                               sample_rate=0.5):
+            work()
+
+    assert len(list(tmp_path.glob('*.prof'))) == 1
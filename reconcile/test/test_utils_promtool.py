@@ -0,0 +1,98 @@
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from reconcile.utils import promtool
+
+
+GOOD_SPEC = {'groups': [{'name': 'good', 'rules': []}]}
+BAD_SPEC = {'groups': [{'name': 'bad', 'rules': [{'expr': 'up =='}]}]}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    promtool._passed_hashes.clear()
+    yield
+    promtool._passed_hashes.clear()
+
+
+def fake_check_rules(cmd, **kwargs):
+    '''Emulates promtool check rules: fails files containing "bad"'''
+    output = ''
+    returncode = 0
+    for path in cmd[3:]:
+        output += f'Checking {path}\n'
+        with open(path) as f:
+            content = f.read()
+        if 'bad' in content:
+            output += '  FAILED:\n'
+            output += f'{path}: could not parse expression\n\n'
+            returncode = 1
+        else:
+            output += '  SUCCESS: 0 rules found\n\n'
+
+    return subprocess.CompletedProcess(cmd, returncode,
+                                       stdout=output.encode())
+
+
+@patch('reconcile.utils.promtool.subprocess.run')
+def test_check_rules_single_invocation(mock_run):
+    mock_run.side_effect = fake_check_rules
+    results = promtool.check_rules({'a': GOOD_SPEC, 'b': BAD_SPEC})
+
+    assert mock_run.call_count == 1
+    assert results['a']
+    assert not results['b']
+    assert 'could not parse expression' in results['b'].message
+
+
+@patch('reconcile.utils.promtool.subprocess.run')
+def test_check_rules_deduplicates_identical_specs(mock_run):
+    mock_run.side_effect = fake_check_rules
+    results = promtool.check_rules({i: dict(GOOD_SPEC) for i in range(3)})
+
+    assert all(results.values())
+    assert len(mock_run.call_args[0][0]) == 4
+
+
+@patch('reconcile.utils.promtool.subprocess.run')
+def test_check_rules_skips_passed_specs(mock_run):
+    mock_run.side_effect = fake_check_rules
+    promtool.check_rules({'a': GOOD_SPEC, 'b': BAD_SPEC})
+    results = promtool.check_rules({'a': GOOD_SPEC, 'b': BAD_SPEC})
+
+    assert results['a']
+    assert not results['b']
+    # second invocation only checks the previously failed spec
+    assert len(mock_run.call_args[0][0]) == 4
+
+
+@patch('reconcile.utils.promtool.BATCH_SIZE', 2)
+@patch('reconcile.utils.promtool.subprocess.run')
+def test_check_rules_batches(mock_run):
+    mock_run.side_effect = fake_check_rules
+    specs = {i: {'groups': [{'name': f'g{i}', 'rules': []}]}
+             for i in range(5)}
+    results = promtool.check_rules(specs)
+
+    assert mock_run.call_count == 3
+    assert all(results.values())
+
+
+@patch('reconcile.utils.promtool.subprocess.run')
+def test_check_rules_unattributed_failure(mock_run):
+    mock_run.return_value = subprocess.CompletedProcess(
+        [], 1, stdout=b'promtool: error: unknown flag')
+    results = promtool.check_rules({'a': GOOD_SPEC})
+
+    assert not results['a']
+    assert 'unknown flag' in results['a'].message
+
+
+def test_run_tests_missing_rule_file():
+    test = {'rule_files': ['/missing.yml']}
+    results = promtool.run_tests({'a': (test, {'/other.yml': GOOD_SPEC})})
+
+    assert not results['a']
+    assert '/missing.yml' in results['a'].message
@@ -1,4 +1,10 @@
+import json
+import os
+import tempfile
+import time
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
 import reconcile.utils.terraform_client as tfclient
 
 
@@ -107,3 +113,119 @@ class TestDeletionApproved(TestCase):
         )
         with self.assertRaises(tfclient.DeletionApprovalExpirationValueError):
             tf.deletion_approved('a1', 't1', 'n1')
+
+
+class TestPlanSkip(TestCase):
+
+    fingerprint = {
+        'config_hash': 'abc',
+        'provider_version': '3.22.0',
+        'state_lineage': 'lineage',
+        'state_serial': 10,
+    }
+
+    def tf_client(self, stored):
+        account = {
+            'name': 'a1',
+            'providerVersion': '3.22.0',
+        }
+        plan_state = {}
+        if stored is not None:
+            plan_state['plan-fingerprints/a1'] = stored
+        return tfclient.TerraformClient(
+            'integ',
+            'v1',
+            'integ_pfx',
+            [account],
+            {},
+            1,
+            plan_state=plan_state,
+            drift_detection_interval=3600
+        )
+
+    def test_no_stored_fingerprint(self):
+        tf = self.tf_client(None)
+        self.assertFalse(tf.is_plan_skippable('a1', self.fingerprint))
+
+    def test_matching_fingerprint(self):
+        tf = self.tf_client({'fingerprint': dict(self.fingerprint),
+                             'planned_at': time.time()})
+        self.assertTrue(tf.is_plan_skippable('a1', self.fingerprint))
+
+    def test_state_serial_changed(self):
+        stored = dict(self.fingerprint, state_serial=9)
+        tf = self.tf_client({'fingerprint': stored,
+                             'planned_at': time.time()})
+        self.assertFalse(tf.is_plan_skippable('a1', self.fingerprint))
+
+    def test_drift_detection_interval_elapsed(self):
+        tf = self.tf_client({'fingerprint': dict(self.fingerprint),
+                             'planned_at': time.time() - 3600})
+        self.assertFalse(tf.is_plan_skippable('a1', self.fingerprint))
+
+    def test_skipped_plan_is_not_applied(self):
+        tf = self.tf_client({'fingerprint': dict(self.fingerprint),
+                             'planned_at': time.time()})
+        tf.specs = [{'name': 'a1', 'tf': MagicMock(working_dir='/wd')}]
+        with patch.object(tf, 'get_plan_fingerprint',
+                          return_value=self.fingerprint), \
+                patch.object(tf, 'terraform_apply') as mock_apply:
+            disabled_deletions_detected, errors = tf.plan(False)
+            tf.apply()
+
+        self.assertFalse(disabled_deletions_detected)
+        self.assertFalse(errors)
+        self.assertEqual(tf.skipped_plans, {'a1'})
+        tf.specs[0]['tf'].plan.assert_not_called()
+        mock_apply.assert_not_called()
+
+    def test_fingerprint_saved_when_no_changes(self):
+        tf = self.tf_client(None)
+        tf.specs = [{'name': 'a1', 'tf': MagicMock(working_dir='/wd')}]
+        tf.specs[0]['tf'].plan.return_value = (0, '', '')
+        with patch.object(tf, 'get_plan_fingerprint',
+                          return_value=self.fingerprint), \
+                patch.object(tf, 'log_plan_diff',
+                             return_value=(False, [], [])):
+            tf.plan(False)
+
+        stored = tf.plan_state['plan-fingerprints/a1']
+        self.assertEqual(stored['fingerprint'], self.fingerprint)
+
+
+class TestTerraformInit(TestCase):
+
+    def setUp(self):
+        self.wd = tempfile.mkdtemp()
+        config = {
+            'terraform': {'backend': {'s3': {'bucket': 'b'}}},
+            'provider': {'aws': [{'version': '3.22.0'}]},
+            'resource': {},
+        }
+        with open(os.path.join(self.wd, 'config.tf.json'), 'w') as f:
+            f.write(json.dumps(config))
+        self.tf = tfclient.TerraformClient(
+            'integ', 'v1', 'integ_pfx', [], {}, 1)
+
+    def tearDown(self):
+        tfclient.cleanup_working_dirs({'wd': self.wd})
+
+    def test_init_once(self):
+        with patch.object(tfclient.Terraform, 'init',
+                          return_value=(0, '', '')) as mock_init:
+            self.tf.terraform_init({'name': 'a1', 'wd': self.wd})
+            self.tf.terraform_init({'name': 'a1', 'wd': self.wd})
+        self.assertEqual(mock_init.call_count, 1)
+
+    def test_init_on_provider_change(self):
+        with patch.object(tfclient.Terraform, 'init',
+                          return_value=(0, '', '')) as mock_init:
+            self.tf.terraform_init({'name': 'a1', 'wd': self.wd})
+            config_file = os.path.join(self.wd, 'config.tf.json')
+            with open(config_file) as f:
+                config = json.load(f)
+            config['provider']['aws'][0]['version'] = '3.60.0'
+            with open(config_file, 'w') as f:
+                f.write(json.dumps(config))
+            self.tf.terraform_init({'name': 'a1', 'wd': self.wd})
+        self.assertEqual(mock_init.call_count, 2)
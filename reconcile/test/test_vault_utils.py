@@ -42,3 +42,84 @@ class TestVaultUtils:
 
         with pytest.raises(SleepCalled):
             client._auto_refresh_client_auth()
+
+
+class TestVaultWriteMany:
+    @staticmethod
+    def client(current, kv_version=2):
+        """current: dictionary of the current secrets data indexed by path"""
+        client = testVaultClient()
+        client._client = MagicMock()
+        client._get_mount_version_by_secret_path = \
+            MagicMock(return_value=kv_version)
+
+        def read_v2(mount_point, path, version):
+            full_path = f'{mount_point}/{path}'
+            if full_path not in current:
+                raise vault.InvalidPath()
+            return {'data': {'data': current[full_path]}}
+
+        client._client.secrets.kv.v2.read_secret_version.side_effect = \
+            read_v2
+        client._client.read.side_effect = \
+            lambda path: {'data': current[path]} if path in current else None
+        # the v2 read cache is shared by all instances
+        vault._VaultClient._read_all_v2.cache_clear()
+        return client
+
+    def test_write_many_only_changed(self):
+        client = self.client({'kv/same': {'a': '1'}, 'kv/changed': {'a': '1'}})
+        results = client.write_many([
+            {'path': 'kv/same', 'data': {'a': '1'}},
+            {'path': 'kv/changed', 'data': {'a': '2'}},
+            {'path': 'kv/new', 'data': {'a': '3'}},
+        ], decode_base64=False)
+
+        assert results == {'kv/same': False, 'kv/changed': True,
+                           'kv/new': True}
+        written = {c[1]['path']: c[1]['secret'] for c in
+                   client._client.secrets.kv.v2.create_or_update_secret
+                   .call_args_list}
+        assert written == {'changed': {'a': '2'}, 'new': {'a': '3'}}
+
+    def test_write_many_v1(self):
+        client = self.client({'kv/same': {'a': '1'}}, kv_version=1)
+        results = client.write_many([
+            {'path': 'kv/same', 'data': {'a': '1'}},
+            {'path': 'kv/new', 'data': {'a': '2'}},
+        ], decode_base64=False)
+
+        assert results == {'kv/same': False, 'kv/new': True}
+        client._client.write.assert_called_once_with('kv/new', a='2')
+
+    def test_write_many_v1_read_forbidden(self):
+        client = self.client({}, kv_version=1)
+        client._client.read.side_effect = self.forbidden
+        results = client.write_many([
+            {'path': 'kv/write-only', 'data': {'a': '1'}},
+        ], decode_base64=False)
+
+        assert results == {'kv/write-only': True}
+        client._client.write.assert_called_once_with('kv/write-only', a='1')
+
+    @patch.object(time, 'sleep')
+    def test_write_many_reports_errors(self, sleep):
+        client = self.client({})
+        client._client.secrets.kv.v2.create_or_update_secret.side_effect = \
+            lambda mount_point, path, secret: \
+            self.forbidden() if path == 'denied' else None
+        secrets = [{'path': 'kv/denied', 'data': {'a': '1'}},
+                   {'path': 'kv/ok', 'data': {'a': '1'}}]
+
+        results = client.write_many(secrets, decode_base64=False,
+                                    raise_on_error=False)
+        assert isinstance(results['kv/denied'], vault.SecretAccessForbidden)
+        assert results['kv/ok'] is True
+
+        with pytest.raises(vault.SecretWriteError) as e:
+            client.write_many(secrets, decode_base64=False)
+        assert 'kv/denied' in str(e.value)
+
+    @staticmethod
+    def forbidden(*args):
+        raise vault.hvac.exceptions.Forbidden()
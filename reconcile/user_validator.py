@@ -2,14 +2,9 @@ import os
 import sys
 import logging
 
-from github.GithubException import GithubException
-from requests.exceptions import ReadTimeout
-from sretoolbox.utils import retry
-from sretoolbox.utils import threaded
-
 from reconcile import queries
 from reconcile.utils.gpg import gpg_key_valid
-from reconcile.github_users import init_github
+from reconcile.github_users import init_github_user_resolver
 
 GH_BASE_URL = os.environ.get('GITHUB_API', 'https://api.github.com')
 QONTRACT_INTEGRATION = 'user-validator'
@@ -50,18 +45,22 @@ def validate_users_gpg_key(users):
     return ok
 
 
-@retry(exceptions=(GithubException, ReadTimeout))
-def get_github_user(user, github):
-    gh_user = github.get_user(user['github_username'])
-    return user['org_username'], user['github_username'], gh_user.login
-
-
 def validate_users_github(users, thread_pool_size):
     ok = True
-    g = init_github()
-    results = threaded.run(get_github_user, users,
-                           thread_pool_size, github=g)
-    for org_username, gb_username, gh_login in results:
+    resolver = init_github_user_resolver(integration=QONTRACT_INTEGRATION)
+    gh_users = resolver.get_users([u['github_username'] for u in users],
+                                  thread_pool_size=thread_pool_size)
+    for user in users:
+        org_username = user['org_username']
+        gb_username = user['github_username']
+        gh_user = gh_users[gb_username]
+        if gh_user is None:
+            logging.error(
+                f"User {org_username} github_username {gb_username} "
+                "does not exist.")
+            ok = False
+            continue
+        gh_login = gh_user['login']
         if gb_username != gh_login:
             logging.error(
                 "Github username is case sensitive in OSD. "
@@ -1,3 +1,4 @@
+import copy
 import functools
 import json
 import logging
@@ -5,11 +6,13 @@ import os
 import time
 
 from datetime import datetime
-from threading import Lock
+from threading import Lock, RLock
 from typing import TYPE_CHECKING
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 from boto3 import Session
+from botocore.credentials import RefreshableCredentials
+from botocore.session import get_session as get_botocore_session
 from sretoolbox.utils import threaded
 import botocore
 
@@ -45,6 +48,12 @@ class AWSApi:
     def __init__(self, thread_pool_size, accounts, settings=None,
                  init_ecr_auth_tokens=False, init_users=True):
         self.thread_pool_size = thread_pool_size
+        # boto3 sessions are not thread safe, clients are
+        self._client_lock = RLock()
+        # assumed role sessions indexed by (account, role arn, region)
+        self._assume_role_sessions: Dict[Tuple[str, str, str], Session] = {}
+        self._assume_role_lock = Lock()
+        self._assume_role_key_locks: Dict[Tuple[str, str, str], Lock] = {}
         self.secret_reader = SecretReader(settings=settings)
         self.init_sessions_and_resources(accounts)
         if init_ecr_auth_tokens:
@@ -78,6 +87,12 @@ class AWSApi:
             self.get_transit_gateways)
         self.get_transit_gateway_vpc_attachments = functools.lru_cache()(
             self.get_transit_gateway_vpc_attachments)
+        self.get_regions = functools.lru_cache()(
+            self.get_regions)
+        self._get_region_vpcs_details = functools.lru_cache()(
+            self._get_region_vpcs_details)
+        self._get_tgws_details = functools.lru_cache()(
+            self._get_tgws_details)
 
     def init_sessions_and_resources(self, accounts: Iterable[Account]):
         results = threaded.run(self.get_tf_secrets, accounts,
@@ -104,7 +119,26 @@ class AWSApi:
                             region_name: Optional[str] = None) -> EC2Client:
         session = self.get_session(account_name)
         region = region_name if region_name else session.region_name
-        return session.client('ec2', region_name=region)
+        with self._client_lock:
+            return session.client('ec2', region_name=region)
+
+    # pylint: disable=method-hidden
+    def get_regions(self, account_name: str) -> List[str]:
+        ec2 = self._account_ec2_client(account_name)
+        return [r['RegionName'] for r in ec2.describe_regions()['Regions']]
+
+    def run_in_regions(self, func, regions: Iterable[str], **kwargs) \
+            -> Dict[str, Any]:
+        """
+        Calls func(region_name, **kwargs) for each region concurrently,
+        bounded by the thread pool size.
+
+        Returns a dictionary of the results indexed by region name.
+        """
+        regions = list(regions)
+        results = threaded.run(func, regions, self.thread_pool_size,
+                               **kwargs)
+        return dict(zip(regions, results))
 
     def get_tf_secrets(self, account):
         account_name = account['name']
@@ -251,6 +285,17 @@ class AWSApi:
                                          key='repositories')
             self.set_resouces(account, 'ecr', repositories)
 
+    def get_ecr_repositories(self, account_name: str,
+                             region_name: Optional[str] = None) \
+            -> List[Dict[str, Any]]:
+        session = self.get_session(account_name)
+        region = region_name if region_name else session.region_name
+        with self._client_lock:
+            client = session.client('ecr', region_name=region)
+        return self.paginate(client=client,
+                             method='describe_repositories',
+                             key='repositories')
+
     @staticmethod
     def paginate(client, method, key, params={}):
         """ paginate returns an aggregated list of the specified key
@@ -504,21 +549,20 @@ class AWSApi:
     def delete_keys(self, dry_run, keys_to_delete, working_dirs,
                     disable_service_account_keys):
         error = False
-        users_keys = self.get_users_keys()
-        for account, s in self.sessions.items():
+        for account, keys in keys_to_delete.items():
+            s = self.sessions.get(account)
+            if s is None:
+                continue
             iam = s.client('iam')
-            keys = keys_to_delete.get(account, [])
             for key in keys:
-                user_and_user_keys = [(user, user_keys) for user, user_keys
-                                      in users_keys[account].items()
-                                      if key in user_keys]
-                if not user_and_user_keys:
+                # only the owners of the keys to delete are looked up,
+                # instead of listing the keys of every user
+                user = self.get_access_key_owner(iam, key)
+                if user is None:
+                    continue
+                user_keys = self.get_user_keys(iam, user)
+                if key not in user_keys:
                     continue
-                # unpack single item from sequence
-                # since only a single user can have a given key
-                [user_and_user_keys] = user_and_user_keys
-                user = user_and_user_keys[0]
-                user_keys = user_and_user_keys[1]
                 key_type = self.determine_key_type(iam, user)
                 key_status = self.get_user_key_status(iam, user, key)
                 if key_type == 'unmanaged' and key_status == 'Active':
@@ -623,6 +667,22 @@ class AWSApi:
         key_list = iam.list_access_keys(UserName=user)['AccessKeyMetadata']
         return [uk['AccessKeyId'] for uk in key_list]
 
+    @staticmethod
+    def get_access_key_owner(iam, key):
+        try:
+            response = iam.get_access_key_last_used(AccessKeyId=key)
+        except botocore.exceptions.ClientError as e:
+            code = e.response['Error']['Code']
+            if code == 'NoSuchEntity':
+                return None
+            # keys that were already deleted or that belong
+            # to another account can not be looked up
+            if code == 'AccessDenied':
+                logging.warning(['get_access_key_owner', key, code])
+                return None
+            raise
+        return response.get('UserName')
+
     @staticmethod
     def get_user_key_status(iam, user, key):
         key_list = iam.list_access_keys(UserName=user)['AccessKeyMetadata']
@@ -700,15 +760,45 @@ class AWSApi:
         :param assume_role:   role to assume to get access
                               to the cluster's AWS account
         :param assume_region: region in which to operate
+
+        Sessions are cached per (account, role, region). Their credentials
+        are refreshed by botocore ahead of their expiration, so the cached
+        sessions and the clients created from them stay usable.
         """
-        session = self.get_session(account_name)
-        sts = session.client('sts')
         if not assume_role:
             raise MissingARNError(
                 f'Could not find Role ARN {assume_role} on account '
                 f'{account_name}. This is likely caused by a missing '
                 'awsInfrastructureAccess section.'
             )
+        key = (account_name, assume_role, assume_region)
+        # the global lock only guards the per key locks, so that
+        # roles of different accounts are assumed concurrently
+        with self._assume_role_lock:
+            key_lock = self._assume_role_key_locks.setdefault(key, Lock())
+        with key_lock:
+            assumed_session = self._assume_role_sessions.get(key)
+            if assumed_session is None:
+                refresh = functools.partial(self._assume_role,
+                                            account_name, assume_role)
+                credentials = RefreshableCredentials.create_from_metadata(
+                    metadata=refresh(),
+                    refresh_using=refresh,
+                    method='sts-assume-role',
+                )
+                botocore_session = get_botocore_session()
+                botocore_session._credentials = credentials
+                botocore_session.set_config_variable('region', assume_region)
+                assumed_session = Session(botocore_session=botocore_session)
+                self._assume_role_sessions[key] = assumed_session
+
+        return assumed_session
+
+    def _assume_role(self, account_name: str,
+                     assume_role: str) -> Dict[str, str]:
+        session = self.get_session(account_name)
+        with self._client_lock:
+            sts = session.client('sts')
         role_name = assume_role.split('/')[1]
         response = sts.assume_role(
             RoleArn=assume_role,
@@ -716,14 +806,12 @@ class AWSApi:
         )
         credentials = response['Credentials']
 
-        assumed_session = Session(
-            aws_access_key_id=credentials['AccessKeyId'],
-            aws_secret_access_key=credentials['SecretAccessKey'],
-            aws_session_token=credentials['SessionToken'],
-            region_name=assume_region
-        )
-
-        return assumed_session
+        return {
+            'access_key': credentials['AccessKeyId'],
+            'secret_key': credentials['SecretAccessKey'],
+            'token': credentials['SessionToken'],
+            'expiry_time': credentials['Expiration'].isoformat(),
+        }
 
     # pylint: disable=method-hidden
     def _get_assumed_role_client(self, account_name: str, assume_role: str,
@@ -732,7 +820,8 @@ class AWSApi:
         assumed_session = self._get_assume_role_session(account_name,
                                                         assume_role,
                                                         assume_region)
-        return assumed_session.client(client_type)
+        with self._client_lock:
+            return assumed_session.client(client_type)
 
     @staticmethod
     # pylint: disable=method-hidden
@@ -824,29 +913,46 @@ class AWSApi:
         return egress_ips
 
     def get_vpcs_details(self, account, tags=None, route_tables=False):
+        account_name = account['name']
+        regions = self.get_regions(account_name)
+        # results are memoized per (account, region, filter) and shared
+        # across calls, callers get their own copy
+        region_results = self.run_in_regions(
+            self._get_region_vpcs_details,
+            regions,
+            account_name=account_name,
+            tags=tuple(sorted((tags or {}).items())),
+            route_tables=bool(route_tables),
+        )
         results = []
-        ec2 = self._account_ec2_client(account['name'])
-        regions = [r['RegionName'] for r in ec2.describe_regions()['Regions']]
         for region_name in regions:
-            ec2 = self._account_ec2_client(account['name'], region_name)
-            vpcs = self.get_account_vpcs(ec2)
-            vpcs = self.filter_on_tags(vpcs, tags)
-            for vpc in vpcs:
-                vpc_id = vpc['VpcId']
-                cidr_block = vpc['CidrBlock']
-                route_table_ids = None
-                if route_tables:
-                    vpc_route_tables = self.get_vpc_route_tables(vpc_id, ec2)
-                    route_table_ids = [rt['RouteTableId']
-                                       for rt
-                                       in vpc_route_tables]
-                item = {
-                    'vpc_id': vpc_id,
-                    'region': region_name,
-                    'cidr_block': cidr_block,
-                    'route_table_ids': route_table_ids,
-                }
-                results.append(item)
+            results.extend(copy.deepcopy(region_results[region_name]))
+
+        return results
+
+    # pylint: disable=method-hidden
+    def _get_region_vpcs_details(self, region_name, account_name, tags,
+                                 route_tables):
+        results = []
+        ec2 = self._account_ec2_client(account_name, region_name)
+        vpcs = self.get_account_vpcs(ec2)
+        vpcs = self.filter_on_tags(vpcs, dict(tags))
+        for vpc in vpcs:
+            vpc_id = vpc['VpcId']
+            cidr_block = vpc['CidrBlock']
+            route_table_ids = None
+            if route_tables:
+                vpc_route_tables = self.get_vpc_route_tables(vpc_id, ec2)
+                route_table_ids = [rt['RouteTableId']
+                                   for rt
+                                   in vpc_route_tables]
+            item = {
+                'vpc_id': vpc_id,
+                'region': region_name,
+                'cidr_block': cidr_block,
+                'route_table_ids': route_table_ids,
+            }
+            results.append(item)
 
         return results
 
@@ -933,12 +1039,35 @@ class AWSApi:
     def get_tgws_details(self, account, region_name, routes_cidr_block,
                          tags=None, route_tables=False,
                          security_groups=False):
+        # the discovery is memoized per (account, region, filter), only
+        # the cidr block differs between the callers
+        tgws = self._get_tgws_details(
+            account['name'],
+            region_name,
+            tuple(sorted((tags or {}).items())),
+            bool(route_tables),
+            bool(security_groups),
+        )
+        results = []
+        for tgw in tgws:
+            item = copy.deepcopy(tgw)
+            for key in ['routes', 'rules']:
+                if key in item:
+                    item[key] = [{'cidr_block': routes_cidr_block, **i}
+                                 for i in item[key]]
+            results.append(item)
+
+        return results
+
+    # pylint: disable=method-hidden
+    def _get_tgws_details(self, account_name, region_name, tags,
+                          route_tables, security_groups):
         results = []
-        ec2 = self._account_ec2_client(account['name'], region_name)
+        ec2 = self._account_ec2_client(account_name, region_name)
         tgws = ec2.describe_transit_gateways(
             Filters=[
                 {'Name': f'tag:{k}', 'Values': [v]}
-                for k, v in tags.items()
+                for k, v in tags
             ]
         )
         for tgw in tgws.get('TransitGateways'):
@@ -969,6 +1098,7 @@ class AWSApi:
                              'Values': [tgw_id]}
                         ]
                     )
+                parties = []
                 for a in attachments.get('TransitGatewayPeeringAttachments'):
                     tgw_attachment_id = a['TransitGatewayAttachmentId']
                     tgw_attachment_state = a['State']
@@ -978,80 +1108,23 @@ class AWSApi:
                     attachment_parties = \
                         [a['RequesterTgwInfo'], a['AccepterTgwInfo']]
                     for party in attachment_parties:
-                        party_tgw_id = party['TransitGatewayId']
-                        party_region = party['Region']
-                        party_ec2 = self._account_ec2_client(account['name'],
-                                                             party_region)
-
-                        # the TGW route table is automatically populated
-                        # with the peered VPC cidr block.
-                        # however, to achieve global routing across peered
-                        # TGWs in different regions, we need to find all
-                        # peering attachments in different regions and collect
-                        # the data to later create a route in each peered TGW
-                        # in a different region. this will require getting:
-                        # - cluster cidr block
-                        # - transit gateway attachment id
-                        # - transit gateway route table id
-                        # we will also pass some additional information:
-                        # - transit gateway id
-                        # - transit gateway region
-                        if route_tables:
-                            # don't act on yourself and
-                            # routes are propogated within the same region
-                            if party_tgw_id != tgw_id and \
-                                    party_region != region_name:
-                                party_tgw_route_table_id = \
-                                    self.get_tgw_default_route_table_id(
-                                        party_ec2, party_tgw_id, tags)
-                                if party_tgw_route_table_id is not None:
-                                    # that's it, we have all
-                                    # the information we need
-                                    route_item = {
-                                        'cidr_block': routes_cidr_block,
-                                        'tgw_attachment_id':
-                                            tgw_attachment_id,
-                                        'tgw_id': party_tgw_id,
-                                        'tgw_route_table_id':
-                                            party_tgw_route_table_id,
-                                        'region': party_region
-                                    }
-                                    routes.append(route_item)
-
-                        # once all the routing is in place, we need to allow
-                        # connections in security groups.
-                        # in TGW, we need to allow the rules in the VPCs
-                        # associated to the TGWs that need to accept the
-                        # traffic. we need to collect data about the vpc
-                        # attachments for the TGWs, and for each VPC get
-                        # the details of it's default securiry group.
-                        # this will require getting:
-                        # - cluster cidr block
-                        # - security group id
-                        # we will also pass some additional information:
-                        # - vpc id
-                        # - vpc region
-                        if security_groups:
-                            vpc_attachments = \
-                                self.get_transit_gateway_vpc_attachments(
-                                    party_tgw_id, party_ec2)
-                            for va in vpc_attachments:
-                                vpc_attachment_vpc_id = va['VpcId']
-                                vpc_attachment_state = va['State']
-                                if vpc_attachment_state != 'available':
-                                    continue
-                                sg_id = self.get_vpc_default_sg_id(
-                                    vpc_attachment_vpc_id, party_ec2)
-                                if sg_id is not None:
-                                    # that's it, we have all
-                                    # the information we need
-                                    rule_item = {
-                                        'cidr_block': routes_cidr_block,
-                                        'security_group_id': sg_id,
-                                        'vpc_id': vpc_attachment_vpc_id,
-                                        'region': party_region
-                                    }
-                                    rules.append(rule_item)
+                        parties.append((tgw_attachment_id, party))
+
+                # parties are mostly located in other regions
+                parties_details = threaded.run(
+                    self._get_tgw_party_details,
+                    parties,
+                    self.thread_pool_size,
+                    account_name=account_name,
+                    tgw_id=tgw_id,
+                    region_name=region_name,
+                    tags=tags,
+                    route_tables=route_tables,
+                    security_groups=security_groups,
+                )
+                for party_routes, party_rules in parties_details:
+                    routes.extend(party_routes)
+                    rules.extend(party_rules)
 
                 if route_tables:
                     item['routes'] = routes
@@ -1062,6 +1135,88 @@ class AWSApi:
 
         return results
 
+    def _get_tgw_party_details(self, attachment_party, account_name, tgw_id,
+                               region_name, tags, route_tables,
+                               security_groups):
+        """
+        Returns the routes and the rules to provision for a party of
+        a peering attachment of a TGW. The cidr block is left out.
+        """
+        tgw_attachment_id, party = attachment_party
+        routes = []
+        rules = []
+        party_tgw_id = party['TransitGatewayId']
+        party_region = party['Region']
+        party_ec2 = self._account_ec2_client(account_name, party_region)
+
+        # the TGW route table is automatically populated
+        # with the peered VPC cidr block.
+        # however, to achieve global routing across peered
+        # TGWs in different regions, we need to find all
+        # peering attachments in different regions and collect
+        # the data to later create a route in each peered TGW
+        # in a different region. this will require getting:
+        # - cluster cidr block
+        # - transit gateway attachment id
+        # - transit gateway route table id
+        # we will also pass some additional information:
+        # - transit gateway id
+        # - transit gateway region
+        if route_tables:
+            # don't act on yourself and
+            # routes are propogated within the same region
+            if party_tgw_id != tgw_id and \
+                    party_region != region_name:
+                party_tgw_route_table_id = \
+                    self.get_tgw_default_route_table_id(
+                        party_ec2, party_tgw_id, dict(tags))
+                if party_tgw_route_table_id is not None:
+                    # that's it, we have all
+                    # the information we need
+                    route_item = {
+                        'tgw_attachment_id': tgw_attachment_id,
+                        'tgw_id': party_tgw_id,
+                        'tgw_route_table_id': party_tgw_route_table_id,
+                        'region': party_region
+                    }
+                    routes.append(route_item)
+
+        # once all the routing is in place, we need to allow
+        # connections in security groups.
+        # in TGW, we need to allow the rules in the VPCs
+        # associated to the TGWs that need to accept the
+        # traffic. we need to collect data about the vpc
+        # attachments for the TGWs, and for each VPC get
+        # the details of it's default securiry group.
+        # this will require getting:
+        # - cluster cidr block
+        # - security group id
+        # we will also pass some additional information:
+        # - vpc id
+        # - vpc region
+        if security_groups:
+            vpc_attachments = \
+                self.get_transit_gateway_vpc_attachments(
+                    party_tgw_id, party_ec2)
+            for va in vpc_attachments:
+                vpc_attachment_vpc_id = va['VpcId']
+                vpc_attachment_state = va['State']
+                if vpc_attachment_state != 'available':
+                    continue
+                sg_id = self.get_vpc_default_sg_id(
+                    vpc_attachment_vpc_id, party_ec2)
+                if sg_id is not None:
+                    # that's it, we have all
+                    # the information we need
+                    rule_item = {
+                        'security_group_id': sg_id,
+                        'vpc_id': vpc_attachment_vpc_id,
+                        'region': party_region
+                    }
+                    rules.append(rule_item)
+
+        return routes, rules
+
     def get_route53_zones(self):
         """
         Return a list of (str, dict) representing Route53 DNS zones per account
@@ -0,0 +1,116 @@
+import os
+import time
+
+import requests
+
+from sretoolbox.utils import retry
+from sretoolbox.utils import threaded
+
+
+GH_BASE_URL = os.environ.get('GITHUB_API', 'https://api.github.com')
+
+# number of users resolved by a single GraphQL query
+BATCH_SIZE = 100
+STATE_KEY = 'github-users'
+
+
+class GithubUserResolverError(Exception):
+    pass
+
+
+def graphql_url(base_url):
+    # GitHub Enterprise serves the REST API under /api/v3
+    # and the GraphQL API under /api/graphql
+    base_url = base_url.rstrip('/')
+    if base_url.endswith('/v3'):
+        base_url = base_url[:-len('/v3')]
+    return f'{base_url}/graphql'
+
+
+class GithubUserResolver:
+    """
+    Resolves GitHub users in batches through the GraphQL API.
+
+    Resolved users are cached for the lifetime of the resolver. If a state
+    is given, they are also cached across runs for ttl seconds, indexed by
+    the requested login.
+
+    :param token: GitHub token
+    :param state: optional State to keep the users in across runs
+    :param ttl: seconds a user is kept in the state
+    :type token: str
+    :type state: reconcile.utils.state.State
+    :type ttl: int
+    """
+
+    def __init__(self, token, state=None, ttl=0, base_url=GH_BASE_URL,
+                 timeout=30):
+        self.url = graphql_url(base_url)
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'Authorization': f'bearer {token}'})
+        self.state = state
+        self.ttl = ttl
+        self._users = {}
+        self._persisted = self.state.get(STATE_KEY, {}) \
+            if self.state is not None and self.ttl else {}
+
+    def get_users(self, logins, thread_pool_size=1):
+        """
+        Returns a dict of users indexed by the requested logins. Each user
+        is a dict with the `login` and `company` of the GitHub user,
+        or None if there is no such user.
+        """
+        logins = set(logins)
+        now = time.time()
+        for login in logins - self._users.keys():
+            cached = self._persisted.get(login)
+            if cached and now - cached['fetched_at'] < self.ttl:
+                self._users[login] = cached['user']
+
+        missing = sorted(logins - self._users.keys())
+        batches = [missing[i:i + BATCH_SIZE]
+                   for i in range(0, len(missing), BATCH_SIZE)]
+        results = threaded.run(self._get_batch, batches, thread_pool_size)
+        fetched = {}
+        for batch_users in results:
+            fetched.update(batch_users)
+        self._users.update(fetched)
+        self._persist(fetched, now)
+
+        return {login: self._users[login] for login in logins}
+
+    def _persist(self, users, now):
+        if self.state is None or not self.ttl or not users:
+            return
+        persisted = {login: cached
+                     for login, cached in self._persisted.items()
+                     if now - cached['fetched_at'] < self.ttl}
+        for login, user in users.items():
+            persisted[login] = {'user': user, 'fetched_at': now}
+        self.state[STATE_KEY] = persisted
+        self._persisted = persisted
+
+    @retry(exceptions=(requests.exceptions.RequestException,
+                       GithubUserResolverError))
+    def _get_batch(self, logins):
+        variables = {f'u{i}': login for i, login in enumerate(logins)}
+        params = ', '.join(f'${v}: String!' for v in variables)
+        fields = ' '.join(f'{v}: user(login: ${v}) {{ login company }}'
+                          for v in variables)
+        query = f'query({params}) {{ {fields} }}'
+
+        response = self.session.post(
+            self.url, json={'query': query, 'variables': variables},
+            timeout=self.timeout)
+        response.raise_for_status()
+        result = response.json()
+
+        # users that do not exist are returned as null
+        # and reported as NOT_FOUND errors
+        errors = [e for e in result.get('errors', [])
+                  if e.get('type') != 'NOT_FOUND']
+        if errors or 'data' not in result:
+            raise GithubUserResolverError(errors or result)
+
+        return {login: result['data'][v] for v, login in variables.items()}
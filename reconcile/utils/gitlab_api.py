@@ -141,6 +141,12 @@ class GitLabApi:
 
         return False
 
+    def get_open_mr_titles(self):
+        """Returns the titles of all open MRs, to check many MRs for
+        existence with a single listing (see mr_exists)."""
+        mrs = self.get_merge_requests(state=MRState.OPENED)
+        return {mr.attributes.get('title') for mr in mrs}
+
     @retry()
     def get_project_maintainers(self, repo_url=None):
         if repo_url is None:
@@ -1,5 +1,8 @@
 import base64
+import hashlib
+import shutil
 import tempfile
+import threading
 import re
 
 from subprocess import PIPE, Popen, STDOUT, run
@@ -8,9 +11,42 @@ ERR_SPACES = 'key has spaces in it'
 ERR_EQUAL_SIGNS = 'equal signs should only appear at the end of the key'
 ERR_BASE64 = 'could not perform base64 decode of key'
 ERR_ENTRIES = 'key must contain both pub and sub entries'
+ERR_FINGERPRINT = 'could not find the fingerprint of the imported key'
+
+# errors that only depend on the content of the key
+CONTENT_ERRORS = [ERR_SPACES, ERR_EQUAL_SIGNS, ERR_BASE64, ERR_ENTRIES]
+
+# validation results indexed by the hash of the key. keys are immutable
+# for a given content, so each of them is validated once per process.
+_validated_keys = {}
+_validated_keys_lock = threading.Lock()
+
+
+def _key_hash(public_gpg_key):
+    return hashlib.sha256(public_gpg_key.encode()).hexdigest()
 
 
 def gpg_key_valid(public_gpg_key):
+    key_hash = _key_hash(public_gpg_key)
+    with _validated_keys_lock:
+        error = _validated_keys.get(key_hash, False)
+    if error is False:
+        try:
+            _gpg_key_valid(public_gpg_key)
+            error = None
+        except ValueError as e:
+            # failures of gpg itself may be transient and are not cached
+            if e.args[0] not in CONTENT_ERRORS:
+                raise
+            error = e.args
+        with _validated_keys_lock:
+            _validated_keys[key_hash] = error
+
+    if error is not None:
+        raise ValueError(*error)
+
+
+def _gpg_key_valid(public_gpg_key):
     stripped_public_gpg_key = public_gpg_key.rstrip()
     if ' ' in stripped_public_gpg_key:
         raise ValueError(ERR_SPACES)
@@ -42,27 +78,70 @@ def gpg_key_valid(public_gpg_key):
         raise ValueError(ERR_ENTRIES)
 
 
-def gpg_encrypt(content, public_gpg_key):
-    public_gpg_key_dec = base64.b64decode(public_gpg_key)
+class GpgKeyring:
+    """
+    A temporary keyring to encrypt content for many public keys.
 
-    with tempfile.TemporaryDirectory() as gnupg_home_dir:
-        # import public gpg key
-        proc = run(['gpg', '--homedir', gnupg_home_dir,
-                    '--import'],
+    Each key is imported once and its recipients are then referenced
+    by fingerprint. A keyring is meant to live for an integration run,
+    and is removed by cleanup() or when leaving its context:
+
+        with GpgKeyring() as keyring:
+            gpg_encrypt(content, public_gpg_key, keyring=keyring)
+    """
+
+    def __init__(self):
+        self.home_dir = tempfile.mkdtemp()
+        self._recipients = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+    def cleanup(self):
+        shutil.rmtree(self.home_dir, ignore_errors=True)
+
+    def import_key(self, public_gpg_key):
+        """imports a key, if not imported yet, and returns its recipient"""
+        key_hash = _key_hash(public_gpg_key)
+        with self._lock:
+            if key_hash not in self._recipients:
+                self._recipients[key_hash] = self._import_key(public_gpg_key)
+            return self._recipients[key_hash]
+
+    def _import_key(self, public_gpg_key):
+        public_gpg_key_dec = base64.b64decode(public_gpg_key)
+        proc = run(['gpg', '--homedir', self.home_dir,
+                    '--status-fd', '1', '--import'],
                    stdout=PIPE,
                    stderr=STDOUT,
                    input=public_gpg_key_dec,
                    check=True)
         out = proc.stdout.decode('utf-8')
-        match = re.search(r'<\S+>', out)
-        recipient = match.group(0)[1:-1]
-        # encrypt content
-        proc = run(['gpg', '--homedir', gnupg_home_dir,
+        match = re.search(r'^\[GNUPG:\] IMPORT_OK \d+ (\w+)$', out, re.M)
+        if not match:
+            # the email of the key's user id is not a safe recipient,
+            # it may be shared by other keys of the keyring
+            raise ValueError(ERR_FINGERPRINT, out)
+        return match.group(1)
+
+    def encrypt(self, content, public_gpg_key):
+        recipient = self.import_key(public_gpg_key)
+        proc = run(['gpg', '--homedir', self.home_dir,
                     '--trust-model', 'always',
                     '--encrypt', '--armor', '-r', recipient],
                    input=content.encode(),
                    stdout=PIPE,
                    stderr=STDOUT,
                    check=True)
-        out = proc.stdout
-    return out.decode('utf-8')
+        return proc.stdout.decode('utf-8')
+
+
+def gpg_encrypt(content, public_gpg_key, keyring=None):
+    if keyring is None:
+        with GpgKeyring() as keyring:
+            return keyring.encrypt(content, public_gpg_key)
+    return keyring.encrypt(content, public_gpg_key)
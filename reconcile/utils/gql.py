@@ -1,23 +1,30 @@
-import contextlib
-import json
 import logging
 import os
 import textwrap
+import threading
 from typing import Set, Any
 
 from urllib.parse import urlparse
 
 import requests
 
+from requests.adapters import HTTPAdapter
 from sretoolbox.utils import retry
-from graphqlclient import GraphQLClient
 from sentry_sdk import capture_exception
 
 from reconcile.utils.config import get_config
+from reconcile.utils.metrics import phase_timer
 from reconcile.status import RunningState
 
 
 _gqlapi = None
+_session = None
+_session_lock = threading.Lock()
+
+# (connect, read) timeouts in seconds. The read timeout is generous since
+# some queries return documents of several megabytes.
+GQL_TIMEOUT = (float(os.environ.get('GQL_CONNECT_TIMEOUT', 10)),
+               float(os.environ.get('GQL_READ_TIMEOUT', 300)))
 
 
 INTEGRATIONS_QUERY = """
@@ -44,6 +51,28 @@ def capture_and_forget(error):
         pass
 
 
+def get_session():
+    """returns the HTTP session shared by all qontract-server requests
+
+    The session keeps connections alive between requests and is safe to
+    use from many threads. Responses are requested gzip compressed.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # big enough for threaded integrations to avoid the
+            # "Connection pool is full, discarding connection" warning
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=100)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+            _session = session
+
+    return _session
+
+
 class GqlApiError(Exception):
     pass
 
@@ -81,19 +110,22 @@ class GqlApi:
     _valid_schemas = None
     _queried_schemas: Set[Any] = set()
 
-    def __init__(self, url, token=None, int_name=None, validate_schemas=False):
+    def __init__(self, url, token=None, int_name=None, validate_schemas=False,
+                 timeout=GQL_TIMEOUT):
         self.url = url
         self.token = token
         self.integration = int_name
         self.validate_schemas = validate_schemas
-        self.client = GraphQLClient(self.url)
+        self.timeout = timeout
+        self.session = get_session()
+        self.headers = {'Accept': 'application/json'}
 
         if validate_schemas and not int_name:
             raise Exception('Cannot validate schemas if integration name '
                             'is not supplied')
 
         if token:
-            self.client.inject_token(token)
+            self.headers['Authorization'] = token
 
         if int_name:
             integrations = self.query(INTEGRATIONS_QUERY, skip_validation=True)
@@ -106,20 +138,21 @@ class GqlApi:
             if not self._valid_schemas:
                 raise GqlApiIntegrationNotFound(int_name)
 
+    @phase_timer('graphql_query')
     @retry(exceptions=GqlApiError, max_attempts=5, hook=capture_and_forget)
     def query(self, query, variables=None, skip_validation=False):
         try:
-            # supress print on HTTP error
-            # https://github.com/prisma-labs/python-graphql-client
-            # /blob/master/graphqlclient/client.py#L32-L33
-            with open(os.devnull, 'w') as f, contextlib.redirect_stdout(f):
-                result_json = self.client.execute(query, variables)
+            response = self.session.post(
+                self.url,
+                json={'query': query, 'variables': variables},
+                headers=self.headers,
+                timeout=self.timeout)
+            response.raise_for_status()
+            result = response.json()
         except Exception as e:
             raise GqlApiError(
                 'Could not connect to GraphQL server ({})'.format(e))
 
-        result = json.loads(result_json)
-
         # show schemas if log level is debug
         query_schemas = result.get('extensions', {}).get('schemas', [])
         self._queried_schemas.update(query_schemas)
@@ -185,7 +218,8 @@ def init(url, token=None, integration=None, validate_schemas=False):
 def get_sha(server, token=None):
     sha_endpoint = server._replace(path='/sha256')
     headers = {'Authorization': token} if token else None
-    response = requests.get(sha_endpoint.geturl(), headers=headers)
+    response = get_session().get(sha_endpoint.geturl(), headers=headers,
+                                 timeout=GQL_TIMEOUT)
     response.raise_for_status()
     sha = response.content.decode('utf-8')
     return sha
@@ -195,8 +229,8 @@ def get_sha(server, token=None):
 def get_git_commit_info(sha, server, token=None):
     git_commit_info_endpoint = server._replace(path=f'/git-commit-info/{sha}')
     headers = {'Authorization': token} if token else None
-    response = requests.get(git_commit_info_endpoint.geturl(),
-                            headers=headers)
+    response = get_session().get(git_commit_info_endpoint.geturl(),
+                                 headers=headers, timeout=GQL_TIMEOUT)
     response.raise_for_status()
     git_commit_info = response.json()
     return git_commit_info
@@ -216,6 +250,7 @@ def init_from_config(sha_url=True, integration=None, validate_schemas=False,
         server = server_url._replace(path=f'/graphqlsha/{sha}').geturl()
 
         runing_state = RunningState()
+        runing_state.sha = sha
         git_commit_info = get_git_commit_info(sha, server_url, token)
         runing_state.timestamp = git_commit_info.get('timestamp')
         runing_state.commit = git_commit_info.get('commit')
@@ -160,9 +160,15 @@ class JenkinsApi:
 
             res.raise_for_status()
 
-    def get_builds(self, job_name):
-        url = f"{self.url}/job/{job_name}/api/json" + \
-            "?tree=allBuilds[timestamp,result,id]"
+    def get_builds(self, job_name, start=None, end=None):
+        """Returns the builds of a job, newest first.
+
+        start and end limit the builds to the given range of indexes.
+        """
+        tree = 'allBuilds[timestamp,result,id]'
+        if start is not None and end is not None:
+            tree += f'{{{start},{end}}}'
+        url = f"{self.url}/job/{job_name}/api/json?tree={tree}"
         res = requests.get(
             url,
             verify=self.ssl_verify,
@@ -171,9 +177,20 @@ class JenkinsApi:
         res.raise_for_status()
         return res.json()['allBuilds']
 
-    def get_build_history(self, job_name, time_limit):
-        return [b['result'] for b in self.get_builds(job_name)
-                if time_limit < self.timestamp_seconds(b['timestamp'])]
+    def get_build_history(self, job_name, time_limit, page_size=100):
+        # builds are returned newest first. get pages of builds until
+        # a build older than the time limit is found.
+        history = []
+        start = 0
+        while True:
+            builds = self.get_builds(job_name, start, start + page_size)
+            for b in builds:
+                if time_limit >= self.timestamp_seconds(b['timestamp']):
+                    return history
+                history.append(b['result'])
+            if len(builds) < page_size:
+                return history
+            start += page_size
 
     def is_job_running(self, job_name):
         url = f"{self.url}/job/{job_name}/lastBuild/api/json"
@@ -1,3 +1,6 @@
+import math
+import time
+
 from jira import JIRA
 
 from reconcile.utils.secret_reader import SecretReader
@@ -15,11 +18,23 @@ class JiraClient:
         token_auth = self.secret_reader.read(token)
         self.jira = JIRA(self.server, token_auth=token_auth)
 
-    def get_issues(self, fields=None):
+    def get_issues(self, fields=None, updated_since=None):
+        """Gets the issues of the project
+
+        :param fields: fields to return for each issue
+        :param updated_since: (optional) only return issues updated after
+                              this unix timestamp
+        """
         block_size = 100
         block_num = 0
         all_issues = []
         jql = 'project={}'.format(self.project)
+        if updated_since is not None:
+            # absolute dates in JQL are interpreted in the timezone of the
+            # user, relative ones are not. Jira only supports a minute
+            # precision, so round up.
+            minutes = math.ceil((time.time() - updated_since) / 60)
+            jql += ' AND updated >= "-{}m"'.format(max(minutes, 1))
         kwargs = {}
         if fields:
             kwargs['fields'] = ','.join(fields)
@@ -1,10 +1,25 @@
 from contextlib import contextmanager
 
 from ldap3 import Server, Connection, ALL, SAFE_SYNC
+from ldap3.core.results import RESULT_SUCCESS
+from ldap3.utils.conv import escape_filter_chars
+from sretoolbox.utils import threaded
+
 from reconcile.utils.config import get_config
 
 _base_dn = None
 
+# number of uids per search. bounds the length of the search filter
+# and keeps a failing search from taking all the others with it
+CHUNK_SIZE = 100
+# number of entries per page of results
+PAGE_SIZE = 500
+PAGED_RESULTS_CONTROL = '1.2.840.113556.1.4.319'
+
+
+class LdapClientError(Exception):
+    pass
+
 
 @contextmanager
 def init(serverUrl):
@@ -27,15 +42,59 @@ def init_from_config():
     return init(serverUrl)
 
 
-def get_users(uids):
-    global _base_dn
+def get_users(uids, client=None, thread_pool_size=1):
+    """
+    Returns the subset of uids that exist in LDAP.
+
+    The uids are searched for in chunks, concurrently if thread_pool_size
+    allows it, over a single connection. Pass an open client to reuse it
+    across calls.
+
+    :raises LdapClientError: if any of the searches fails
+    """
+    if client is None:
+        with init_from_config() as client:
+            return get_users(uids, client=client,
+                             thread_pool_size=thread_pool_size)
 
-    with init_from_config() as client:
-        user_filter = "".join((f"(uid={u})" for u in uids))
-        _, _, results, _ = client.search(
+    uids = sorted(set(uids))
+    chunks = [uids[i:i + CHUNK_SIZE] for i in range(0, len(uids), CHUNK_SIZE)]
+    results = threaded.run(_get_chunk_users, chunks, thread_pool_size,
+                           client=client)
+    return set().union(*results)
+
+
+def _get_chunk_users(uids, client):
+    user_filter = "".join((f"(uid={escape_filter_chars(u)})" for u in uids))
+    entries = _paged_search(client,
+                            f'(&(objectclass=person)(|{user_filter}))',
+                            attributes=["uid"])
+    return set(e['attributes']['uid'][0] for e in entries)
+
+
+def _paged_search(client, search_filter, attributes):
+    entries = []
+    cookie = None
+    while True:
+        _, result, response, _ = client.search(
             _base_dn,
-            f'(&(objectclass=person)(|{user_filter}))',
-            attributes=["uid"]
+            search_filter,
+            attributes=attributes,
+            paged_size=PAGE_SIZE,
+            paged_cookie=cookie
         )
+        if result['result'] != RESULT_SUCCESS:
+            # a partial result would report existing users as missing
+            raise LdapClientError(
+                f"LDAP search failed: {result['description']} "
+                f"{result['message']}".strip())
+
         # pylint: disable=not-an-iterable
-        return set(r['attributes']['uid'][0] for r in results)
+        entries.extend(r for r in response if r['type'] == 'searchResEntry')
+
+        cookie = result.get('controls', {}) \
+            .get(PAGED_RESULTS_CONTROL, {}) \
+            .get('value', {}) \
+            .get('cookie')
+        if not cookie:
+            return entries
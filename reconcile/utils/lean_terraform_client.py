@@ -29,3 +29,14 @@ def show_json(working_dir, out_file):
         # out_file is the name of the account as well
         raise Exception(f'[{out_file}] terraform show failed: {str(err)}')
     return json.loads(out)
+
+
+def state_pull(working_dir):
+    # pylint: disable=consider-using-with
+    proc = Popen(['terraform', 'state', 'pull'],
+                 cwd=working_dir, stdout=PIPE, stderr=PIPE)
+    out, err = proc.communicate()
+    if proc.returncode:
+        raise Exception(f'terraform state pull failed: {str(err)}')
+    # an empty state produces no output
+    return json.loads(out) if out.strip() else {}
@@ -1,6 +1,15 @@
+import os
+import time
+
+from contextlib import contextmanager
+
 from prometheus_client import Gauge, Counter, Histogram
 
 
+INTEGRATION_NAME = os.environ.get('INTEGRATION_NAME', '')
+SHARDS = int(os.environ.get('SHARDS', 1))
+SHARD_ID = int(os.environ.get('SHARD_ID', 0))
+
 extra_labels = {'shard_key': None}
 label_keys = list(extra_labels.keys())
 
@@ -22,6 +31,13 @@ reconcile_time = Histogram(name='qontract_reconcile_function_'
                            buckets=(60.0, 150.0, 300.0, 600.0, 1200.0, 1800.0,
                                     2400.0, 3000.0, float("inf")))
 
+phase_time = Histogram(
+    name='qontract_reconcile_phase_duration_seconds',
+    documentation='Duration in seconds of the phases of integration runs',
+    labelnames=['integration', 'shards', 'shard_id', 'phase'] + label_keys,
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+             1200.0, float("inf")))
+
 registry_reachouts = Counter(
     name='qontract_reconcile_registry_get_manifest_total',
     documentation='Number of GET requests on image registries',
@@ -50,3 +66,23 @@ copy_count = Counter(
     documentation='Number of copy commands issued by Skopeo',
     labelnames=['integration', 'shard', 'shard_id'],
 )
+
+
+@contextmanager
+def phase_timer(phase):
+    """Observes the duration of a phase of an integration run, like
+    fetching the desired state or applying changes.
+
+    Can be used as a context manager or as a function decorator.
+
+    :param phase: name of the phase
+    """
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        phase_time.labels(integration=INTEGRATION_NAME,
+                          shards=SHARDS,
+                          shard_id=SHARD_ID,
+                          phase=phase,
+                          **extra_labels).observe(time.monotonic() - start)
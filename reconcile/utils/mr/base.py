@@ -112,7 +112,7 @@ class MergeRequestBase(metaclass=ABCMeta):
             'labels': self.labels
         }
 
-    def submit_to_gitlab(self, gitlab_cli):
+    def submit_to_gitlab(self, gitlab_cli, open_mr_titles=None):
         """
         :param gitlab_cli:
         :type gitlab_cli: GitLabApi
@@ -122,6 +122,10 @@ class MergeRequestBase(metaclass=ABCMeta):
 
         :param gitlab_cli: The SQS Client instance.
         :type gitlab_cli: GitLabApi
+        :param open_mr_titles: (optional) titles of the open MRs. When
+          provided, duplicates are checked against it instead of listing
+          the open MRs.
+        :type open_mr_titles: set
 
         :raises:
             MergeRequestProcessingError: Raised when it was not possible
@@ -130,7 +134,11 @@ class MergeRequestBase(metaclass=ABCMeta):
 
         try:
             # Avoiding duplicate MRs
-            if gitlab_cli.mr_exists(title=self.title):
+            if open_mr_titles is not None:
+                mr_exists = self.title in open_mr_titles
+            else:
+                mr_exists = gitlab_cli.mr_exists(title=self.title)
+            if mr_exists:
                 self.cancel(f"MR with the same name '{self.title}' "
                             f"already exists. Aborting MR creation.")
 
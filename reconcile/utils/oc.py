@@ -1098,13 +1098,17 @@ class OC_Map:
 
     In case a cluster does not have an automation token
     the OC client will be initiated to False.
+
+    With lazy=True the OC clients are initiated on the first get() of their
+    cluster instead of all at once, for callers that only use a few of the
+    clusters. clusters() initiates all of them.
     """
 
     def __init__(self, clusters=None, namespaces=None,
                  integration='', e2e_test='', settings=None,
                  internal=None, use_jump_host=True, thread_pool_size=1,
                  init_projects=False, init_api_resources=False,
-                 cluster_admin=False):
+                 cluster_admin=False, lazy=False):
         self.oc_map = {}
         self.privileged_oc_map = {}
         self.calling_integration = integration
@@ -1117,12 +1121,16 @@ class OC_Map:
         self.init_api_resources = init_api_resources
         self._lock = Lock()
         self.jh_ports = {}
+        self.lazy = lazy
+        # cluster info of the clients to initiate on first use,
+        # indexed by (cluster name, privileged)
+        self._pending = {}
+        self._pending_locks = {}
 
         if clusters and namespaces:
             raise KeyError('expected only one of clusters or namespaces.')
         elif clusters:
-            threaded.run(self.init_oc_client, clusters, self.thread_pool_size,
-                         privileged=cluster_admin)
+            self.init_oc_clients(clusters, privileged=cluster_admin)
         elif namespaces:
             clusters = {}
             privileged_clusters = {}
@@ -1140,16 +1148,44 @@ class OC_Map:
                 if privileged:
                     privileged_clusters[c['name']] = c
             if clusters:
-                threaded.run(self.init_oc_client, clusters.values(),
-                             self.thread_pool_size,
-                             privileged=False)
+                self.init_oc_clients(clusters.values(), privileged=False)
             if privileged_clusters:
-                threaded.run(self.init_oc_client, privileged_clusters.values(),
-                             self.thread_pool_size,
-                             privileged=True)
+                self.init_oc_clients(privileged_clusters.values(),
+                                     privileged=True)
         else:
             raise KeyError('expected one of clusters or namespaces.')
 
+    def init_oc_clients(self, clusters, privileged: bool):
+        if not self.lazy:
+            threaded.run(self.init_oc_client, clusters, self.thread_pool_size,
+                         privileged=privileged)
+            return
+
+        for cluster_info in clusters:
+            self._pending.setdefault((cluster_info['name'], privileged),
+                                     cluster_info)
+
+    def init_pending_oc_client(self, cluster: str, privileged: bool):
+        key = (cluster, privileged)
+        if key not in self._pending:
+            return
+        with self._lock:
+            lock = self._pending_locks.setdefault(key, Lock())
+        with lock:
+            cluster_info = self._pending.get(key)
+            if cluster_info is None:
+                # initiated by another thread in the meantime
+                return
+            try:
+                self.init_oc_client(cluster_info, privileged)
+            finally:
+                del self._pending[key]
+
+    def init_pending_oc_clients(self, privileged: bool):
+        clusters = [c for c, p in list(self._pending) if p == privileged]
+        threaded.run(self.init_pending_oc_client, clusters,
+                     self.thread_pool_size, privileged=privileged)
+
     def set_jh_ports(self, jh):
         # This will be replaced with getting the data from app-interface in
         # a future PR.
@@ -1266,6 +1302,7 @@ class OC_Map:
         return False
 
     def get(self, cluster: str, privileged: bool = False):
+        self.init_pending_oc_client(cluster, privileged)
         cluster_map = self.privileged_oc_map if privileged else self.oc_map
         return cluster_map.get(
             cluster,
@@ -1283,6 +1320,7 @@ class OC_Map:
         that the value in OC_Map might be an OCLogMsg instead of OCNative, etc.
         :return: list of cluster names
         """
+        self.init_pending_oc_clients(privileged)
         cluster_map = self.privileged_oc_map if privileged else self.oc_map
         if include_errors:
             return list(cluster_map.keys())
@@ -0,0 +1,77 @@
+import cProfile
+import json
+import logging
+import os
+import random
+import resource
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+
+from reconcile.status import RunningState
+from reconcile.utils.sharding import SHARDS, SHARD_ID
+
+
+def profile_file_prefix(output_dir, integration):
+    """
+    Builds the path prefix of the profile files of a run, tagged with
+    the integration, shard and bundle sha.
+    """
+    sha = RunningState().sha or 'unknown'
+    timestamp = time.strftime('%Y%m%d%H%M%S', time.gmtime())
+    name = f'{integration}-shard-{SHARD_ID}-of-{SHARDS}-{sha[:12]}-{timestamp}'
+    return os.path.join(output_dir, name)
+
+
+@contextmanager
+def profile(output_dir, integration, sample_rate=1.0):
+    """
+    Profiles the CPU time and peak memory of the wrapped code.
+
+    Writes a pstats file (<prefix>.prof) and a summary with the wall time and
+    peak memory (<prefix>.json) to output_dir. Only a sample_rate fraction of
+    the runs are profiled, so that it can be left enabled in long running
+    processes. Nothing is profiled if output_dir is not set.
+
+    cProfile only profiles the calling thread. Work done by thread pools
+    shows up as time spent waiting for their results.
+    """
+    if not output_dir or random.random() >= sample_rate:
+        yield
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    prefix = profile_file_prefix(output_dir, integration)
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    start = time.monotonic()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        wall_time = time.monotonic() - start
+        _, peak = tracemalloc.get_traced_memory()
+        if not tracing:
+            tracemalloc.stop()
+
+        profiler.dump_stats(f'{prefix}.prof')
+        summary = {
+            'integration': integration,
+            'shard_id': SHARD_ID,
+            'shards': SHARDS,
+            'sha': RunningState().sha,
+            'wall_time_seconds': wall_time,
+            'peak_traced_memory_bytes': peak,
+            # kilobytes on linux
+            'max_rss_kilobytes':
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
+        with open(f'{prefix}.json', 'w') as f:
+            json.dump(summary, f, indent=2)
+        logging.info(f'profile written to {prefix}.prof')
@@ -1,18 +1,50 @@
 import copy
+import hashlib
+import json
 import os
+import re
 import subprocess
 import tempfile
+import threading
 
 import yaml
 
-from reconcile.utils.defer import defer
+from sretoolbox.utils import threaded
+
 from reconcile.utils.structs import CommandExecutionResult
 
 
+# promtool accepts many files per invocation. Batches are bounded to keep the
+# command line short and to limit the blast radius of a crashing promtool.
+BATCH_SIZE = 50
+
+CHECK_RULES_HEADER_RE = re.compile(r'^Checking (.+)$')
+TEST_RULES_HEADER_RE = re.compile(r'^Unit Testing:\s+(.+)$')
+
+# content hashes of specs that already passed validation in this process.
+# Rules are immutable for a given content, so there is no need to check them
+# again in later iterations of the same process.
+_passed_hashes = set()
+_passed_hashes_lock = threading.Lock()
+
+
 def check_rule(yaml_spec):
     '''Run promtool check rules on the given yaml spec given as dict'''
-    return _run_yaml_spec_cmd(cmd=['promtool', 'check', 'rules'],
-                              yaml_spec=yaml_spec)
+    return check_rules({0: yaml_spec})[0]
+
+
+def check_rules(yaml_specs, thread_pool_size=1):
+    '''Run promtool check rules on many yaml specs in batches
+
+       params:
+
+       yaml_specs: dict of rule yaml spec dicts indexed by any hashable key
+
+       returns a dict of CommandExecutionResult indexed by the same keys
+     '''
+    items = {key: (_content_hash(spec), spec)
+             for key, spec in yaml_specs.items()}
+    return _run_batched(items, _check_rules_batch, thread_pool_size)
 
 
 def run_test(test_yaml_spec, rule_files):
@@ -24,62 +56,176 @@ def run_test(test_yaml_spec, rule_files):
 
        rule_files: dict indexed by rule path containing rule files yaml dicts
      '''
-    temp_rule_files = {}
-    try:
-        for rule_file, yaml_spec in rule_files.items():
-            with tempfile.NamedTemporaryFile(delete=False) as fp:
-                fp.write(yaml.dump(yaml_spec).encode())
-                temp_rule_files[rule_file] = fp.name
-    except Exception as e:
-        return CommandExecutionResult(
-            False, f'Error building temp rule files: {e}')
+    return run_tests({0: (test_yaml_spec, rule_files)})[0]
+
 
-    # build a test yaml prometheus files that uses the temp files created
-    new_rule_files = []
-    for rule_file in test_yaml_spec['rule_files']:
-        if rule_file not in temp_rule_files:
-            raise CommandExecutionResult(
-                False, f'{rule_file} not in rule_files dict')
+def run_tests(tests, thread_pool_size=1):
+    '''Run promtool test rules on many tests in batches
 
-        new_rule_files.append(temp_rule_files[rule_file])
+       params:
 
-    temp_test_yaml_spec = copy.deepcopy(test_yaml_spec)
-    temp_test_yaml_spec['rule_files'] = new_rule_files
+       tests: dict of (test_yaml_spec, rule_files) tuples indexed by any
+              hashable key. rule_files is a dict indexed by rule path
+              containing rule files yaml dicts
 
-    defer(lambda: _cleanup(temp_rule_files.values()))
+       returns a dict of CommandExecutionResult indexed by the same keys
+     '''
+    items = {}
+    results = {}
+    for key, (test_yaml_spec, rule_files) in tests.items():
+        missing = [f for f in test_yaml_spec['rule_files']
+                   if f not in rule_files]
+        if missing:
+            results[key] = CommandExecutionResult(
+                False, f'{missing[0]} not in rule_files dict')
+            continue
+
+        content_hash = _content_hash([test_yaml_spec, rule_files])
+        items[key] = (content_hash, (test_yaml_spec, rule_files))
+
+    results.update(_run_batched(items, _run_tests_batch, thread_pool_size))
+    return results
+
+
+def _content_hash(data):
+    content = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _run_batched(items, batch_func, thread_pool_size):
+    '''Runs batch_func over the items that have not passed yet
+
+       items: dict of (content_hash, data) tuples indexed by caller key
+       batch_func: callable that gets a list of (content_hash, data) tuples
+                   and returns a dict of results indexed by content_hash
+    '''
+    # identical content (e.g. the same rule deployed to many namespaces) is
+    # validated only once
+    pending = {}
+    with _passed_hashes_lock:
+        for content_hash, data in items.values():
+            if content_hash not in _passed_hashes:
+                pending[content_hash] = data
+
+    pending_items = list(pending.items())
+    batches = [pending_items[i:i + BATCH_SIZE]
+               for i in range(0, len(pending_items), BATCH_SIZE)]
+
+    hash_results = {}
+    for batch_results in threaded.run(batch_func, batches, thread_pool_size):
+        hash_results.update(batch_results)
+
+    with _passed_hashes_lock:
+        _passed_hashes.update(h for h, r in hash_results.items() if r)
+
+    return {key: hash_results.get(content_hash,
+                                  CommandExecutionResult(True, ''))
+            for key, (content_hash, _) in items.items()}
+
+
+def _check_rules_batch(batch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = {}
+        try:
+            for index, (content_hash, yaml_spec) in enumerate(batch):
+                path = os.path.join(tmpdir, f'{index}.rules.yml')
+                _write_yaml(path, yaml_spec)
+                paths[content_hash] = path
+        except Exception as e:
+            return _fail_all(batch, f'Error creating temporary file: {e}')
 
-    return _run_yaml_spec_cmd(cmd=['promtool', 'test', 'rules'],
-                              yaml_spec=temp_test_yaml_spec)
+        return _run_batch_cmd(['promtool', 'check', 'rules'], paths,
+                              CHECK_RULES_HEADER_RE)
 
 
-def _run_yaml_spec_cmd(cmd, yaml_spec):
-    with tempfile.NamedTemporaryFile() as fp:
+def _run_tests_batch(batch):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = {}
         try:
-            fp.write(yaml.dump(yaml_spec).encode())
-            fp.flush()
-            cmd.append(fp.name)
+            for index, (content_hash, test) in enumerate(batch):
+                test_yaml_spec, rule_files = test
+                # build a test yaml prometheus file that uses the temp
+                # rule files created
+                temp_rule_files = {}
+                for rule_index, (rule_file, yaml_spec) in \
+                        enumerate(rule_files.items()):
+                    path = os.path.join(tmpdir,
+                                        f'{index}-{rule_index}.rules.yml')
+                    _write_yaml(path, yaml_spec)
+                    temp_rule_files[rule_file] = path
+
+                temp_test_yaml_spec = copy.deepcopy(test_yaml_spec)
+                temp_test_yaml_spec['rule_files'] = \
+                    [temp_rule_files[f] for f in test_yaml_spec['rule_files']]
+
+                path = os.path.join(tmpdir, f'{index}.test.yml')
+                _write_yaml(path, temp_test_yaml_spec)
+                paths[content_hash] = path
         except Exception as e:
-            return CommandExecutionResult(
-                False, f'Error creating temporary file: {e}')
+            return _fail_all(batch, f'Error building temp rule files: {e}')
 
-        try:
-            result = subprocess.run(cmd, stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE, check=True)
-        except subprocess.CalledProcessError as e:
-            msg = f'Error running promtool command [{" ".join(cmd)}]'
-            if e.stdout:
-                msg += f' {e.stdout.decode()}'
-            if e.stderr:
-                msg += f' {e.stderr.decode()}'
-
-            return CommandExecutionResult(False, msg)
-
-    return CommandExecutionResult(True, result.stdout.decode())
-
-
-def _cleanup(paths):
-    try:
-        for path in paths:
-            os.unlink(path)
-    except Exception:
-        pass
+        return _run_batch_cmd(['promtool', 'test', 'rules'], paths,
+                              TEST_RULES_HEADER_RE)
+
+
+def _write_yaml(path, yaml_spec):
+    with open(path, 'w') as f:
+        f.write(yaml.dump(yaml_spec))
+
+
+def _fail_all(batch, msg):
+    return {content_hash: CommandExecutionResult(False, msg)
+            for content_hash, _ in batch}
+
+
+def _run_batch_cmd(cmd, paths, header_re):
+    '''Runs cmd over all paths and attributes the output back to each of them
+
+       paths: dict of file paths indexed by content hash
+    '''
+    cmd = cmd + list(paths.values())
+    # promtool writes unbuffered to both stdout and stderr, merging them
+    # keeps the error messages next to the file they belong to
+    result = subprocess.run(cmd, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, check=False)
+    output = result.stdout.decode()
+    if result.returncode == 0:
+        return {content_hash: CommandExecutionResult(True, output)
+                for content_hash in paths}
+
+    sections = _split_output(output, header_re)
+    results = {}
+    for content_hash, path in paths.items():
+        section = sections.get(path)
+        if section is not None and _section_succeeded(section):
+            results[content_hash] = CommandExecutionResult(True, section)
+            continue
+
+        msg = f'Error running promtool command [{" ".join(cmd[:3])}]'
+        msg += f' {section if section is not None else output}'
+        results[content_hash] = CommandExecutionResult(False, msg)
+
+    return results
+
+
+def _split_output(output, header_re):
+    '''Splits promtool output into per file sections indexed by file path'''
+    sections = {}
+    current = None
+    for line in output.splitlines():
+        m = header_re.match(line)
+        if m:
+            current = m.group(1).strip()
+            sections[current] = []
+            continue
+        if current is not None:
+            sections[current].append(line)
+
+    return {path: '\n'.join(lines).strip()
+            for path, lines in sections.items()}
+
+
+def _section_succeeded(section):
+    return any(line.strip().startswith('SUCCESS')
+               for line in section.splitlines()) and \
+        'FAILED' not in section
@@ -18,6 +18,7 @@ from sretoolbox.utils import threaded
 
 from reconcile.github_org import get_config
 from reconcile.utils.mr.auto_promoter import AutoPromoter
+from reconcile.utils.metrics import phase_timer
 from reconcile.utils.oc import OC, StatusCodeError
 from reconcile.utils.openshift_resource import (OpenshiftResource as OR,
                                                 ResourceInventory,
@@ -713,6 +714,7 @@ class SaasHerder():
 
         return image_auth
 
+    @phase_timer('populate_desired_state')
     def populate_desired_state(self, ri):
         results = threaded.run(self.init_populate_desired_state_specs,
                                self.saas_files,
@@ -890,6 +892,7 @@ class SaasHerder():
 
         return promotion
 
+    @phase_timer('get_diff')
     def get_diff(self, trigger_type, dry_run):
         if trigger_type == TriggerTypes.MOVING_COMMITS:
             # TODO: replace error with actual error handling when needed
@@ -4,6 +4,7 @@ from hvac.exceptions import Forbidden
 from sretoolbox.utils import retry
 
 from reconcile.utils import config, vault
+from reconcile.utils.metrics import phase_timer
 from reconcile.utils.vault import VaultClient
 
 
@@ -32,6 +33,7 @@ class SecretReader:
             self._vault_client = VaultClient()
         return self._vault_client
 
+    @phase_timer('secret_read')
     @retry()
     def read(self, secret: Mapping[str, str]):
         """Returns a value of a key from Vault secret or configuration file.
@@ -62,6 +64,7 @@ class SecretReader:
 
         return data
 
+    @phase_timer('secret_read')
     @retry()
     def read_all(self, secret: Mapping[str, str]):
         """Returns a dictionary of keys and values
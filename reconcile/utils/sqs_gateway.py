@@ -1,9 +1,16 @@
+import logging
 import os
 import json
 
 from reconcile.utils.aws_api import AWSApi
 
 
+# maximum number of messages per receive and delete call allowed by SQS
+SQS_BATCH_SIZE = 10
+# maximum long polling wait time allowed by SQS
+SQS_MAX_WAIT_TIME_SECONDS = 20
+
+
 class SQSGatewayInitError(Exception):
     pass
 
@@ -37,10 +44,16 @@ class SQSGateway:
             MessageBody=json.dumps(body)
         )
 
-    def receive_messages(self, visibility_timeout=30):
+    def receive_messages(self, visibility_timeout=30,
+                         max_messages=SQS_BATCH_SIZE,
+                         wait_time_seconds=SQS_MAX_WAIT_TIME_SECONDS):
+        """Receives up to max_messages messages. Long polls for up to
+        wait_time_seconds, so an empty result means the queue is empty."""
         messages = self.sqs.receive_message(
             QueueUrl=self.queue_url,
-            VisibilityTimeout=visibility_timeout
+            VisibilityTimeout=visibility_timeout,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=wait_time_seconds
         ).get('Messages', [])
         return [(m['ReceiptHandle'], json.loads(m['Body']))
                 for m in messages]
@@ -50,3 +63,22 @@ class SQSGateway:
             QueueUrl=self.queue_url,
             ReceiptHandle=receipt_handle
         )
+
+    def delete_messages(self, receipt_handles):
+        """Deletes messages in batches.
+
+        :return: receipt handles of the messages that could not be deleted
+        """
+        failed = []
+        for i in range(0, len(receipt_handles), SQS_BATCH_SIZE):
+            batch = receipt_handles[i:i + SQS_BATCH_SIZE]
+            response = self.sqs.delete_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=[{'Id': str(index), 'ReceiptHandle': handle}
+                         for index, handle in enumerate(batch)]
+            )
+            for f in response.get('Failed', []):
+                logging.error('failed to delete message %s: %s',
+                              batch[int(f['Id'])][:6], f.get('Message'))
+                failed.append(batch[int(f['Id'])])
+        return failed
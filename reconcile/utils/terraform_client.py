@@ -1,8 +1,9 @@
 import base64
+import hashlib
 import logging
 import json
 import os
-import shutil
+import time
 
 from datetime import datetime
 from collections import defaultdict
@@ -16,10 +17,34 @@ from sretoolbox.utils import threaded
 import reconcile.utils.lean_terraform_client as lean_tf
 
 from reconcile.utils import gql
+from reconcile.utils.metrics import phase_timer
 from reconcile.utils.openshift_resource import OpenshiftResource as OR
+from reconcile.utils.terrascript_client import (TF_WORKING_DIRS_ROOT,
+                                                cleanup_working_dirs)
 
 ALLOWED_TF_SHOW_FORMAT_VERSION = "0.1"
 DATE_FORMAT = '%Y-%m-%d'
+# plan at least this often (in seconds) for accounts that would otherwise
+# be skipped, to detect drift in resources changed outside of terraform
+DRIFT_DETECTION_INTERVAL = 6 * 60 * 60
+# written to .terraform after a successful init, holds a hash of the
+# configuration parts that require terraform init when they change
+INIT_HASH_FILE = 'qontract-init-hash'
+
+# the plugin cache is not safe for concurrent writes
+_plugin_cache_lock = Lock()
+
+
+def init_plugin_cache_dir():
+    """Returns the provider plugin cache directory shared by all
+    working directories of this process, if one is used."""
+    cache_dir = os.environ.get('TF_PLUGIN_CACHE_DIR')
+    if not cache_dir and TF_WORKING_DIRS_ROOT:
+        cache_dir = os.path.join(TF_WORKING_DIRS_ROOT, 'plugin-cache')
+        os.environ['TF_PLUGIN_CACHE_DIR'] = cache_dir
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
 
 
 @dataclass
@@ -35,7 +60,8 @@ class DeletionApprovalExpirationValueError(Exception):
 class TerraformClient:
     def __init__(self, integration, integration_version,
                  integration_prefix, accounts, working_dirs, thread_pool_size,
-                 init_users=False):
+                 init_users=False, plan_state=None,
+                 drift_detection_interval=DRIFT_DETECTION_INTERVAL):
         self.integration = integration
         self.integration_version = integration_version
         self.integration_prefix = integration_prefix
@@ -45,6 +71,13 @@ class TerraformClient:
         self.thread_pool_size = thread_pool_size
         self._log_lock = Lock()
         self.should_apply = False
+        # plan_state is a State used to persist per account plan
+        # fingerprints. plans are never skipped if it is not provided.
+        self.plan_state = plan_state
+        self.drift_detection_interval = drift_detection_interval
+        self.skipped_plans = set()
+        self.accounts_with_changes = set()
+        self.plugin_cache_dir = init_plugin_cache_dir()
 
         self.init_specs()
         self.init_outputs()
@@ -82,6 +115,7 @@ class TerraformClient:
                                   user_name, enc_password))
         return new_users
 
+    @phase_timer('terraform_init')
     def init_specs(self):
         wd_specs = \
             [{'name': name, 'wd': wd}
@@ -96,13 +130,42 @@ class TerraformClient:
         name = init_spec['name']
         wd = init_spec['wd']
         tf = Terraform(working_dir=wd)
-        return_code, stdout, stderr = tf.init()
+        init_hash = self.get_init_hash(wd)
+        init_hash_file = os.path.join(wd, '.terraform', INIT_HASH_FILE)
+        if os.path.exists(init_hash_file):
+            with open(init_hash_file) as f:
+                if f.read() == init_hash:
+                    # working directory is already initialized
+                    return name, tf
+
+        if self.plugin_cache_dir:
+            with _plugin_cache_lock:
+                return_code, stdout, stderr = tf.init()
+        else:
+            return_code, stdout, stderr = tf.init()
         error = self.check_output(name, 'init', return_code, stdout, stderr)
         if error:
             raise TerraformCommandError(
                 return_code, 'init', out=stdout, err=stderr)
+        os.makedirs(os.path.dirname(init_hash_file), exist_ok=True)
+        with open(init_hash_file, 'w') as f:
+            f.write(init_hash)
         return name, tf
 
+    @staticmethod
+    def get_init_hash(working_dir):
+        """Returns a hash of the backend and provider requirements, the
+        parts of the configuration that require a new terraform init."""
+        with open(os.path.join(working_dir, 'config.tf.json')) as f:
+            config = json.load(f)
+        init_config = {
+            'terraform': config.get('terraform'),
+            'provider': config.get('provider'),
+        }
+        content = json.dumps(init_config, sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @phase_timer('terraform_output')
     def init_outputs(self):
         results = threaded.run(self.terraform_output, self.specs,
                                self.thread_pool_size)
@@ -125,9 +188,12 @@ class TerraformClient:
         return name, json.loads(stdout)
 
     # terraform plan
+    @phase_timer('terraform_plan')
     def plan(self, enable_deletion):
         errors = False
         disabled_deletions_detected = False
+        self.skipped_plans = set()
+        self.accounts_with_changes = set()
         results = threaded.run(self.terraform_plan, self.specs,
                                self.thread_pool_size,
                                enable_deletion=enable_deletion)
@@ -157,14 +223,76 @@ class TerraformClient:
     def terraform_plan(self, plan_spec, enable_deletion):
         name = plan_spec['name']
         tf = plan_spec['tf']
+        fingerprint = self.get_plan_fingerprint(name, tf.working_dir)
+        if self.is_plan_skippable(name, fingerprint):
+            logging.debug(['skip_plan', name])
+            self.skipped_plans.add(name)
+            return False, [], [], False
+
         return_code, stdout, stderr = tf.plan(detailed_exitcode=False,
                                               parallelism=self.parallelism,
                                               out=name)
         error = self.check_output(name, 'plan', return_code, stdout, stderr)
         disabled_deletion_detected, deleted_users, created_users = \
             self.log_plan_diff(name, tf, enable_deletion)
+        if not error and not disabled_deletion_detected \
+                and name not in self.accounts_with_changes:
+            self.save_plan_fingerprint(name, fingerprint)
         return disabled_deletion_detected, deleted_users, created_users, error
 
+    def get_plan_fingerprint(self, name, working_dir):
+        """Returns a fingerprint of everything that can change the result
+        of a plan for an account, or None if it can not be calculated."""
+        if self.plan_state is None:
+            return None
+        try:
+            config_file = os.path.join(working_dir, 'config.tf.json')
+            with open(config_file, 'rb') as f:
+                config_hash = hashlib.sha256(f.read()).hexdigest()
+            state = lean_tf.state_pull(working_dir)
+        except Exception as e:
+            logging.warning(f'[{name}] unable to fingerprint plan: {e}')
+            return None
+
+        return {
+            'config_hash': config_hash,
+            'provider_version': self.accounts[name].get('providerVersion'),
+            'state_lineage': state.get('lineage'),
+            'state_serial': state.get('serial'),
+        }
+
+    def plan_state_key(self, name):
+        return f'plan-fingerprints/{name}'
+
+    def is_plan_skippable(self, name, fingerprint):
+        """A plan is skippable if the last plan for the account had no
+        changes, nothing it depends on changed since then and it is not
+        yet time to run it again for drift detection."""
+        if fingerprint is None:
+            return False
+        try:
+            stored = self.plan_state.get(self.plan_state_key(name), None)
+        except Exception as e:
+            logging.warning(f'[{name}] unable to get plan fingerprint: {e}')
+            return False
+        if not stored:
+            return False
+
+        planned_at = stored.get('planned_at', 0)
+        if time.time() - planned_at >= self.drift_detection_interval:
+            return False
+
+        return stored.get('fingerprint') == fingerprint
+
+    def save_plan_fingerprint(self, name, fingerprint):
+        if fingerprint is None:
+            return
+        value = {'fingerprint': fingerprint, 'planned_at': time.time()}
+        try:
+            self.plan_state[self.plan_state_key(name)] = value
+        except Exception as e:
+            logging.warning(f'[{name}] unable to save plan fingerprint: {e}')
+
     def log_plan_diff(self, name, tf, enable_deletion):
         disabled_deletion_detected = False
         account_enable_deletion = \
@@ -195,6 +323,7 @@ class TerraformClient:
             if before != after:
                 logging.info(['update', name, 'output', output_name])
                 self.should_apply = True
+                self.accounts_with_changes.add(name)
 
         resource_changes = output.get('resource_changes')
         if resource_changes is None:
@@ -219,6 +348,7 @@ class TerraformClient:
                 with self._log_lock:
                     logging.info([action, name, resource_type, resource_name])
                     self.should_apply = True
+                    self.accounts_with_changes.add(name)
                 if action == 'create':
                     if resource_type == 'aws_iam_user_login_profile':
                         created_users.append(AccountUser(name, resource_name))
@@ -282,10 +412,14 @@ class TerraformClient:
         return lean_tf.show_json(working_dir, name)
 
     # terraform apply
+    @phase_timer('terraform_apply')
     def apply(self):
         errors = False
 
-        results = threaded.run(self.terraform_apply, self.specs,
+        # accounts with a skipped plan have nothing to apply
+        apply_specs = [s for s in self.specs
+                       if s['name'] not in self.skipped_plans]
+        results = threaded.run(self.terraform_apply, apply_specs,
                                self.thread_pool_size)
 
         for error in results:
@@ -546,5 +680,4 @@ class TerraformClient:
         return split_outputs
 
     def cleanup(self):
-        for _, wd in self.working_dirs.items():
-            shutil.rmtree(wd)
+        cleanup_working_dirs(self.working_dirs)
@@ -4,6 +4,7 @@ import logging
 import os
 import random
 import re
+import shutil
 import string
 import tempfile
 
@@ -77,6 +78,7 @@ from sretoolbox.utils import threaded
 
 from reconcile.utils import gql
 from reconcile.utils.aws_api import AWSApi
+from reconcile.utils.metrics import phase_timer
 from reconcile.utils.secret_reader import SecretReader
 from reconcile.utils.git import is_file_in_git_repo
 from reconcile.github_org import get_config
@@ -92,6 +94,9 @@ import reconcile.openshift_resources_base as orb
 
 
 GH_BASE_URL = os.environ.get('GITHUB_API', 'https://api.github.com')
+# when set, working directories are created under this path and reused
+# across runs instead of being created in a new temporary directory
+TF_WORKING_DIRS_ROOT = os.environ.get('TERRAFORM_WORKING_DIRS_ROOT')
 LOGTOES_RELEASE = 'repos/app-sre/logs-to-elasticsearch-lambda/releases/latest'
 VARIABLE_KEYS = ['region', 'availability_zone', 'parameter_group',
                  'enhanced_monitoring', 'replica_source',
@@ -134,10 +139,25 @@ class time_sleep(Resource):
     pass
 
 
+def cleanup_working_dirs(working_dirs):
+    """Removes temporary working directories. Persistent working
+    directories are kept to be reused by the next run."""
+    for wd in working_dirs.values():
+        if TF_WORKING_DIRS_ROOT and \
+                wd.startswith(os.path.join(TF_WORKING_DIRS_ROOT, '')):
+            continue
+        shutil.rmtree(wd)
+
+
 class TerrascriptClient:
     def __init__(self, integration, integration_prefix,
-                 thread_pool_size, accounts, oc_map=None, settings=None):
+                 thread_pool_size, accounts, oc_map=None, settings=None,
+                 working_dir_namespace=None):
         self.integration = integration
+        # persistent working directories hold the terraform init state
+        # and plans, so integrations rendering the config of another
+        # integration need their own namespace of directories
+        self.working_dir_namespace = working_dir_namespace or integration
         self.integration_prefix = integration_prefix
         self.oc_map = oc_map
         self.settings = settings
@@ -246,6 +266,7 @@ class TerrascriptClient:
                 filtered_accounts.append(account)
         return filtered_accounts
 
+    @phase_timer('terrascript_populate_configs')
     def populate_configs(self, accounts):
         results = threaded.run(self.get_tf_secrets, accounts,
                                self.thread_pool_size)
@@ -832,6 +853,7 @@ class TerrascriptClient:
 
         return results
 
+    @phase_timer('terrascript_populate_resources')
     def populate_resources(self, namespaces, existing_secrets, account_name,
                            ocm_map=None):
         self.init_populate_specs(namespaces, account_name)
@@ -2978,6 +3000,7 @@ class TerrascriptClient:
         with self.locks[account]:
             self.tss[account].add(tf_resource)
 
+    @phase_timer('terrascript_dump')
     def dump(self, print_to_file=None, existing_dirs=None):
         if existing_dirs is None:
             working_dirs = {}
@@ -2991,7 +3014,7 @@ class TerrascriptClient:
                     f.write('##### {} #####\n'.format(name))
                     f.write(str(ts))
             if existing_dirs is None:
-                wd = tempfile.mkdtemp()
+                wd = self.get_working_dir(name)
             else:
                 wd = working_dirs[name]
             with open(wd + '/config.tf.json', 'w') as f:
@@ -3000,6 +3023,14 @@ class TerrascriptClient:
 
         return working_dirs
 
+    def get_working_dir(self, name):
+        if not TF_WORKING_DIRS_ROOT:
+            return tempfile.mkdtemp()
+        wd = os.path.join(TF_WORKING_DIRS_ROOT, self.working_dir_namespace,
+                          name)
+        os.makedirs(wd, exist_ok=True)
+        return wd
+
     def init_values(self, resource, namespace_info):
         account = resource['account']
         provider = resource['provider']
@@ -11,6 +11,7 @@ import requests
 from hvac.exceptions import InvalidPath
 from requests.adapters import HTTPAdapter
 from sretoolbox.utils import retry
+from sretoolbox.utils import threaded
 
 from reconcile.utils.config import get_config
 
@@ -43,6 +44,13 @@ class VaultConnectionError(Exception):
     pass
 
 
+class SecretWriteError(Exception):
+    def __init__(self, results):
+        self.results = results
+        failed = [p for p, r in results.items() if isinstance(r, Exception)]
+        super().__init__(f'failed to write secrets: {", ".join(failed)}')
+
+
 SECRET_VERSION_LATEST = "LATEST"
 
 
@@ -240,12 +248,7 @@ class _VaultClient:
         * data - data (dictionary) to write
         """
         secret_path = secret['path']
-        b64_data = secret['data']
-        if decode_base64:
-            data = {k: base64.b64decode(v or '').decode('utf-8')
-                    for k, v in b64_data.items()}
-        else:
-            data = b64_data
+        data = self._decode_data(secret['data'], decode_base64)
 
         kv_version = self._get_mount_version_by_secret_path(secret_path)
         if kv_version == 2:
@@ -253,11 +256,91 @@ class _VaultClient:
         else:
             self._write_v1(secret_path, data)
 
-    def _write_v2(self, path, data):
-        path_split = path.split('/')
-        mount_point = path_split[0]
-        write_path = '/'.join(path_split[1:])
+    def write_many(self, secrets, decode_base64=True, thread_pool_size=10,
+                   raise_on_error=True):
+        """Writes many secrets, skipping the ones that are up-to-date.
+
+        The current data of all paths is read concurrently first, then only
+        the secrets that differ are written, also concurrently.
+
+        :param secrets: list of secrets as accepted by write. if a path
+                        appears more than once, the last secret wins.
+        :param raise_on_error: raise a SecretWriteError after all secrets
+                               were handled if any of them failed
+
+        :return: dictionary indexed by path. values are True if the secret
+                 was written, False if it was up-to-date or the exception
+                 raised while handling it.
+        """
+        desired = {}
+        for secret in secrets:
+            desired[secret['path']] = \
+                self._decode_data(secret['data'], decode_base64)
+        paths = list(desired)
+
+        current = threaded.run(self._read_current, paths, thread_pool_size,
+                               return_exceptions=True)
+        results = {}
+        to_write = []
+        for path, current_data in zip(paths, current):
+            if isinstance(current_data, Exception):
+                results[path] = current_data
+            elif current_data == desired[path]:
+                logging.debug(f'current data is up-to-date, skipping {path}')
+                results[path] = False
+            else:
+                to_write.append(path)
+
+        written = threaded.run(self._write_data, to_write, thread_pool_size,
+                               return_exceptions=True, desired=desired)
+        for path, result in zip(to_write, written):
+            results[path] = result if isinstance(result, Exception) else True
+
+        if raise_on_error and \
+                any(isinstance(r, Exception) for r in results.values()):
+            for path, result in results.items():
+                if isinstance(result, Exception):
+                    logging.error(f'failed to write secret {path}: {result}')
+            raise SecretWriteError(results)
+
+        return results
+
+    @staticmethod
+    def _decode_data(data, decode_base64):
+        if decode_base64:
+            return {k: base64.b64decode(v or '').decode('utf-8')
+                    for k, v in data.items()}
+        return data
+
+    @retry()
+    def _read_current(self, path):
+        """Returns the latest data of a secret or None if it does not exist
+        or can not be read"""
+        kv_version = self._get_mount_version_by_secret_path(path)
+        try:
+            if kv_version == 2:
+                return self._read_all_v2(path, version=SECRET_VERSION_LATEST)
+            return self._read_all_v1(path)
+        except (SecretNotFound, SecretVersionNotFound):
+            return None
+        except SecretAccessForbidden:
+            # writes to v1 mounts never required read permissions,
+            # the secret is written without comparing it
+            if kv_version == 2:
+                raise
+            logging.debug(f'can not read {path}, will write it')
+            return None
+
+    @retry()
+    def _write_data(self, path, desired):
+        data = desired[path]
+        kv_version = self._get_mount_version_by_secret_path(path)
+        if kv_version == 2:
+            self._create_or_update_v2(path, data)
+        else:
+            self._write_v1(path, data)
 
+    def _write_v2(self, path, data):
         try:
             current_data = \
                 self._read_all_v2(path, version=SECRET_VERSION_LATEST)
@@ -268,6 +351,13 @@ class _VaultClient:
             # if the secret is not found we need to write it
             logging.debug(f'secret not found in {path}, will create it')
 
+        self._create_or_update_v2(path, data)
+
+    def _create_or_update_v2(self, path, data):
+        path_split = path.split('/')
+        mount_point = path_split[0]
+        write_path = '/'.join(path_split[1:])
+
         try:
             self._client.secrets.kv.v2.create_or_update_secret(
                 mount_point=mount_point,
@@ -15,13 +15,12 @@ setup(
 
     url='https://github.com/app-sre/qontract-reconcile',
 
-    packages=find_packages(exclude=('tests',)),
+    packages=find_packages(exclude=('tests', 'benchmarks', 'benchmarks.*')),
     package_data={'reconcile': ['templates/*.j2']},
 
     install_requires=[
         "sretoolbox~=1.2",
         "Click>=7.0,<8.0",
-        "graphqlclient>=0.2.4,<0.3.0",
         "toml>=0.10.0,<0.11.0",
         "jsonpath-rw>=1.4.0,<1.5.0",
         "PyGithub>=1.55,<1.56",
@@ -241,16 +241,24 @@ def get_apps_data(date, month_delta=1, thread_pool_size=10):
     dashdotdb_user = secret_content['username']
     dashdotdb_pass = secret_content['password']
     auth = (dashdotdb_user, dashdotdb_pass)
-    vuln_metrics = requests.get(
-        f'{dashdotdb_url}/api/v1/imagemanifestvuln/metrics', auth=auth).text
-    validt_metrics = requests.get(
-        f'{dashdotdb_url}/api/v1/deploymentvalidation/metrics', auth=auth).text
-    slo_metrics = requests.get(
-        f'{dashdotdb_url}/api/v1/serviceslometrics/metrics', auth=auth).text
+    metrics_urls = [
+        f'{dashdotdb_url}/api/v1/imagemanifestvuln/metrics',
+        f'{dashdotdb_url}/api/v1/deploymentvalidation/metrics',
+        f'{dashdotdb_url}/api/v1/serviceslometrics/metrics',
+    ]
+    vuln_metrics, validt_metrics, slo_metrics = \
+        run(func=get_metrics, iterable=metrics_urls,
+            thread_pool_size=thread_pool_size, auth=auth)
+    vuln_samples = \
+        index_metric_samples(vuln_metrics, 'imagemanifestvuln_total')
+    validt_samples = \
+        index_metric_samples(validt_metrics, 'deploymentvalidation_total')
+    slo_samples = index_metric_samples(slo_metrics, 'serviceslometrics')
     namespaces = queries.get_namespaces()
 
     build_jobs = jjb.get_all_jobs(job_types=['build'])
-    jobs_to_get = build_jobs.copy()
+    jobs_to_get = {instance: list(jobs)
+                   for instance, jobs in build_jobs.items()}
 
     saas_deploy_jobs = []
     for saas_file in saas_files:
@@ -280,6 +288,19 @@ def get_apps_data(date, month_delta=1, thread_pool_size=10):
                             thread_pool_size
                           )
 
+    # index the app related data once instead of scanning it for each app
+    saas_files_by_app = {}
+    for saas_file in saas_files:
+        saas_files_by_app.setdefault(saas_file['app']['name'], []) \
+            .append(saas_file)
+    namespaces_by_app = {}
+    for namespace in namespaces:
+        namespaces_by_app.setdefault(namespace['app']['name'], []) \
+            .append(namespace)
+    saas_deploy_jobs_by_app = {}
+    for job in saas_deploy_jobs:
+        saas_deploy_jobs_by_app.setdefault(job['app'], []).append(job)
+
     for app in apps:
         if not app['codeComponents']:
             continue
@@ -289,9 +310,8 @@ def get_apps_data(date, month_delta=1, thread_pool_size=10):
         logging.info(f"collecting post-deploy jobs "
                      f"information for {app_name}")
         post_deploy_jobs = {}
-        for saas_file in saas_files:
-            if saas_file['app']['name'] != app_name:
-                continue
+        app_saas_files = saas_files_by_app.get(app_name, [])
+        for saas_file in app_saas_files:
             resource_types = saas_file['managedResourceTypes']
 
             # Only jobs of these types are expected to have a
@@ -307,9 +327,7 @@ def get_apps_data(date, month_delta=1, thread_pool_size=10):
                     post_deploy_jobs[cluster] = {}
                     post_deploy_jobs[cluster][namespace] = False
 
-        for saas_file in saas_files:
-            if saas_file['app']['name'] != app_name:
-                continue
+        for saas_file in app_saas_files:
             resource_types = saas_file['managedResourceTypes']
             if 'Job' not in resource_types:
                 continue
@@ -337,9 +355,7 @@ def get_apps_data(date, month_delta=1, thread_pool_size=10):
 
         logging.info(f"collecting promotion history for {app_name}")
         app["promotions"] = {}
-        for job in saas_deploy_jobs:
-            if job['app'] != app_name:
-                continue
+        for job in saas_deploy_jobs_by_app.get(app_name, []):
             if job['name'] not in job_history:
                 continue
             history = job_history[job["name"]]
@@ -386,83 +402,58 @@ def get_apps_data(date, month_delta=1, thread_pool_size=10):
                     })
 
         logging.info(f"collecting dashdotdb information for {app_name}")
-        app_namespaces = []
-        for namespace in namespaces:
-            if namespace['app']['name'] != app['name']:
-                continue
-            app_namespaces.append(namespace)
+        app_namespaces = namespaces_by_app.get(app_name, [])
         vuln_mx = {}
         validt_mx = {}
         slo_mx = {}
-        for family in text_string_to_metric_families(vuln_metrics):
-            for sample in family.samples:
-                if sample.name == 'imagemanifestvuln_total':
-                    for app_namespace in app_namespaces:
-                        cluster = sample.labels['cluster']
-                        if app_namespace['cluster']['name'] != cluster:
-                            continue
-                        namespace = sample.labels['namespace']
-                        if app_namespace['name'] != namespace:
-                            continue
-                        severity = sample.labels['severity']
-                        if cluster not in vuln_mx:
-                            vuln_mx[cluster] = {}
-                        if namespace not in vuln_mx[cluster]:
-                            vuln_mx[cluster][namespace] = {}
-                        if severity not in vuln_mx[cluster][namespace]:
-                            value = int(sample.value)
-                            vuln_mx[cluster][namespace][severity] = value
-        for family in text_string_to_metric_families(validt_metrics):
-            for sample in family.samples:
-                if sample.name == 'deploymentvalidation_total':
-                    for app_namespace in app_namespaces:
-                        cluster = sample.labels['cluster']
-                        if app_namespace['cluster']['name'] != cluster:
-                            continue
-                        namespace = sample.labels['namespace']
-                        if app_namespace['name'] != namespace:
-                            continue
-                        validation = sample.labels['validation']
-                        # dvo: fail == 1, pass == 0, py: true == 1, false == 0
-                        # so: ({false|pass}, {true|fail})
-                        status = ('Passed',
-                                  'Failed')[int(sample.labels['status'])]
-                        if cluster not in validt_mx:
-                            validt_mx[cluster] = {}
-                        if namespace not in validt_mx[cluster]:
-                            validt_mx[cluster][namespace] = {}
-                        if validation not in validt_mx[cluster][namespace]:
-                            validt_mx[cluster][namespace][validation] = {}
-                        if status not in validt_mx[cluster][namespace][validation]:  # noqa: E501
-                            validt_mx[cluster][namespace][validation][status] = {}  # noqa: E501
-                        value = int(sample.value)
-                        validt_mx[cluster][namespace][validation][status] = value  # noqa: E501
-        for family in text_string_to_metric_families(slo_metrics):
-            for sample in family.samples:
-                if sample.name == 'serviceslometrics':
-                    for app_namespace in app_namespaces:
-                        cluster = sample.labels['cluster']
-                        if app_namespace['cluster']['name'] != cluster:
-                            continue
-                        namespace = sample.labels['namespace']
-                        if app_namespace['name'] != namespace:
-                            continue
-                        slo_doc_name = sample.labels['slodoc']
-                        slo_name = sample.labels['name']
-                        if cluster not in slo_mx:
-                            slo_mx[cluster] = {}
-                        if namespace not in slo_mx[cluster]:
-                            slo_mx[cluster][namespace] = {}
-                        if slo_doc_name not in slo_mx[cluster][namespace]:  # pylint: disable=line-too-long # noqa: E501
-                            slo_mx[cluster][namespace][slo_doc_name] = {}
-                        if slo_name not in slo_mx[cluster][namespace][slo_doc_name]:  # noqa: E501
-                            slo_mx[cluster][namespace][slo_doc_name][slo_name] = {  # noqa: E501
-                                sample.labels['type']: sample.value
-                            }
-                        else:
-                            slo_mx[cluster][namespace][slo_doc_name][slo_name].update({  # pylint: disable=line-too-long # noqa: E501
-                                sample.labels['type']: sample.value
-                            })
+        for sample in get_namespaces_samples(vuln_samples, app_namespaces):
+            cluster = sample.labels['cluster']
+            namespace = sample.labels['namespace']
+            severity = sample.labels['severity']
+            if cluster not in vuln_mx:
+                vuln_mx[cluster] = {}
+            if namespace not in vuln_mx[cluster]:
+                vuln_mx[cluster][namespace] = {}
+            if severity not in vuln_mx[cluster][namespace]:
+                value = int(sample.value)
+                vuln_mx[cluster][namespace][severity] = value
+        for sample in get_namespaces_samples(validt_samples, app_namespaces):
+            cluster = sample.labels['cluster']
+            namespace = sample.labels['namespace']
+            validation = sample.labels['validation']
+            # dvo: fail == 1, pass == 0, py: true == 1, false == 0
+            # so: ({false|pass}, {true|fail})
+            status = ('Passed',
+                      'Failed')[int(sample.labels['status'])]
+            if cluster not in validt_mx:
+                validt_mx[cluster] = {}
+            if namespace not in validt_mx[cluster]:
+                validt_mx[cluster][namespace] = {}
+            if validation not in validt_mx[cluster][namespace]:
+                validt_mx[cluster][namespace][validation] = {}
+            if status not in validt_mx[cluster][namespace][validation]:
+                validt_mx[cluster][namespace][validation][status] = {}
+            value = int(sample.value)
+            validt_mx[cluster][namespace][validation][status] = value
+        for sample in get_namespaces_samples(slo_samples, app_namespaces):
+            cluster = sample.labels['cluster']
+            namespace = sample.labels['namespace']
+            slo_doc_name = sample.labels['slodoc']
+            slo_name = sample.labels['name']
+            if cluster not in slo_mx:
+                slo_mx[cluster] = {}
+            if namespace not in slo_mx[cluster]:
+                slo_mx[cluster][namespace] = {}
+            if slo_doc_name not in slo_mx[cluster][namespace]:
+                slo_mx[cluster][namespace][slo_doc_name] = {}
+            if slo_name not in slo_mx[cluster][namespace][slo_doc_name]:
+                slo_mx[cluster][namespace][slo_doc_name][slo_name] = {
+                    sample.labels['type']: sample.value
+                }
+            else:
+                slo_mx[cluster][namespace][slo_doc_name][slo_name].update({
+                    sample.labels['type']: sample.value
+                })
         app['container_vulnerabilities'] = vuln_mx
         app['deployment_validations'] = validt_mx
         app['service_slo'] = slo_mx
@@ -470,6 +461,32 @@ def get_apps_data(date, month_delta=1, thread_pool_size=10):
     return apps
 
 
+def get_metrics(url, auth):
+    return requests.get(url, auth=auth).text
+
+
+def index_metric_samples(metrics, sample_name):
+    """Parses metrics and returns the samples with the given name indexed by
+    (cluster, namespace). Each sample is paired with its position in the
+    metrics to keep their order when combining namespaces."""
+    samples = {}
+    index = 0
+    for family in text_string_to_metric_families(metrics):
+        for sample in family.samples:
+            if sample.name != sample_name:
+                continue
+            key = (sample.labels['cluster'], sample.labels['namespace'])
+            samples.setdefault(key, []).append((index, sample))
+            index += 1
+    return samples
+
+
+def get_namespaces_samples(samples, namespaces):
+    keys = {(ns['cluster']['name'], ns['name']) for ns in namespaces}
+    ns_samples = [s for key in keys for s in samples.get(key, [])]
+    return [sample for _, sample in sorted(ns_samples, key=lambda s: s[0])]
+
+
 def get_build_history(job):
     try:
         logging.info(f"getting build history for {job['name']}")
@@ -484,16 +501,20 @@ def get_build_history(job):
 
 def get_build_history_pool(jenkins_map, jobs,
                            timestamp_limit, thread_pool_size):
-    history_to_get = []
+    # many targets are deployed by the same job,
+    # get the history of each job only once
+    history_to_get = {}
     for instance, jobs in jobs.items():
         jenkins = jenkins_map[instance]
         for job in jobs:
-            job['jenkins'] = jenkins
-            job['timestamp_limit'] = timestamp_limit
-            history_to_get.append(job)
+            history_to_get.setdefault((instance, job['name']), {
+                'name': job['name'],
+                'jenkins': jenkins,
+                'timestamp_limit': timestamp_limit,
+            })
 
     result = run(func=get_build_history,
-                 iterable=history_to_get,
+                 iterable=history_to_get.values(),
                  thread_pool_size=thread_pool_size)
 
     history = {}
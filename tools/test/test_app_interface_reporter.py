@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock, patch
+
+from reconcile.utils.jenkins_api import JenkinsApi
+from tools import app_interface_reporter as reporter
+
+
+VULN_METRICS = '''
+# TYPE imagemanifestvuln_total gauge
+imagemanifestvuln_total{cluster="c1",namespace="ns1",severity="High"} 2
+imagemanifestvuln_total{cluster="c2",namespace="ns2",severity="Low"} 3
+imagemanifestvuln_total{cluster="c1",namespace="ns1",severity="Low"} 1
+'''
+
+
+def test_get_build_history_pool_deduplicates_jobs():
+    jenkins = MagicMock()
+    jenkins.get_build_history.return_value = ['SUCCESS', 'FAILURE']
+    jobs = {'ci': [{'name': 'deploy'}, {'name': 'deploy'},
+                   {'name': 'build'}]}
+
+    history = reporter.get_build_history_pool({'ci': jenkins}, jobs, 0, 2)
+
+    assert jenkins.get_build_history.call_count == 2
+    assert history == {'deploy': {'total': 2, 'success': 1},
+                       'build': {'total': 2, 'success': 1}}
+    # the input jobs are left untouched
+    assert jobs == {'ci': [{'name': 'deploy'}, {'name': 'deploy'},
+                           {'name': 'build'}]}
+
+
+def test_get_namespaces_samples():
+    samples = reporter.index_metric_samples(VULN_METRICS,
+                                            'imagemanifestvuln_total')
+    namespaces = [{'name': 'ns1', 'cluster': {'name': 'c1'}},
+                  {'name': 'ns1', 'cluster': {'name': 'c1'}}]
+
+    result = reporter.get_namespaces_samples(samples, namespaces)
+
+    assert [s.labels['severity'] for s in result] == ['High', 'Low']
+
+
+@patch.object(JenkinsApi, '__init__', return_value=None)
+def test_jenkins_get_build_history_stops_at_time_limit(init):
+    jenkins = JenkinsApi(None)
+    # newest first, timestamps in milliseconds
+    builds = [{'result': 'SUCCESS', 'timestamp': t * 1000}
+              for t in range(10, 0, -1)]
+    jenkins.get_builds = MagicMock(
+        side_effect=lambda name, start, end: builds[start:end])
+
+    history = jenkins.get_build_history('job', 4, page_size=3)
+
+    assert history == ['SUCCESS'] * 6
+    assert jenkins.get_builds.call_count == 3